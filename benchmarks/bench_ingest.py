@@ -0,0 +1,48 @@
+# Benchmarks for adding data to plotters
+import hdviz
+from hdviz.colors import keys_to_colors
+from hdviz.functional import build_stream_plotter
+from .common import random_points
+
+
+class AddPointsets:
+    params = [[10000, 100000, 1000000], [3, 20, 100]]
+    param_names = ["n_points", "n_labels"]
+
+    def setup(self, n_points, n_labels):
+        self.x, self.labels = random_points(n_points, 5, n_labels)
+
+    def time_add_pointsets(self, n_points, n_labels):
+        hdviz.create_plotter(5).add_pointsets(self.x, self.labels)
+
+    def peakmem_add_pointsets(self, n_points, n_labels):
+        hdviz.create_plotter(5).add_pointsets(self.x, self.labels)
+
+
+class KeysToColors:
+    params = [[10000, 1000000], [3, 100]]
+    param_names = ["n_points", "n_labels"]
+
+    def setup(self, n_points, n_labels):
+        _, self.labels = random_points(n_points, 1, n_labels)
+
+    def time_keys_to_colors(self, n_points, n_labels):
+        keys_to_colors(self.labels)
+
+
+class StreamPoints:
+    params = [[100000, 1000000], [3, 20]]
+    param_names = ["n_points", "n_labels"]
+
+    def setup(self, n_points, n_labels):
+        self.x, self.labels = random_points(n_points, 5, n_labels)
+
+    def batches(self, size=50000):
+        for start in range(0, self.x.shape[0], size):
+            yield self.x[start : start + size], self.labels[start : start + size]
+
+    def time_build_stream_plotter(self, n_points, n_labels):
+        build_stream_plotter(self.batches())
+
+    def peakmem_build_stream_plotter(self, n_points, n_labels):
+        build_stream_plotter(self.batches())
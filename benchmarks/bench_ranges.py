@@ -0,0 +1,46 @@
+# Benchmarks for computing axis limits and grids
+import hdviz
+from hdviz.utils import create_grid
+from .common import random_points, random_walks
+
+
+class AxisLimits:
+    params = [[10000, 1000000], [1, 20, 100]]
+    param_names = ["n_points", "n_sets"]
+
+    def setup(self, n_points, n_sets):
+        x, labels = random_points(n_points, 5, n_sets)
+        self.plotter = hdviz.create_plotter(5)
+        self.plotter.add_pointsets(x, labels)
+        self.plotter.add_lineset(random_walks(100, 100, 5))
+
+    def reset_caches(self):
+        self.plotter._ranges = None
+        for ds in self.plotter.point_sets + self.plotter.line_sets:
+            ds._range = None
+
+    def time_create_axis_limits_cold(self, n_points, n_sets):
+        self.reset_caches()
+        self.plotter.create_axis_limits()
+
+    def time_create_axis_limits_cached(self, n_points, n_sets):
+        self.plotter.create_axis_limits()
+
+    def peakmem_create_axis_limits_cold(self, n_points, n_sets):
+        self.reset_caches()
+        self.plotter.create_axis_limits()
+
+
+class CreateGrid:
+    params = [[10, 30], [2, 4]]
+    param_names = ["M", "n_dims"]
+
+    def setup(self, M, n_dims):
+        self.amin = [-1.0] * n_dims
+        self.amax = [1.0] * n_dims
+
+    def time_create_grid(self, M, n_dims):
+        create_grid(self.amin, self.amax, M)
+
+    def peakmem_create_grid(self, M, n_dims):
+        create_grid(self.amin, self.amax, M)
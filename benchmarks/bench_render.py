@@ -0,0 +1,83 @@
+# Benchmarks for full rendering with the Agg canvas
+import hdviz
+from hdviz.utils import determine_nrows_ncols
+from .common import random_points, random_walks, agg_figure
+
+
+class Render2d:
+    params = [[1000, 100000], [10, 1000]]
+    param_names = ["n_points", "n_lines"]
+
+    def setup(self, n_points, n_lines):
+        x, labels = random_points(n_points, 2, 5)
+        self.plotter = hdviz.create_plotter(2)
+        self.plotter.add_pointsets(x, labels)
+        self.plotter.add_lineset(random_walks(n_lines, 100, 2), alpha=0.3)
+
+    def time_render(self, n_points, n_lines):
+        fig = agg_figure()
+        self.plotter.plot(ax=fig.add_subplot(1, 1, 1))
+        fig.canvas.draw()
+
+    def peakmem_render(self, n_points, n_lines):
+        fig = agg_figure()
+        self.plotter.plot(ax=fig.add_subplot(1, 1, 1))
+        fig.canvas.draw()
+
+
+class RenderManySets:
+    params = [[10, 1000], [False, None]]
+    param_names = ["n_sets", "merge_points"]
+
+    def setup(self, n_sets, merge_points):
+        x, labels = random_points(20000, 2, n_sets)
+        self.plotter = hdviz.create_plotter(2)
+        self.plotter.merge_points = merge_points
+        self.plotter.add_pointsets(x, labels)
+
+    def time_render(self, n_sets, merge_points):
+        fig = agg_figure()
+        self.plotter.plot(ax=fig.add_subplot(1, 1, 1))
+        fig.canvas.draw()
+
+
+class Render3d:
+    params = [[1000, 100000], [10, 1000]]
+    param_names = ["n_points", "n_lines"]
+
+    def setup(self, n_points, n_lines):
+        x, labels = random_points(n_points, 3, 5)
+        self.plotter = hdviz.create_plotter(3)
+        self.plotter.add_pointsets(x, labels)
+        self.plotter.add_lineset(random_walks(n_lines, 100, 3), alpha=0.3)
+
+    def time_render(self, n_points, n_lines):
+        fig = agg_figure()
+        self.plotter.plot(ax=fig.add_subplot(1, 1, 1, projection="3d"))
+        fig.canvas.draw()
+
+
+class RenderNd:
+    params = [[1000, 100000], [4, 8], [3, 20], [False, None]]
+    param_names = ["n_points", "n_dims", "n_labels", "merge_points"]
+
+    def setup(self, n_points, n_dims, n_labels, merge_points):
+        x, labels = random_points(n_points, n_dims, n_labels)
+        self.plotter = hdviz.create_plotter(n_dims)
+        self.plotter.merge_points = merge_points
+        self.plotter.add_pointsets(x, labels)
+        self.plotter.add_lineset(random_walks(50, 100, n_dims), alpha=0.3)
+
+    def render(self):
+        n_plots = self.plotter.num_plots()
+        nrows, ncols = determine_nrows_ncols(n_plots)
+        fig = agg_figure((3 * ncols, 3 * nrows))
+        axs = fig.subplots(nrows, ncols, squeeze=False)
+        self.plotter.plot(axs=axs)
+        fig.canvas.draw()
+
+    def time_render(self, n_points, n_dims, n_labels, merge_points):
+        self.render()
+
+    def peakmem_render(self, n_points, n_dims, n_labels, merge_points):
+        self.render()
@@ -0,0 +1,25 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def random_points(n_points: int, n_dims: int, n_labels: int = 1, seed: int = 0):
+    """Create clustered random points and their labels."""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, n_labels, size=n_points)
+    centers = rng.normal(scale=5.0, size=(n_labels, n_dims))
+    x = centers[labels] + rng.normal(size=(n_points, n_dims))
+    return x, labels
+
+
+def random_walks(n_lines: int, n_steps: int, n_dims: int, seed: int = 0):
+    """Create random walk trajectories of shape (n_lines, n_steps, n_dims)."""
+    rng = np.random.default_rng(seed)
+    return np.cumsum(0.1 * rng.normal(size=(n_lines, n_steps, n_dims)), axis=1)
+
+
+def agg_figure(figsize=(7, 7)):
+    """Create a figure with an Agg canvas, without going through pyplot."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
@@ -0,0 +1,47 @@
+"""Compare two result files written by *benchmarks/run.py*.
+
+Prints the ratio *new / old* of every benchmark that is in both files and exits
+with status 1 if any ratio exceeds the threshold. Usage::
+
+    python -m benchmarks.compare old.json new.json [--threshold 1.2]
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path: str):
+    with open(path, "r") as f:
+        return json.load(f)["results"]
+
+
+def compare(old: dict, new: dict, threshold: float):
+    """Compute ratios of common benchmarks.
+
+    :return: a list of *(name, old, new, ratio, is_regression)* tuples, sorted so
+        that the largest slowdowns come first
+    """
+    rows = []
+    for name in sorted(set(old) & set(new)):
+        ratio = new[name] / old[name] if old[name] > 0 else float("inf")
+        rows.append((name, old[name], new[name], ratio, ratio > threshold))
+    return sorted(rows, key=lambda row: -row[3])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", help="baseline results")
+    parser.add_argument("new", help="results to compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+    rows = compare(load_results(args.old), load_results(args.new), args.threshold)
+    print("%-70s %10s %10s %7s" % ("benchmark", "old", "new", "ratio"))
+    for name, a, b, ratio, bad in rows:
+        flag = "  REGRESSION" if bad else ""
+        print("%-70s %10.4g %10.4g %7.2f%s" % (name, a, b, ratio, flag))
+    if any(row[4] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Run the benchmarks without asv and write the results to a JSON file.
+
+The benchmark classes follow the asv conventions (*params*, *param_names*,
+*setup*, and methods starting with *time_* or *peakmem_*), so they can also be run
+with ``asv run``. Usage::
+
+    python -m benchmarks.run results.json [--filter NAME] [--repeat N]
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import timeit
+import tracemalloc
+import numpy as np
+import hdviz
+
+
+def discover(filter_str=None):
+    """Find benchmark methods in the modules *benchmarks/bench_*.py*."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    found = []
+    for info in pkgutil.iter_modules([here]):
+        if not info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module("benchmarks." + info.name)
+        for cname, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for mname, _ in inspect.getmembers(cls, inspect.isfunction):
+                if not mname.startswith(("time_", "peakmem_")):
+                    continue
+                name = "%s.%s.%s" % (info.name, cname, mname)
+                if filter_str is None or filter_str in name:
+                    found.append((name, cls, mname))
+    return found
+
+
+def param_combinations(cls):
+    params = getattr(cls, "params", [])
+    if len(params) > 0 and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def measure(cls, method: str, args, repeat: int):
+    bench = cls()
+    if hasattr(bench, "setup"):
+        bench.setup(*args)
+    func = getattr(bench, method)
+    if method.startswith("time_"):
+        func(*args)
+        times = timeit.repeat(lambda: func(*args), number=1, repeat=repeat)
+        return float(np.median(times))
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return int(peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="path of the JSON file to write")
+    parser.add_argument("--filter", default=None, help="run only matching names")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats")
+    args = parser.parse_args()
+    results = dict()
+    for name, cls, method in discover(args.filter):
+        for combo in param_combinations(cls):
+            key = name + "(" + ", ".join(str(p) for p in combo) + ")"
+            results[key] = measure(cls, method, combo, args.repeat)
+            unit = "s" if method.startswith("time_") else "bytes"
+            print("%-70s %.4g %s" % (key, results[key], unit))
+    meta = {
+        "hdviz": hdviz.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    with open(args.output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
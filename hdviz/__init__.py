@@ -1,6 +1,4 @@
-from .functional import determine_dimension, create_plotter, visualize
-from .utils import create_grid_around, draw_plot
-from .examples import example
+import importlib
 
 # Version defined here
 __version__ = "0.0.10"
@@ -11,5 +9,38 @@ __all__ = [
     "create_grid_around",
     "draw_plot",
     "visualize",
+    "visualize_stream",
+    "build_plotter",
+    "render_batch",
+    "fit_projection",
     "example",
 ]
+
+# Public names and the submodules that define them. Submodules are imported
+# only when one of their names is first accessed, so that importing hdviz does
+# not import matplotlib or pandas (PEP 562).
+_lazy_names = {
+    "create_plotter": "functional",
+    "determine_dimension": "functional",
+    "visualize": "functional",
+    "visualize_stream": "functional",
+    "build_plotter": "functional",
+    "render_batch": "batch",
+    "fit_projection": "projection",
+    "create_grid_around": "utils",
+    "draw_plot": "utils",
+    "example": "examples",
+}
+
+
+def __getattr__(name):
+    if name in _lazy_names:
+        module = importlib.import_module("." + _lazy_names[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_lazy_names.keys()))
@@ -0,0 +1,191 @@
+import os
+import shutil
+import subprocess
+import numpy as np
+import matplotlib as mpl
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .batch import AsyncWriter
+
+# File extensions of video files, which are encoded with ffmpeg
+VIDEO_FORMATS = (".mp4", ".mov", ".mkv", ".webm", ".avi")
+
+
+class FrameEncoder(AsyncWriter):
+    """Encode frames of an animation on a background thread.
+
+    The format is chosen by the extension of *path*: a *.gif* file, a video file
+    (encoded by an ffmpeg process that reads the frames from a pipe), or
+    otherwise a directory of numbered PNG files. GIF frames are reduced to 256
+    colors on the background thread but kept in memory, at one byte per pixel,
+    until the file is written by *close*, so use a video file or a directory for
+    long animations.
+
+    :param path: path of the animation file or of the directory of frames
+    :param fps: frames per second
+    :param max_pending: maximum number of frames waiting to be encoded
+    """
+
+    def __init__(self, path: str, fps: float = 30, max_pending: int = 8):
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".gif":
+            self.format = "gif"
+        elif ext in VIDEO_FORMATS:
+            self.format = "video"
+            if shutil.which(mpl.rcParams["animation.ffmpeg_path"]) is None:
+                raise RuntimeError("ffmpeg is required for writing %s files" % ext)
+        else:
+            self.format = "png"
+            os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.fps = fps
+        self.num_frames = 0
+        self.frames = []
+        self.process = None
+        super().__init__(max_pending)
+
+    def add_frame(self, canvas):
+        """Copy the rendered image of a canvas and queue it as the next frame."""
+        name = os.path.join(self.path, "frame_%05d.png" % self.num_frames)
+        self.write(name, canvas)
+        self.num_frames += 1
+
+    def start_video(self, width: int, height: int):
+        cmd = [
+            mpl.rcParams["animation.ffmpeg_path"],
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgba",
+            "-s",
+            "%dx%d" % (width, height),
+            "-r",
+            str(self.fps),
+            "-i",
+            "-",
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            self.path,
+        ]
+        self.process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def handle(self, path: str, image, dpi: float):
+        if self.format == "png":
+            super().handle(path, image, dpi)
+        elif self.format == "gif":
+            from PIL import Image
+
+            frame = Image.fromarray(image[:, :, 0:3])
+            self.frames.append(frame.quantize(method=Image.FASTOCTREE))
+        else:
+            if self.process is None:
+                self.start_video(image.shape[1], image.shape[0])
+            self.process.stdin.write(image.tobytes())
+
+    def close(self):
+        """Wait until all queued frames are encoded, and finish the file."""
+        try:
+            super().close()
+        finally:
+            if self.process is not None:
+                self.process.stdin.close()
+                self.process.wait()
+        if self.process is not None and self.process.returncode != 0:
+            msg = self.process.stderr.read().decode(errors="replace")
+            raise RuntimeError("ffmpeg failed: " + msg)
+        if self.format == "gif" and len(self.frames) > 0:
+            self.frames[0].save(
+                self.path,
+                save_all=True,
+                append_images=self.frames[1:],
+                duration=1000.0 / self.fps,
+                loop=0,
+            )
+            self.frames = []
+
+
+def rotation_views(
+    num_frames: int,
+    azimuth: float = -60,
+    elevation: float = 30,
+    azimuth_sweep: float = 360.0,
+    elevation_sweep: float = 0.0,
+):
+    """Viewing angles of a rotation that returns to its start after the last frame.
+
+    :param num_frames: number of frames
+    :param azimuth: azimuth of the first frame
+    :param elevation: elevation of the first frame
+    :param azimuth_sweep: change of azimuth over all frames, in degrees
+    :param elevation_sweep: amplitude of a sine oscillation of the elevation
+    :return: a tuple *(azimuths, elevations)* of arrays of length *num_frames*
+    """
+    t = np.arange(0, num_frames) / max(num_frames, 1)
+    azimuths = azimuth + azimuth_sweep * t
+    elevations = elevation + elevation_sweep * np.sin(2 * np.pi * t)
+    return azimuths, elevations
+
+
+def animate_rotation(
+    plotter,
+    path: str,
+    num_frames: int = 360,
+    fps: float = 30,
+    azimuth_sweep: float = 360.0,
+    elevation_sweep: float = 0.0,
+    figsize=None,
+    dpi: float = 100,
+    axis_limits=None,
+    title=None,
+    fast_points: bool = True,
+):
+    """Render a rotating view of a *Plotter3d* to an animation file.
+
+    The plot is created once, on an Agg figure. For each frame only the view of
+    the axes is changed and the figure is drawn again, so the artists re-project
+    the coordinates they already hold. Frames are encoded on a background thread
+    while the next frame is drawn.
+
+    :param plotter: a *Plotter3d*
+    :param path: a *.gif* or video file, or otherwise a directory where the frames
+        are written as PNG files
+    :param num_frames: number of frames
+    :param fps: frames per second
+    :param azimuth_sweep: change of azimuth over all frames, in degrees
+    :param elevation_sweep: amplitude of a sine oscillation of the elevation
+    :param figsize: size of the figure in inches
+    :param dpi: resolution of the frames
+    :param axis_limits: axis limits, as for *plot*
+    :param title: title of the plot
+    :param fast_points: draw the points with *plot_points_fast*, which is much
+        faster for large point sets
+    :return: *path*
+    """
+    fig = Figure(figsize=plotter.figsize if figsize is None else figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1, projection="3d")
+    fast = plotter.fast_points
+    plotter.fast_points = fast_points
+    try:
+        plotter.plot(figsize=figsize, axis_limits=axis_limits, ax=ax, title=title)
+    finally:
+        plotter.fast_points = fast
+    azimuths, elevations = rotation_views(
+        num_frames, plotter.azimuth, plotter.elevation, azimuth_sweep, elevation_sweep
+    )
+    encoder = FrameEncoder(path, fps)
+    try:
+        for azim, elev in zip(azimuths, elevations):
+            ax.view_init(elev=elev, azim=azim)
+            canvas.draw()
+            encoder.add_frame(canvas)
+    finally:
+        encoder.close()
+    return path
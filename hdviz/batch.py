@@ -0,0 +1,198 @@
+import os
+import queue
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .functional import build_plotter
+from .plotter_3d import Plotter3d
+from .plotter_nd import PlotterNd
+from .utils import determine_nrows_ncols
+
+
+class FigureCache:
+    """Agg figures that are reused between plots.
+
+    One figure is created for each kind of plot (2d, 3d, or a grid of panels of
+    a given shape). Before the next plot of the same kind, the
+    artists of its axes are cleared instead of creating a new figure and axes.
+
+    :param figsize: size of 2d and 3d figures in inches
+    :param dpi: resolution of the figures
+    :param panelsize: size of one panel of a *PlotterNd* figure in inches
+    """
+
+    def __init__(self, figsize=(7, 7), dpi: float = 100, panelsize: float = 3.0):
+        self.figsize = figsize
+        self.dpi = dpi
+        self.panelsize = panelsize
+        self.figures = dict()
+
+    def __len__(self):
+        return len(self.figures)
+
+    def create(self, plotter):
+        if isinstance(plotter, PlotterNd):
+            nrows, ncols = determine_nrows_ncols(plotter.num_plots())
+            figsize = (self.panelsize * ncols, self.panelsize * nrows)
+        else:
+            nrows, ncols = 1, 1
+            figsize = self.figsize
+        fig = Figure(figsize=figsize, dpi=self.dpi, constrained_layout=True)
+        canvas = FigureCanvasAgg(fig)
+        projection = "3d" if isinstance(plotter, Plotter3d) else None
+        axs = np.empty((nrows, ncols), dtype=object)
+        for r in range(0, nrows):
+            for c in range(0, ncols):
+                idx = r * ncols + c + 1
+                axs[r, c] = fig.add_subplot(nrows, ncols, idx, projection=projection)
+        return canvas, axs
+
+    def get(self, plotter):
+        """Get a cleared canvas and axes for plotting with a plotter.
+
+        :return: a tuple *(canvas, axs)*, where *axs* is an array of axes with
+            shape *[nrows, ncols]*
+        """
+        if isinstance(plotter, PlotterNd):
+            key = ("nd",) + determine_nrows_ncols(plotter.num_plots())
+        elif isinstance(plotter, Plotter3d):
+            key = ("3d",)
+        else:
+            key = ("2d",)
+        if key not in self.figures:
+            self.figures[key] = self.create(plotter)
+            return self.figures[key]
+        canvas, axs = self.figures[key]
+        for ax in axs.flat:
+            ax.cla()
+        canvas.figure.suptitle("")
+        return canvas, axs
+
+
+class AsyncWriter:
+    """Write rendered images to files on a background thread.
+
+    :param max_pending: maximum number of images waiting to be written, after
+        which *write* blocks
+    """
+
+    def __init__(self, max_pending: int = 8):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error is None:
+                try:
+                    self.handle(*item)
+                except Exception as e:
+                    self.error = e
+
+    def handle(self, path: str, image, dpi: float):
+        """Write one image, called on the background thread."""
+        from matplotlib.image import imsave
+
+        imsave(path, image, dpi=dpi)
+
+    def write(self, path: str, canvas):
+        """Copy the rendered image of a canvas and queue it for writing."""
+        if self.error is not None:
+            raise self.error
+        image = np.asarray(canvas.buffer_rgba()).copy()
+        self.queue.put((path, image, canvas.figure.dpi))
+
+    def close(self):
+        """Wait until all queued images are written."""
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+def render_spec(spec: dict, cache: FigureCache):
+    """Render one plot spec to the canvas of a figure cache.
+
+    :param spec: a dictionary with either arguments to *build_plotter* or a
+        ready *plotter* and its *axis_limits*, and optionally a *title*
+    :return: the canvas
+    """
+    spec = dict(spec)
+    spec.pop("save_name", None)
+    title = spec.pop("title", None)
+    if "plotter" in spec:
+        plotter = spec.pop("plotter")
+        axis_limits = spec.pop("axis_limits", None)
+    else:
+        plotter, axis_limits = build_plotter(**spec)
+    canvas, axs = cache.get(plotter)
+    if isinstance(plotter, PlotterNd):
+        plotter.plot(axis_limits=axis_limits, axs=axs)
+        if title is not None:
+            canvas.figure.suptitle(title)
+    else:
+        plotter.plot(axis_limits=axis_limits, ax=axs[0, 0], title=title)
+    canvas.draw()
+    return canvas
+
+
+def _render_shard(specs, save_dir: str, figsize, dpi: float, panelsize: float):
+    cache = FigureCache(figsize, dpi, panelsize)
+    writer = AsyncWriter()
+    paths = []
+    try:
+        for spec in specs:
+            canvas = render_spec(spec, cache)
+            path = os.path.join(save_dir, spec["save_name"])
+            writer.write(path, canvas)
+            paths.append(path)
+    finally:
+        writer.close()
+    return paths
+
+
+def render_batch(
+    specs,
+    save_dir: str = ".",
+    n_jobs=None,
+    figsize=(7, 7),
+    dpi: float = 100,
+    panelsize: float = 3.0,
+):
+    """Render many plots to files without pyplot.
+
+    Plots are drawn to Agg figures that are reused between plots of the same
+    kind, and the images are written to files on a background thread.
+
+    :param specs: iterable of plot specs, which are dictionaries with arguments to
+        *build_plotter* (the same as for *visualize*), or with a *plotter* and its
+        *axis_limits*; every spec needs a *save_name* and can have a *title*
+    :param save_dir: directory where the files are written
+    :param n_jobs: if larger than one, specs are split between this many worker
+        processes (then the specs must be picklable)
+    :param figsize: size of 2d and 3d figures in inches
+    :param dpi: resolution of the images
+    :param panelsize: size of one panel of *PlotterNd* figures in inches
+    :return: list of paths of the written files, in the order of *specs*
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    if n_jobs is None or n_jobs <= 1:
+        return _render_shard(specs, save_dir, figsize, dpi, panelsize)
+    specs = list(specs)
+    shards = [specs[k::n_jobs] for k in range(0, n_jobs)]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = [
+            pool.submit(_render_shard, s, save_dir, figsize, dpi, panelsize)
+            for s in shards
+        ]
+        results = [f.result() for f in futures]
+    paths = [None] * len(specs)
+    for k, res in enumerate(results):
+        paths[k::n_jobs] = res
+    return paths
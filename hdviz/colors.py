@@ -1,25 +1,110 @@
-import seaborn as sns
 import numpy as np
+from functools import lru_cache
+
+# Lightness levels of generated palettes, cycled between neighbouring hues
+PALETTE_LIGHTNESS = (65.0, 50.0, 80.0)
+
+# Chroma of generated palettes
+PALETTE_CHROMA = 45.0
+
+
+def named_palette(name: str):
+    """Get the colors of a qualitative matplotlib colormap as RGB tuples."""
+    from matplotlib import colormaps
+
+    return list(colormaps[name].colors)
 
 
 def category_color(idx: int):
-    return sns.color_palette("tab10")[idx]
+    return named_palette("tab10")[idx]
 
 
-def category_palette(n_colors: int):
+def lch_to_rgb(L, C, h):
+    """Convert CIE LCh(ab) colors to sRGB.
+
+    :param L: lightness in *[0, 100]*
+    :param C: chroma
+    :param h: hue angle in degrees
+    :return: array of shape *[n, 3]* with values in *[0, 1]*, where colors
+        outside of the sRGB gamut are clipped
+    """
+    L, C, h = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in (L, C, h)])
+    a = C * np.cos(np.deg2rad(h))
+    b = C * np.sin(np.deg2rad(h))
+
+    # Lab to XYZ (D65 white point)
+    fy = (L + 16.0) / 116.0
+    f = np.stack((fy + a / 500.0, fy, fy - b / 200.0), axis=-1)
+    delta = 6.0 / 29.0
+    xyz = np.where(f > delta, f ** 3, 3 * delta ** 2 * (f - 4.0 / 29.0))
+    xyz = xyz * np.array([0.95047, 1.0, 1.08883])
+
+    # XYZ to linear sRGB to sRGB
+    M = np.array(
+        [
+            [3.2404542, -1.5371385, -0.4985314],
+            [-0.9692660, 1.8760108, 0.0415560],
+            [0.0556434, -0.2040259, 1.0572252],
+        ]
+    )
+    rgb = np.clip(xyz @ M.T, 0.0, 1.0)
+    small = rgb <= 0.0031308
+    rgb = np.where(small, 12.92 * rgb, 1.055 * rgb ** (1 / 2.4) - 0.055)
+    return np.clip(rgb, 0.0, 1.0).reshape(-1, 3)
+
+
+def generate_palette(n_colors: int):
+    """Generate distinct colors for any number of categories.
+
+    Hues are evenly spaced around the LCh color wheel, which is perceptually
+    uniform, and consecutive colors alternate between lightness levels so that
+    neighbouring hues are easier to tell apart.
+
+    :return: array of shape *[n_colors, 3]*
+    """
+    k = np.arange(n_colors)
+    h = 360.0 * k / max(n_colors, 1) + 30.0
+    L = np.array(PALETTE_LIGHTNESS)[k % len(PALETTE_LIGHTNESS)]
+    return lch_to_rgb(L, PALETTE_CHROMA, h)
+
+
+@lru_cache(maxsize=None)
+def palette_lut(n_colors: int):
+    """Get a lookup table of *n_colors* category colors.
+
+    Up to 20 categories use the tab10 and tab20 palettes, more use a generated
+    palette. Tables are cached by size.
+
+    :return: read-only array of shape *[n_colors, 4]* of RGBA colors
+    """
     if n_colors <= 10:
-        pal = sns.color_palette("tab10")[0:n_colors]
+        rgb = np.array(named_palette("tab10")[0:n_colors]).reshape(-1, 3)
     elif n_colors <= 20:
-        pal = sns.color_palette("tab20")[0:n_colors]
+        rgb = np.array(named_palette("tab20")[0:n_colors])
     else:
-        raise RuntimeError("not enough colors to plot > 20 categories!")
-    return pal
+        rgb = generate_palette(n_colors)
+    lut = np.ones((n_colors, 4))
+    lut[:, 0:3] = rgb
+    lut.setflags(write=False)
+    return lut
+
+
+def category_palette(n_colors: int):
+    """Get *n_colors* category colors as a list of RGB tuples."""
+    return [tuple(c) for c in palette_lut(n_colors)[:, 0:3]]
+
 
+def keys_to_colors(keys, alpha: float = 1.0):
+    """Map the category of each element to a color.
 
-def keys_to_colors(keys):
-    uk = np.unique(keys)
-    n_colors = len(uk)
-    pal = category_palette(n_colors)
-    color_dict = dict(zip(uk, pal))
-    colors = [color_dict[key] for key in keys]
+    :param keys: array of categories of length *N*
+    :param alpha: opacity of the colors
+    :return: array of shape *[N, 4]* of RGBA colors, which can be passed directly
+        as the colors of a scatter plot
+    """
+    _, inv = np.unique(np.asarray(keys), return_inverse=True)
+    inv = inv.reshape(-1)
+    lut = palette_lut(int(inv.max()) + 1 if inv.size > 0 else 0)
+    colors = lut[inv]
+    colors[:, 3] = alpha
     return colors
@@ -1,28 +1,77 @@
 import numpy as np
-from .utils import assert_dim
+from .utils import assert_dim, dims_index, load_array, stream_range, read_rows
+from .utils import append_along, combine_ranges
 
 
 class PlotData:
     """Abstract class for data to be plotted."""
 
+    __slots__ = ("label", "num_objects", "_range")
+
+    # Names of the arrays whose first axis indexes the objects, and of the other
+    # arguments of the constructor before the label, in constructor order
+    array_fields = ("x",)
+    style_fields = ()
+
     def __init__(self, num_objects):
         self.label = "data"
         self.num_objects = num_objects
+        self._range = None
 
     def __repr__(self):
         desc = "<PlotData (%d objects)>" % self.num_objects
         return desc
 
+    def get_range(self):
+        """Get minimum and maximum of each dimension.
+
+        The range is computed in one pass over the data when first needed and
+        cached after that.
+
+        :return: a tuple *(mins, maxs)* of arrays with length *num_dims*
+        """
+        if self._range is None:
+            self._range = stream_range(self.x)
+        return self._range
+
+    def subset(self, inds):
+        """Create a data set with only the objects *inds*.
+
+        The rows of the arrays in *array_fields* are read into memory, and the
+        new data set keeps the styles, label and range of this one.
+        """
+        arrays = [read_rows(getattr(self, name), inds) for name in self.array_fields]
+        styles = [getattr(self, name) for name in self.style_fields]
+        ds = type(self)(*arrays, *styles, self.label)
+        ds._range = self.get_range()
+        return ds
+
+    def extend_range(self, x_new):
+        """Update the cached range with new data."""
+        if self._range is not None:
+            self._range = combine_ranges(self._range, stream_range(x_new))
+
+    def get_range_min(self):
+        return self.get_range()[0]
+
+    def get_range_max(self):
+        return self.get_range()[1]
+
 
 class PointData(PlotData):
     """Data to be plotted using a scatter plot.
-    :param x: numpy array of shape (num_points, num_dims)
+    :param x: numpy array of shape (num_points, num_dims), or a path to a .npy file
+        or zarr array of that shape, which is then read lazily
     :type x: np.ndarray
     """
 
+    __slots__ = ("num_points", "num_dims", "x", "color", "marker", "alpha", "_buffer")
+    style_fields = ("color", "marker", "alpha")
+
     def __init__(self, x: np.ndarray, color, marker, alpha, label):
         if color is None:
             color = "black"
+        x = load_array(x)
         assert_dim(x, 2)
         num_objects = x.shape[0]
         super().__init__(num_objects)
@@ -33,6 +82,7 @@ class PointData(PlotData):
         self.marker = marker
         self.alpha = alpha
         self.label = label
+        self._buffer = x
 
     def __repr__(self):
         desc = "<PointData (%d points, %d dims)>" % (
@@ -44,22 +94,47 @@ class PointData(PlotData):
     def set_color(self, color):
         self.color = color
 
-    def get_range_min(self):
-        return self.x.min(0)
+    def append(self, x_new: np.ndarray):
+        """Add points to the set.
 
-    def get_range_max(self):
-        return self.x.max(0)
+        The points are stored in a buffer that grows geometrically, so the cost
+        of appending is proportional to the number of new points.
+
+        :param x_new: numpy array of shape (num_new_points, num_dims)
+        """
+        x_new = np.asarray(x_new)
+        assert_dim(x_new, 2)
+        assert x_new.shape[1] == self.num_dims, "x_new has wrong number of dims!"
+        self._buffer, n = append_along(self._buffer, self.num_points, x_new, 0)
+        self.x = self._buffer[0:n]
+        self.num_points = n
+        self.num_objects = n
+        self.extend_range(x_new)
 
 
 class LineData(PlotData):
     """Data to be plotted using lines.
-    :param x: numpy array of shape (num_lines, num_points, num_dims)
+    :param x: numpy array of shape (num_lines, num_points, num_dims), or a path to a
+        .npy file or zarr array of that shape, which is then read lazily
     :type x: np.ndarray
     """
 
+    __slots__ = (
+        "num_lines",
+        "num_points",
+        "num_dims",
+        "x",
+        "color",
+        "style",
+        "alpha",
+        "_buffer",
+    )
+    style_fields = ("color", "style", "alpha")
+
     def __init__(self, x: np.ndarray, color, style, alpha, label):
         if color is None:
             color = "black"
+        x = load_array(x)
         assert_dim(x, 3)
         num_objects = x.shape[0]
         super().__init__(num_objects)
@@ -71,6 +146,7 @@ class LineData(PlotData):
         self.style = style
         self.alpha = alpha
         self.label = label
+        self._buffer = x
 
     def __repr__(self):
         desc = "<LineData (%d lines, %d points per line, " "%d dims)>" % (
@@ -80,11 +156,43 @@ class LineData(PlotData):
         )
         return desc
 
-    def get_range_min(self):
-        return self.x.min(1).min(0)
-
-    def get_range_max(self):
-        return self.x.max(1).max(0)
+    def extend(self, x_new: np.ndarray):
+        """Add time points to the end of every line.
+
+        The lines are stored in a buffer that grows geometrically along the time
+        axis, so the cost of extending is proportional to the number of new
+        points.
+
+        :param x_new: numpy array of shape (num_lines, num_new_points, num_dims)
+        """
+        x_new = np.asarray(x_new)
+        assert_dim(x_new, 3)
+        msg = "x_new must have shape (%d, num_new_points, %d)!"
+        msg = msg % (self.num_lines, self.num_dims)
+        assert x_new.shape[0] == self.num_lines, msg
+        assert x_new.shape[2] == self.num_dims, msg
+        self._buffer, n = append_along(self._buffer, self.num_points, x_new, 1)
+        self.x = self._buffer[:, 0:n, :]
+        self.num_points = n
+        self.extend_range(x_new)
+
+    def segments(self, dims=(0, 1)):
+        """Get the lines projected to dimensions *dims*.
+
+        :param dims: indices of the dimensions to keep
+        :return: array of shape (num_lines, num_points, len(dims)), which is a view
+            of *x* whenever the dimensions are equally spaced
+        """
+        return self.x[:, :, dims_index(dims)]
+
+    def window(self, start: int, stop: int, dims=(0, 1)):
+        """Get the time points *start, ..., stop - 1* of the lines projected to
+        dimensions *dims*.
+
+        :return: array of shape (num_lines, stop - start, len(dims)), which is a
+            view of *x* whenever the dimensions are equally spaced
+        """
+        return self.x[:, start:stop, dims_index(dims)]
 
 
 class QuiverData(PlotData):
@@ -93,11 +201,19 @@ class QuiverData(PlotData):
     :type x: np.ndarray
     :param v: numpy array of shape (num_arrows, num_dims)
     :type v: np.ndarray
+
+    Both arrays can also be given as paths to .npy files or zarr arrays.
     """
 
+    __slots__ = ("num_arrows", "num_dims", "x", "v", "color", "alpha")
+    array_fields = ("x", "v")
+    style_fields = ("color", "alpha")
+
     def __init__(self, x: np.ndarray, v: np.ndarray, color, alpha, label):
         if color is None:
             color = "gray30"
+        x = load_array(x)
+        v = load_array(v)
         assert_dim(x, 2)
         assert_dim(v, 2)
         assert x.shape == v.shape, "x and v must have same shape!"
@@ -117,9 +233,3 @@ class QuiverData(PlotData):
             self.num_dims,
         )
         return desc
-
-    def get_range_min(self):
-        return self.x.min(0)
-
-    def get_range_max(self):
-        return self.x.max(0)
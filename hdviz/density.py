@@ -0,0 +1,118 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_rgba
+from .utils import iter_chunks
+
+
+def code_dtype(bins: int):
+    """Smallest unsigned integer type that can hold bin codes *0, ..., bins*."""
+    return np.uint8 if bins < 2 ** 8 else np.uint16
+
+
+def bin_codes(x, lower: float, upper: float, bins: int):
+    """Quantize values to equal-width bins.
+
+    :param x: a numpy array of values
+    :param lower: lower edge of the first bin (or an array of them that broadcasts
+        against *x*)
+    :param upper: upper edge of the last bin (or an array of them)
+    :param bins: number of bins, at most 65535
+    :return: an unsigned integer array of same shape as *x*, containing the bin
+        index of each value, or *bins* for values that are outside the bins. Like in
+        *np.histogram*, the last bin includes its upper edge. If *lower* equals
+        *upper*, values equal to them are in the last bin.
+    """
+    assert 0 < bins < 2 ** 16, "number of bins must be between 1 and 65535"
+    x = np.asarray(x, dtype=float)
+    width = np.asarray(upper, dtype=float) - lower
+    width = np.where(width > 0, width, 1.0)
+    idx = np.floor((x - lower) * (bins / width))
+    idx[x == upper] = bins - 1
+    outside = ~((idx >= 0) & (idx < bins))
+    idx[outside] = bins
+    return idx.astype(code_dtype(bins))
+
+
+def quantize(x, limits, bins: int):
+    """Quantize each dimension of points against axis limits.
+
+    The points are read once, in chunks, after which the 2-d histogram of any
+    pair of dimensions can be computed cheaply with *pair_counts*.
+
+    :param x: array of shape *[num_points, num_dims]*
+    :param limits: axis limits, a list of *[min, max]* for each dimension
+    :param bins: number of bins per dimension
+    :return: an unsigned integer array of shape *[num_dims, num_points]*
+    """
+    limits = np.asarray(limits, dtype=float)
+    N, D = x.shape
+    codes = np.empty((D, N), dtype=code_dtype(bins))
+    start = 0
+    for chunk in iter_chunks(x):
+        end = start + chunk.shape[0]
+        codes[:, start:end] = bin_codes(chunk, limits[:, 0], limits[:, 1], bins).T
+        start = end
+    return codes
+
+
+def pair_counts(codes_x, codes_y, bins: int):
+    """Count points in each cell of a 2-d grid given their bin codes.
+
+    :return: an integer array of shape *[bins, bins]*, where the first index is the
+        bin of *codes_x*. Points outside the bins are not counted.
+    """
+    flat = codes_x.astype(np.intp) * (bins + 1) + codes_y
+    counts = np.bincount(flat, minlength=(bins + 1) ** 2)
+    return counts.reshape(bins + 1, bins + 1)[:bins, :bins]
+
+
+def density_counts(x, idx_x: int, idx_y: int, extent, bins: int):
+    """Compute a 2-d histogram of points projected to two dimensions.
+
+    The points are read in chunks, so *x* can be a memory-mapped array.
+
+    :param x: array of shape *[num_points, num_dims]*
+    :param extent: histogram limits *(xmin, xmax, ymin, ymax)*
+    :return: an integer array of shape *[bins, bins]*
+    """
+    counts = np.zeros((bins, bins), dtype=np.int64)
+    for chunk in iter_chunks(x):
+        cx = bin_codes(chunk[:, idx_x], extent[0], extent[1], bins)
+        cy = bin_codes(chunk[:, idx_y], extent[2], extent[3], bins)
+        counts += pair_counts(cx, cy, bins)
+    return counts
+
+
+def shade(counts, colors, how: str = "blend", cmap="viridis", min_alpha=0.25):
+    """Turn per-category histograms into an RGBA image.
+
+    :param counts: array of shape *[num_categories, bins_x, bins_y]*
+    :param colors: color of each category, used when *how* is *"blend"*
+    :param how: *"count"* or *"log"* to color the total count (or its logarithm)
+        using *cmap*, or *"blend"* to mix category colors in proportion to their
+        counts in each cell, with opacity given by the logarithm of the total count
+    :param cmap: name of a matplotlib colormap
+    :param min_alpha: opacity of cells with the smallest nonzero count in *"blend"*
+        mode
+    :return: an RGBA array of shape *[bins_y, bins_x, 4]*, to be shown with *imshow*
+        using *origin="lower"*
+    """
+    total = counts.sum(0)
+    filled = total > 0
+    cmax = max(total.max(), 1)
+    if how == "count":
+        norm = total / cmax
+    elif how in ("log", "blend"):
+        norm = np.log1p(total) / np.log1p(cmax)
+    else:
+        raise ValueError("how must be one of 'count', 'log' or 'blend'")
+    if how == "blend":
+        rgb = np.array([to_rgba(c)[0:3] for c in colors])
+        img = np.empty(total.shape + (4,))
+        weights = counts / np.maximum(total, 1)
+        img[..., 0:3] = np.tensordot(weights, rgb, axes=(0, 0))
+        img[..., 3] = min_alpha + (1.0 - min_alpha) * norm
+    else:
+        img = colormaps[cmap](norm)
+    img[~filled, 3] = 0.0
+    return img.transpose(1, 0, 2)
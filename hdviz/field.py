@@ -0,0 +1,73 @@
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .utils import Grid, iter_chunks, array_key, load_array
+
+# Maximum number of evaluated vector fields that are kept in the cache
+FIELD_CACHE_SIZE = 16
+
+_field_cache = OrderedDict()
+
+
+def points_key(x):
+    """A hashable key that identifies a grid or an array of points."""
+    if isinstance(x, Grid):
+        return ("grid", x.key())
+    if not hasattr(x, "shape"):
+        x = np.asarray(x)
+    return ("array",) + array_key(x)
+
+
+def iter_batches(x, batch_size: int):
+    """Iterate over blocks of points of a grid or an array."""
+    if isinstance(x, Grid):
+        return x.chunks(batch_size)
+    return iter_chunks(x, batch_size)
+
+
+def clear_field_cache():
+    """Remove all cached vector fields."""
+    _field_cache.clear()
+
+
+def evaluate_field(
+    f, x, batch_size: int = 10000, executor=None, n_jobs=None, cache: bool = True
+):
+    """Evaluate a vector field at given points in batches.
+
+    Results are cached by the points and the identity of *f*, so evaluating the
+    same function on the same grid again returns the cached result.
+
+    :param f: a vectorized function that maps an array of shape *[n, D]* to
+        an array of vectors of the same shape
+    :param x: array of shape *[num_points, D]*, a path to a .npy file or zarr
+        array of that shape, or a *Grid*
+    :param batch_size: number of points passed to *f* at a time
+    :param executor: *None* to evaluate batches one at a time, or *"thread"* or
+        *"process"* to evaluate them in a pool of threads or processes (then *f*
+        must be picklable)
+    :param n_jobs: number of workers in the pool
+    :param cache: whether to use the cache
+    :return: a read-only numpy array of shape *[num_points, D]*
+    """
+    x = load_array(x)
+    key = (f, points_key(x)) if cache else None
+    if key is not None and key in _field_cache:
+        _field_cache.move_to_end(key)
+        return _field_cache[key]
+    batches = iter_batches(x, batch_size)
+    if executor is None:
+        results = [np.asarray(f(b)) for b in batches]
+    elif executor in ("thread", "process"):
+        pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        with pool_class(max_workers=n_jobs) as pool:
+            results = [np.asarray(r) for r in pool.map(f, batches)]
+    else:
+        raise ValueError("executor must be None, 'thread' or 'process'")
+    v = np.concatenate(results, axis=0)
+    v.setflags(write=False)
+    if key is not None:
+        _field_cache[key] = v
+        while len(_field_cache) > FIELD_CACHE_SIZE:
+            _field_cache.popitem(last=False)
+    return v
@@ -1,8 +1,4 @@
-from .plotter_2d import Plotter2d
-from .plotter_3d import Plotter3d
-from .plotter_nd import PlotterNd
 from .utils import draw_plot
-import pandas as pd
 
 
 def determine_dimension(points, trajectories):
@@ -24,6 +20,10 @@ def create_plotter(D: int, no_3d: bool = False):
     :param no_3d: don't create 3d plots even if D=3
     :type no_3d: bool
     """
+    from .plotter_2d import Plotter2d
+    from .plotter_3d import Plotter3d
+    from .plotter_nd import PlotterNd
+
     if D == 2:
         return Plotter2d()
     elif D == 3:
@@ -34,6 +34,104 @@ def create_plotter(D: int, no_3d: bool = False):
         return PlotterNd(num_dims=D)
 
 
+def setup_plotter(
+    D: int,
+    scatter_kwargs=None,
+    quiver_kwargs=None,
+    lines_kwargs=None,
+    max_points=None,
+    max_trajectories=None,
+    seed=0,
+):
+    """Create a plotter with the styling and sampling options of *visualize*."""
+    ptr = create_plotter(D)
+    if scatter_kwargs is not None:
+        ptr.scatter_kwargs = scatter_kwargs
+    if lines_kwargs is not None:
+        ptr.lines_kwargs = lines_kwargs
+    if quiver_kwargs is not None:
+        ptr.quiver_kwargs = quiver_kwargs
+    ptr.max_points = max_points
+    ptr.max_lines = max_trajectories
+    ptr.sample_seed = seed
+    return ptr
+
+
+def create_axis_limits(xlim=None, ylim=None):
+    """Axis limits for *plot* from the *xlim* and *ylim* of *visualize*."""
+    if xlim is None:
+        return None
+    if ylim is None:
+        ylim = xlim
+    return [xlim, ylim]
+
+
+def build_plotter(
+    points=None,
+    labels=None,
+    colors=None,
+    u=None,
+    v=None,
+    trajectories=None,
+    xlim=None,
+    ylim=None,
+    scatter_kwargs=None,
+    quiver_kwargs=None,
+    lines_kwargs=None,
+    azimuth=None,
+    elevation=None,
+    max_points=None,
+    max_trajectories=None,
+    seed=0,
+    projection=None,
+    num_components=2,
+):
+    """Create a plotter and add data to it, like *visualize* does.
+
+    Arguments are the same as for *visualize*.
+
+    :return: a tuple *(plotter, axis_limits)*, where *axis_limits* should be
+        passed to the *plot* method of the plotter
+    """
+    from .plotter_3d import Plotter3d
+
+    if projection is not None:
+        points, u, v, trajectories = project_data(
+            projection, num_components, seed, points, u, v, trajectories
+        )
+    D = determine_dimension(points, trajectories)
+    ptr = setup_plotter(
+        D,
+        scatter_kwargs,
+        quiver_kwargs,
+        lines_kwargs,
+        max_points,
+        max_trajectories,
+        seed,
+    )
+    if points is not None:
+        N = points.shape[0]
+        if labels is None:
+            labels = N * ["unlabeled"]
+        labels, label_colors, label_names = parse_labeling(labels, colors)
+        ptr.add_pointsets(
+            points,
+            labels=labels,
+            label_names=label_names,
+            alpha=0.7,
+            label_colors=label_colors,
+        )
+    if u is not None:
+        ptr.add_quiverset(u, v, alpha=0.5)
+    if trajectories is not None:
+        ptr.add_lineset(trajectories, alpha=0.3)
+        x_first = trajectories[:, 0, :]
+        ptr.add_pointset(x_first, marker="x", color="k", alpha=0.3, label="start")
+    if isinstance(ptr, Plotter3d):
+        ptr.set_perspective(azimuth, elevation)
+    return ptr, create_axis_limits(xlim, ylim)
+
+
 def visualize(
     points=None,
     labels=None,
@@ -50,6 +148,11 @@ def visualize(
     save_dir=".",
     azimuth=None,
     elevation=None,
+    max_points=None,
+    max_trajectories=None,
+    seed=0,
+    projection=None,
+    num_components=2,
     **save_kwargs
 ):
     """Main function.
@@ -64,47 +167,229 @@ def visualize(
     :param ylim: y-axis limits.
     :param azimuth: Azimuthal viewing angle (default = -60).
     :param elevation: Elevation viewing angle (default = 30).
+    :param max_points: Maximum number of points to draw. Points are subsampled
+        so that small categories are kept whole. Axis limits still come from all
+        points.
+    :param max_trajectories: Maximum number of trajectories to draw.
+    :param seed: Random seed for subsampling and projections.
+    :param projection: Project the data to *num_components* dimensions before
+        plotting. Either a *Projection*, or a method (*"pca"*,
+        *"incremental_pca"*, *"random"* or *"sparse_random"*) for fitting one to
+        the points (or the trajectories if there are no points). Fitted
+        projections are cached, so calling again with the same data does not refit.
+    :param num_components: Number of dimensions after projection.
     :save_kwargs: Keyword arguments to saving plot.
     """
-    D = determine_dimension(points, trajectories)
-    N = points.shape[0]
-    if labels is None:
-        labels = N * ["unlabeled"]
-    labels, label_colors, label_names = parse_labeling(labels, colors)
-    ptr = create_plotter(D)
-    if scatter_kwargs is not None:
-        ptr.scatter_kwargs = scatter_kwargs
-    if lines_kwargs is not None:
-        ptr.lines_kwargs = lines_kwargs
-    if quiver_kwargs is not None:
-        ptr.quiver_kwargs = quiver_kwargs
-    if points is not None:
+    ptr, ax_limits = build_plotter(
+        points,
+        labels,
+        colors,
+        u,
+        v,
+        trajectories,
+        xlim,
+        ylim,
+        scatter_kwargs,
+        quiver_kwargs,
+        lines_kwargs,
+        azimuth,
+        elevation,
+        max_points,
+        max_trajectories,
+        seed,
+        projection,
+        num_components,
+    )
+    ptr.plot(axis_limits=ax_limits)
+    draw_plot(save_name, save_dir, **save_kwargs)
+
+
+def build_stream_plotter(
+    batches=None,
+    trajectories=None,
+    label_colors=None,
+    xlim=None,
+    ylim=None,
+    scatter_kwargs=None,
+    lines_kwargs=None,
+    azimuth=None,
+    elevation=None,
+    max_points=None,
+    max_trajectories=None,
+    seed=0,
+    sample_size=10000,
+    trajectory_sample_size=1000,
+    density_bins=256,
+    pairs=None,
+    max_pairs=45,
+):
+    """Create a plotter from streams of data, like *visualize_stream* does.
+
+    Arguments are the same as for *visualize_stream*.
+
+    :return: a tuple *(plotter, axis_limits)*, where *axis_limits* should be
+        passed to the *plot* method of the plotter
+    """
+    from .plotter_3d import Plotter3d
+    from .plotter_nd import PlotterNd
+    from .streaming import StreamAggregator
+
+    agg = StreamAggregator(
+        sample_size, trajectory_sample_size, density_bins, seed, pairs, max_pairs
+    )
+    if batches is not None:
+        for batch in batches:
+            agg.add(batch)
+    if trajectories is not None:
+        for chunk in trajectories:
+            agg.add_trajectories(chunk)
+    if agg.num_dims is None:
+        raise RuntimeError("points and trajectories can't both be empty!")
+    ptr = setup_plotter(
+        agg.num_dims,
+        scatter_kwargs,
+        None,
+        lines_kwargs,
+        max_points,
+        max_trajectories,
+        seed,
+    )
+    ptr.density_bins = density_bins
+    categories = agg.categories()
+    if len(categories) > 0:
+        x, codes = agg.sampled_points()
+        if label_colors is not None:
+            label_colors = [label_colors[key] for key in categories]
         ptr.add_pointsets(
-            points,
-            labels=labels,
-            label_names=label_names,
+            x,
+            labels=codes,
+            label_names=categories,
             alpha=0.7,
             label_colors=label_colors,
         )
-    if u is not None:
-        ptr.add_quiverset(u, v, alpha=0.5)
-    if trajectories is not None:
-        ptr.add_lineset(trajectories, alpha=0.3)
-        x_first = trajectories[:, 0, :]
+        for ps, key in zip(ptr.point_sets, categories):
+            ps._range = agg.ranges[agg.groups[key]]
+    if agg.lines.x is not None:
+        ptr.add_lineset(agg.lines.x, alpha=0.3)
+        ptr.line_sets[-1]._range = agg.line_range
+        x_first = agg.lines.x[:, 0, :]
         ptr.add_pointset(x_first, marker="x", color="k", alpha=0.3, label="start")
-    if xlim is not None:
-        if ylim is None:
-            ylim = xlim
-        ax_limits = [xlim, ylim]
-    else:
-        ax_limits = None
+        ptr.point_sets[-1]._range = agg.ranges[agg.start_group]
+    ptr._ranges = None
+    if agg.is_sampled:
+        ptr.density_source = agg
     if isinstance(ptr, Plotter3d):
         ptr.set_perspective(azimuth, elevation)
+    if isinstance(ptr, PlotterNd):
+        ptr.pairs = agg.plotted_pairs()
+    return ptr, create_axis_limits(xlim, ylim)
+
+
+def visualize_stream(
+    batches=None,
+    trajectories=None,
+    label_colors=None,
+    xlim=None,
+    ylim=None,
+    scatter_kwargs=None,
+    lines_kwargs=None,
+    save_name=None,
+    save_dir=".",
+    azimuth=None,
+    elevation=None,
+    max_points=None,
+    max_trajectories=None,
+    seed=0,
+    sample_size=10000,
+    trajectory_sample_size=1000,
+    density_bins=256,
+    pairs=None,
+    max_pairs=45,
+    **save_kwargs
+):
+    """Visualize data that is given in chunks, such as from a database cursor or
+    a sharded file reader.
+
+    The chunks are read once. Categories, axis ranges, 2-d histograms of every
+    pair of dimensions and random samples are collected on the way, so that only
+    the samples and histograms are kept in memory. If every point fits in the
+    samples, the plot is the same as with *visualize*. Otherwise the points are
+    drawn as density images of all points (except in 3d plots, which show the
+    samples).
+
+    :param batches: Iterable of point chunks of shape *[n, D]*, or of tuples
+        *(points, labels)* with the category of each point.
+    :param trajectories: Iterable of trajectory chunks of shape *[n, T, D]*.
+    :param label_colors: Color of each category (a dictionary).
+    :param xlim: x-axis limits.
+    :param ylim: y-axis limits.
+    :param azimuth: Azimuthal viewing angle (default = -60).
+    :param elevation: Elevation viewing angle (default = 30).
+    :param max_points: Maximum number of sampled points to draw.
+    :param max_trajectories: Maximum number of sampled trajectories to draw.
+    :param seed: Random seed for sampling.
+    :param sample_size: Maximum number of points kept of each category.
+    :param trajectory_sample_size: Maximum number of trajectories kept.
+    :param density_bins: Number of histogram bins per dimension.
+    :param pairs: Pairs of dimensions to plot if there are more than three
+        dimensions. Only histograms of these pairs are kept.
+    :param max_pairs: If *pairs* is not given, maximum number of pairs to plot,
+        which are the best separated pairs in the first chunk (None means all
+        pairs). Histograms of all pairs take *bins^2 D (D - 1) / 2* counts for
+        each category.
+    :save_kwargs: Keyword arguments to saving plot.
+    """
+    ptr, ax_limits = build_stream_plotter(
+        batches,
+        trajectories,
+        label_colors,
+        xlim,
+        ylim,
+        scatter_kwargs,
+        lines_kwargs,
+        azimuth,
+        elevation,
+        max_points,
+        max_trajectories,
+        seed,
+        sample_size,
+        trajectory_sample_size,
+        density_bins,
+        pairs,
+        max_pairs,
+    )
     ptr.plot(axis_limits=ax_limits)
     draw_plot(save_name, save_dir, **save_kwargs)
 
 
+def project_data(projection, num_components, seed, points, u, v, trajectories):
+    """Project points, arrows and trajectories with the same linear map.
+
+    :param projection: a *Projection* or the name of a method for fitting one
+    :return: the projected *points, u, v, trajectories*
+    """
+    from .projection import Projection, fit_projection
+
+    if not isinstance(projection, Projection):
+        x = points if points is not None else trajectories
+        if x is None:
+            raise RuntimeError("points and trajectories can't both be None!")
+        projection = fit_projection(x, projection, num_components, seed)
+    if callable(v):
+        raise ValueError("vectors given as a function can't be projected")
+    if points is not None:
+        points = projection.transform(points)
+    if u is not None:
+        u = projection.transform(u)
+        v = projection.transform_vectors(v)
+    if trajectories is not None:
+        trajectories = projection.transform(trajectories)
+    return points, u, v, trajectories
+
+
 def parse_labeling(labels, label_colors):
+    import pandas as pd
+
     a = pd.Categorical(labels)
     label_names = a.categories.to_list()
     labels = a.codes
@@ -0,0 +1,133 @@
+import copy
+import mmap
+import shutil
+import tempfile
+from collections import OrderedDict
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from .data import QuiverData
+from .utils import iter_chunks
+
+# Plotter of a worker process, set by the pool initializer
+_worker_plotter = None
+
+
+class SharedArray:
+    """Picklable handle to an array that worker processes open as a memmap.
+
+    Arrays that are memory-mapped from a file are referred to by that file. Other
+    arrays are written once to a .npy file in *tmp_dir*, so that every worker maps
+    the same data instead of receiving its own pickled copy.
+    """
+
+    def __init__(self, x, tmp_dir: str, name: str):
+        if isinstance(x, np.memmap) and isinstance(x.base, mmap.mmap) and x.filename:
+            self.filename = x.filename
+            self.offset = x.offset
+            fortran = x.flags.f_contiguous and not x.flags.c_contiguous
+            self.order = "F" if fortran else "C"
+        else:
+            self.filename = tmp_dir + "/" + name + ".npy"
+            out = np.lib.format.open_memmap(
+                self.filename, mode="w+", dtype=x.dtype, shape=x.shape
+            )
+            start = 0
+            for chunk in iter_chunks(x):
+                out[start : start + chunk.shape[0]] = chunk
+                start += chunk.shape[0]
+            out.flush()
+            self.offset = out.offset
+            self.order = "C"
+            del out
+        self.shape = tuple(x.shape)
+        self.dtype = np.dtype(x.dtype)
+
+    def open(self):
+        """Map the array into memory (read-only)."""
+        return np.memmap(
+            self.filename,
+            dtype=self.dtype,
+            mode="r",
+            offset=self.offset,
+            shape=self.shape,
+            order=self.order,
+        )
+
+
+def share_plotter(plotter, tmp_dir: str):
+    """Create a copy of a plotter that can be sent to worker processes.
+
+    The arrays of all data sets, including the growable buffers that their
+    arrays are views of, are replaced by *SharedArray* handles, so no data is
+    pickled.
+    """
+    shared = copy.copy(plotter)
+    shared._bin_codes = None
+    shared._merged = None
+    shared._pair_scores = None
+    shared._store = None
+    shared._samples = dict()
+    shared._simplified = OrderedDict()
+    set_lists = ("point_sets", "line_sets", "quiver_sets")
+    for name in set_lists:
+        sets = []
+        for k, ds in enumerate(getattr(plotter, name)):
+            ds = copy.copy(ds)
+            ds.x = SharedArray(ds.x, tmp_dir, "%s_%d_x" % (name, k))
+            if hasattr(ds, "_buffer"):
+                ds._buffer = ds.x
+            if isinstance(ds, QuiverData):
+                ds.v = SharedArray(ds.v, tmp_dir, "%s_%d_v" % (name, k))
+            sets.append(ds)
+        setattr(shared, name, sets)
+    return shared
+
+
+def _init_worker(plotter):
+    global _worker_plotter
+    for sets in (plotter.point_sets, plotter.line_sets, plotter.quiver_sets):
+        for ds in sets:
+            ds.x = ds.x.open()
+            if hasattr(ds, "_buffer"):
+                ds._buffer = ds.x
+            if isinstance(ds, QuiverData):
+                ds.v = ds.v.open()
+    _worker_plotter = plotter
+
+
+def _render_panel(idx_x: int, idx_y: int, figsize, dpi: float):
+    fig = Figure(figsize=figsize, dpi=dpi, constrained_layout=True)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    _worker_plotter.plot_panel(idx_x, idx_y, ax)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def render_panels(plotter, pairs, figsize, dpi: float, n_jobs: int):
+    """Render projections of a plotter to images in a pool of processes.
+
+    Each worker renders with the Agg canvas and maps the data of the plotter from
+    memory-mapped files, which are shared by all workers.
+
+    :param plotter: a *PlotterNd* whose axis limits have been set
+    :param pairs: list of dimension pairs *(idx_x, idx_y)* to render
+    :param figsize: size of one panel in inches
+    :param dpi: resolution of the images
+    :param n_jobs: number of worker processes
+    :return: a list of RGBA image arrays, one for each pair
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="hdviz-")
+    try:
+        shared = share_plotter(plotter, tmp_dir)
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(shared,)
+        ) as pool:
+            futures = [
+                pool.submit(_render_panel, i, j, figsize, dpi) for (i, j) in pairs
+            ]
+            return [f.result() for f in futures]
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
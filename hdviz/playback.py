@@ -0,0 +1,123 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+class LinePlayback:
+    """Animate the line sets of a plot along the time axis.
+
+    Each line set is drawn in each panel by line collections that are created
+    once. For every frame, the segments of the collections are set to views into
+    the time window of the lines, so a frame costs only as much as the drawn
+    window, and the data is never copied. All panels that the playback is
+    attached to are updated together by *update*.
+
+    :param plotter: the plotter whose line sets are animated
+    :param tail: number of time points that are shown behind the current one, or
+        None to show the whole line up to the current time point
+    :param fade_steps: number of parts of the tail, which are drawn with
+        increasing opacity towards the current time point
+    """
+
+    def __init__(self, plotter, tail=None, fade_steps: int = 8):
+        if tail is not None:
+            assert tail >= 1, "tail must be at least 1"
+        self.plotter = plotter
+        self.tail = tail
+        self.fade_steps = 1 if tail is None else max(1, min(fade_steps, tail))
+        self.panels = []
+        self.time = 0
+
+    @property
+    def num_points(self):
+        """Number of time points, which is the largest of all line sets."""
+        return max([ls.num_points for ls, _, _ in self.panels], default=0)
+
+    @property
+    def figure(self):
+        return self.panels[0][2][0].figure
+
+    def attach(self, ax, dims):
+        """Create the collections of all drawn line sets in one panel.
+
+        :param ax: the axes of the panel
+        :param dims: the two dimensions that the panel shows
+        """
+        plotter = self.plotter
+        for ls in plotter.render_linesets():
+            collections = []
+            for p in range(0, self.fade_steps):
+                lc = LineCollection(
+                    [], colors=ls.color, linestyles=ls.style, **plotter.lines_kwargs
+                )
+                lc.set_alpha(ls.alpha * (p + 1) / self.fade_steps)
+                collections.append(ax.add_collection(lc))
+            self.panels.append((ls, tuple(dims), collections))
+
+    def windows(self, t: int):
+        """Get the time windows of the fading parts of the lines at time *t*.
+
+        Consecutive windows share one time point, so that the parts are connected.
+
+        :return: list of *(start, stop)* from the oldest to the newest part
+        """
+        start = 0 if self.tail is None else max(0, t - self.tail)
+        edges = np.linspace(start, t, self.fade_steps + 1).astype(int)
+        return [(a, min(b + 1, t)) for a, b in zip(edges[:-1], edges[1:])]
+
+    def update(self, t: int):
+        """Show the lines up to time point *t* (exclusive) in all panels.
+
+        :return: list of the updated collections
+        """
+        self.time = t
+        artists = []
+        for ls, dims, collections in self.panels:
+            t_ls = min(t, ls.num_points)
+            for (a, b), lc in zip(self.windows(t_ls), collections):
+                lc.set_segments(ls.window(a, b, dims) if b - a >= 2 else [])
+                artists.append(lc)
+        return artists
+
+    def frames(self, step: int = 1):
+        """Time points of the frames, ending with all time points shown."""
+        T = self.num_points
+        return list(range(min(step, T), T, step)) + [T]
+
+    def animation(self, step: int = 1, interval: float = 40, **kwargs):
+        """Create a matplotlib animation of the playback.
+
+        :param step: number of time points between frames
+        :param interval: delay between frames in milliseconds
+        :param kwargs: other arguments to *FuncAnimation*
+        :return: a *FuncAnimation*
+        """
+        from matplotlib.animation import FuncAnimation
+
+        return FuncAnimation(
+            self.figure,
+            self.update,
+            frames=self.frames(step),
+            interval=interval,
+            **kwargs
+        )
+
+    def save(self, path: str, step: int = 1, fps: float = 30):
+        """Render the playback to a *.gif* or video file, or a directory of frames.
+
+        Frames are encoded on a background thread, see
+        *hdviz.animation.FrameEncoder*.
+
+        :return: *path*
+        """
+        from .animation import FrameEncoder
+
+        canvas = self.figure.canvas
+        encoder = FrameEncoder(path, fps)
+        try:
+            for t in self.frames(step):
+                self.update(t)
+                canvas.draw()
+                encoder.add_frame(canvas)
+        finally:
+            encoder.close()
+        return path
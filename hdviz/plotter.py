@@ -1,19 +1,47 @@
 import numpy as np
+from collections import OrderedDict
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
 from .data import PointData, LineData, QuiverData
 from .colors import category_palette
-from .utils import create_grid, square_axis_limits
-
-
-def inf_range(D):
-    mins = np.full(shape=D, fill_value=np.inf)
-    maxs = np.full(shape=D, fill_value=-np.inf)
-    return mins, maxs
+from .density import density_counts, shade
+from .sampling import subsample_sets
+from .field import evaluate_field
+from .store import PointStore, group_ranges
+from .simplify import simplify_lines, SIMPLIFY_CACHE_SIZE
+from .utils import create_grid, square_axis_limits, load_array, take_rows, Grid
+from .utils import is_in_memory
+from .utils import inf_range, combine_ranges, group_labels, dims_index
 
 
 def assert_num_dims(D1, D2):
     assert D1 == D2, "number of dimensions should be %d, but found %d" % (D2, D1)
 
 
+def update_artist(artist, ds, dims, line=None):
+    """Set the data of an existing artist to the current data of a data set.
+
+    :param artist: a scatter plot, a line collection, or a single line if *line*
+        is given
+    :param ds: the data set that was drawn with the artist
+    :param dims: dimensions that the artist shows
+    :param line: index of the line, if *artist* draws a single line
+    """
+    if line is not None:
+        coords = [ds.x[line, :, d] for d in dims]
+        if len(dims) == 3:
+            artist.set_data_3d(*coords)
+        else:
+            artist.set_data(*coords)
+    elif isinstance(ds, LineData):
+        artist.set_segments(ds.segments(dims))
+    elif len(dims) == 3:
+        artist._offsets3d = tuple(ds.x[:, d] for d in dims)
+    else:
+        artist.set_offsets(ds.x[:, dims_index(dims)])
+
+
 class Plotter:
     """Abstract plotter class."""
 
@@ -24,15 +52,71 @@ class Plotter:
         self.scatter_kwargs = dict()
         self.lines_kwargs = dict()
         self.quiver_kwargs = dict()
+        self.batch_lines = False
+
+        # Point sets with more points than this in total are drawn as density
+        # images instead of scatter plots (None means never)
+        self.density_threshold = 500000
+        self.density_bins = 256
+        self.density_how = "blend"
+        self.density_cmap = "viridis"
+
+        # Precomputed histograms that density images are drawn from instead of
+        # the point sets, for example of streamed data. An object with a method
+        # *pair_counts(idx_x, idx_y)* that returns *(counts, extent)*, where
+        # *counts* has one histogram for each point set (None means not used)
+        self.density_source = None
+
+        # Maximum total number of points and lines that are drawn, shared between
+        # sets so that small sets are kept whole (None means no limit)
+        self.max_points = None
+        self.max_lines = None
+        self.sample_seed = 0
+        self._samples = dict()
+        self._artists = []
+        self._store = None
+
+        # Draw all point sets with one scatter plot per marker from the columnar
+        # point store, instead of one scatter plot per set. None means only when
+        # more than *merge_threshold* point sets are drawn
+        self.merge_points = None
+        self.merge_threshold = 20
+        self._merged = None
+        self.max_legend_sets = 50
+
+        # Lines are simplified with the *line_simplify* method ("rdp", "minmax"
+        # or "stride") so that they move at most this many pixels when drawn
+        # (None means never)
+        self.line_tolerance = None
+        self.line_simplify = "rdp"
+        self._simplified = OrderedDict()
+
+        # Line playback that line sets are attached to instead of being drawn,
+        # set only while *plot_playback* is plotting
+        self._playback = None
 
         self.figsize = (7, 7)
+        self.square = False
+        self.auto_limits = True
         self.axis_limits = None
         self.num_dims = None
+        self._ranges = None
 
     def clear_data(self):
         self.point_sets = []
         self.line_sets = []
         self.quiver_sets = []
+        self._ranges = None
+        self._samples = dict()
+        self._store = None
+        self._merged = None
+        self._simplified = OrderedDict()
+
+    def add_dataset(self, sets: list, data):
+        """Append a data set to *sets* and update the combined data range."""
+        sets.append(data)
+        if self._ranges is not None:
+            self._ranges = combine_ranges(self._ranges, data.get_range())
 
     def num_pointsets(self):
         return len(self.point_sets)
@@ -52,13 +136,280 @@ class Plotter:
     def quiverset_names(self):
         return [qs.name for qs in self.quiver_sets]
 
+    def point_store(self, sets=None):
+        """Get point sets in columnar form.
+
+        The store is cached until the point sets or their styles change. Point sets
+        created by one *add_pointsets* call are already views into one buffer, in
+        which case the store does not copy them.
+
+        :param sets: list of point sets, by default all point sets of the plotter
+        """
+        if sets is None:
+            sets = self.point_sets
+        key = tuple(
+            (id(ps), ps.x.shape, str(ps.color), ps.alpha, ps.marker, ps.label)
+            for ps in sets
+        )
+        if self._store is None or self._store[0] != key:
+            self._store = (key, PointStore.from_sets(sets, self.num_dims))
+        return self._store[1]
+
     def recolor_pointsets(self):
         N = self.num_pointsets()
         colors = category_palette(N)
         for i in range(0, N):
             self.point_sets[i].set_color(colors[i])
 
+    def merged_points(self):
+        """Get the drawn points of all point sets grouped by marker.
+
+        The groups are cached until the drawn point sets change, so that all
+        panels share the same coordinate and color arrays.
+
+        :return: a list of tuples *(marker, x, colors)*, where *x* has shape
+            *[n, num_dims]* and *colors* is an array of shape *[n, 4]* with the
+            color and opacity of each point
+        """
+        store = self.point_store(self.render_pointsets())
+        if self._merged is None or self._merged[0] is not store:
+            colors = store.point_colors()
+            groups = []
+            for marker in dict.fromkeys(store.markers):
+                sel = [k for k, m in enumerate(store.markers) if m == marker]
+                if len(sel) == len(store):
+                    groups.append((marker, store.x, colors))
+                else:
+                    mask = np.isin(store.codes, sel)
+                    groups.append((marker, store.x[mask], colors[mask]))
+            self._merged = (store, groups)
+        return self._merged[1]
+
+    def use_merged_points(self):
+        """Check if point sets should be drawn from the point store with one
+        scatter plot per marker instead of one per set."""
+        if self.merge_points is None:
+            return len(self.render_pointsets()) > self.merge_threshold
+        return self.merge_points
+
+    def plot_points_merged(self, ax, idx_x: int = 0, idx_y: int = 1):
+        """Draw the point sets projected to two dimensions with one scatter plot
+        per marker.
+
+        Colors and opacities are given for each point, and edges of filled
+        markers are not drawn unless *edgecolors* is in *scatter_kwargs*, because
+        Agg draws markers with per-point edge colors much slower. The scatter
+        plots have no labels, so use *legend_handles* to create a legend. The
+        scatter plots are updated by *refresh* with the appended points.
+
+        With thousands of small point sets, this is about as fast as drawing one
+        point set with the same number of points.
+        """
+        for k, (marker, x, colors) in enumerate(self.merged_points()):
+            kwargs = dict()
+            if MarkerStyle(marker).is_filled():
+                kwargs["edgecolors"] = "none"
+            kwargs.update(self.scatter_kwargs)
+            sc = ax.scatter(
+                x[:, idx_x], x[:, idx_y], c=colors, marker=marker, **kwargs
+            )
+            self.track_artist("merged", k, (idx_x, idx_y), sc)
+
+    def legend_handles(self):
+        """Create legend handles for the drawn point sets.
+
+        The handles are not added to any axes, so they can be passed to
+        *legend* of one axis or of the figure, also when points are merged.
+        """
+        return [
+            Line2D(
+                [],
+                [],
+                linestyle="none",
+                marker=ps.marker,
+                color=ps.color,
+                alpha=ps.alpha,
+                label=ps.label,
+            )
+            for ps in self.render_pointsets()
+        ]
+
+    def add_legend(self, ax):
+        """Add a legend of the labeled artists of *ax* and, if point sets were
+        merged, of the point sets.
+
+        Only the first *max_legend_sets* point sets get an entry, followed by one
+        that tells how many more there are, because a longer legend does not fit
+        in the axes and takes longer to draw than the points.
+        """
+        handles = ax.get_legend_handles_labels()[0]
+        if self.use_merged_points() and not self.use_density():
+            handles = handles + self.legend_handles()
+        labels = set(ps.label for ps in self.render_pointsets())
+        limit = self.max_legend_sets
+        shown = []
+        num_sets = 0
+        for h in handles:
+            if h.get_label() in labels:
+                num_sets += 1
+                if limit is not None and num_sets > limit:
+                    continue
+            shown.append(h)
+        hidden = 0 if limit is None else max(0, num_sets - limit)
+        if hidden > 0:
+            more = Line2D([], [], linestyle="none", label="+%d more" % hidden)
+            shown.append(more)
+        if len(shown) > 0:
+            ax.legend(handles=shown)
+
+    def line_segments(self, ls: LineData, dims, ax):
+        """Get the lines of a line set projected to two dimensions for drawing.
+
+        If *line_tolerance* is set, the lines are simplified so that they differ
+        from the full lines by at most that many pixels on *ax*. Simplified lines
+        are cached by the line set, dimensions and pixel size of the data.
+
+        :return: an array of shape *[num_lines, num_points, 2]*, or a list of
+            arrays of shape *[n, 2]* if the lines are simplified
+        """
+        y = ls.segments(dims)
+        if self.line_tolerance is None:
+            return y
+        AL = self.get_axis_limits()
+        size = np.array([ax.bbox.width, ax.bbox.height])
+        scale = size / np.array([AL[d][1] - AL[d][0] for d in dims], dtype=float)
+        key = (
+            id(ls),
+            ls.x.shape,
+            tuple(dims),
+            tuple(scale),
+            self.line_tolerance,
+            self.line_simplify,
+        )
+        if key in self._simplified:
+            self._simplified.move_to_end(key)
+            return self._simplified[key]
+        lines = simplify_lines(y, scale, self.line_tolerance, self.line_simplify)
+        self._simplified[key] = lines
+        while len(self._simplified) > SIMPLIFY_CACHE_SIZE:
+            self._simplified.popitem(last=False)
+        return lines
+
+    def create_line_collection(self, ls: LineData, dims=(0, 1), segments=None):
+        """Create one collection that draws all lines of a line set.
+
+        :param segments: the lines to draw, by default *ls.segments(dims)*
+        """
+        if segments is None:
+            segments = ls.segments(dims)
+        return LineCollection(
+            segments,
+            colors=ls.color,
+            linestyles=ls.style,
+            alpha=ls.alpha,
+            **self.lines_kwargs
+        )
+
+    def subsampled(self, kind: str, sets: list, budget):
+        """Get data sets subsampled to a total budget.
+
+        The result is cached, so that all projections show the same subsample until
+        the data sets, budget or seed change. Ranges still come from the full data.
+        """
+        shapes = tuple((id(ds), ds.x.shape) for ds in sets)
+        key = (budget, self.sample_seed, shapes)
+        cached = self._samples.get(kind)
+        if cached is None or cached[0] != key:
+            cached = (key, subsample_sets(sets, budget, self.sample_seed))
+            self._samples[kind] = cached
+        return cached[1]
+
+    def render_pointsets(self):
+        """Get the point sets to draw, with at most *max_points* points in total."""
+        return self.subsampled("points", self.point_sets, self.max_points)
+
+    def render_linesets(self):
+        """Get the line sets to draw, with at most *max_lines* lines in total."""
+        return self.subsampled("lines", self.line_sets, self.max_lines)
+
+    def use_density(self):
+        """Check if point sets should be drawn as density images."""
+        if self.density_source is not None:
+            return True
+        threshold = self.density_threshold
+        if threshold is None:
+            return False
+        return sum(ps.num_points for ps in self.point_sets) > threshold
+
+    def panel_extent(self, idx_x: int, idx_y: int):
+        """Get axis limits *(xmin, xmax, ymin, ymax)* of a projection."""
+        AL = self.density_limits()
+        return AL[idx_x][0], AL[idx_x][1], AL[idx_y][0], AL[idx_y][1]
+
+    def density_limits(self):
+        """Get the axis limits that density images are binned against.
+
+        Limits of zero width, as of a constant dimension, are widened by 0.5 to
+        each side, so that the histogram bins have a nonzero width.
+        """
+        AL = self.axis_limits
+        if AL is None:
+            AL = self.create_axis_limits(square=False)
+        return [
+            [lower, upper] if upper > lower else [lower - 0.5, upper + 0.5]
+            for lower, upper in AL
+        ]
+
+    def point_counts(self, idx_x: int, idx_y: int):
+        """Compute 2-d histograms of each point set in a projection.
+
+        :return: an integer array of shape *[num_pointsets, bins, bins]*
+        """
+        extent = self.panel_extent(idx_x, idx_y)
+        bins = self.density_bins
+        counts = [
+            density_counts(ps.x, idx_x, idx_y, extent, bins) for ps in self.point_sets
+        ]
+        return np.stack(counts)
+
+    def plot_points_density(self, ax, idx_x: int = 0, idx_y: int = 1):
+        """Draw all point sets projected to two dimensions as one density image.
+
+        Each point set is binned into a 2-d histogram (or the histograms are taken
+        from *density_source*) and the histograms are shaded into an image, so the
+        cost of drawing depends on the number of bins rather than the number of
+        points. Empty scatter plots are added so that
+        the point sets still appear in the legend.
+        """
+        if self.density_source is not None:
+            counts, extent = self.density_source.pair_counts(idx_x, idx_y)
+        else:
+            extent = self.panel_extent(idx_x, idx_y)
+            counts = self.point_counts(idx_x, idx_y)
+        colors = [ps.color for ps in self.point_sets]
+        img = shade(counts, colors, self.density_how, self.density_cmap)
+        ax.imshow(
+            img, extent=extent, origin="lower", aspect="auto", interpolation="nearest"
+        )
+        for ps in self.point_sets:
+            ax.scatter([], [], color=ps.color, marker=ps.marker, label=ps.label)
+
+    def track_artist(self, kind: str, k: int, dims, artist, line=None):
+        """Remember an artist so that *refresh* can update it in place.
+
+        :param kind: *"points"*, *"lines"*, or *"merged"* for a scatter plot of
+            *merged_points*
+        :param k: index of the drawn data set
+        :param dims: dimensions that the artist shows
+        :param artist: the matplotlib artist
+        :param line: index of the line, if the artist draws a single line
+        """
+        self._artists.append((kind, k, tuple(dims), artist, line))
+
     def plot_setup(self, figsize=None, axis_limits=None, square=False):
+        self._artists = []
+        self.square = square
+        self.auto_limits = axis_limits is None
         if figsize is not None:
             self.figsize = figsize
         if axis_limits is not None:
@@ -96,7 +447,7 @@ class Plotter:
             label = "points %d" % (self.num_pointsets() + 1)
         ps = PointData(x, color, marker, alpha, label)
         assert_num_dims(ps.num_dims, self.num_dims)
-        self.point_sets += [ps]
+        self.add_dataset(self.point_sets, ps)
         if color is None:
             self.recolor_pointsets()
 
@@ -106,39 +457,175 @@ class Plotter:
             label = "lines %d" % (self.num_linesets() + 1)
         ls = LineData(x, color, style, alpha, label)
         assert_num_dims(ls.num_dims, self.num_dims)
-        self.line_sets += [ls]
+        self.add_dataset(self.line_sets, ls)
 
     def add_quiverset(
-        self, x: np.ndarray, v: np.ndarray, color=None, alpha=1.0, label=None
+        self,
+        x: np.ndarray,
+        v,
+        color=None,
+        alpha=1.0,
+        label=None,
+        batch_size: int = 10000,
+        executor=None,
+        n_jobs=None,
     ):
-        """Add an arrows set."""
+        """Add an arrows set.
+
+        :param x: arrow locations, a numpy array of shape (n_arrows, n_dims), a
+            path to a .npy file or zarr array of that shape, or a *Grid*
+        :param v: arrows, a numpy array of shape (n_arrows, n_dims), or a
+            vectorized function that computes them from locations. A function is
+            evaluated in batches and the result is cached, see
+            *hdviz.field.evaluate_field*.
+        :param batch_size: number of locations passed to *v* at a time
+        :param executor: *None*, *"thread"* or *"process"*, how batches are
+            evaluated
+        :param n_jobs: number of workers if *executor* is given
+        """
         if label is None:
             label = "arrows %d" % (self.num_quiversets() + 1)
-        # TODO: allow creation by passing only x and a function that computes v from x
+        x = load_array(x)
+        if callable(v):
+            v = evaluate_field(v, x, batch_size, executor, n_jobs)
+        if isinstance(x, Grid):
+            x = x.dense()
         qs = QuiverData(x, v, color, alpha, label)
         assert_num_dims(qs.num_dims, self.num_dims)
-        self.quiver_sets += [qs]
+        self.add_dataset(self.quiver_sets, qs)
 
-    def get_pointrange(self):
-        if self.num_pointsets() == 0:
+    def find_set(self, sets: list, label):
+        if label is None:
+            return sets[-1]
+        for ds in sets:
+            if ds.label == label:
+                return ds
+        raise ValueError("no data set with label %s" % label)
+
+    def append_points(self, x_new: np.ndarray, label=None):
+        """Add points to an existing point set.
+
+        :param x_new: a numpy array of shape (n_new_points, n_dims)
+        :param label: label of the point set, the last added set is used if None
+        """
+        ps = self.find_set(self.point_sets, label)
+        ps.append(x_new)
+        if self._ranges is not None:
+            self._ranges = combine_ranges(self._ranges, ps.get_range())
+
+    def extend_lines(self, x_new: np.ndarray, label=None):
+        """Add time points to the end of the lines of an existing line set.
+
+        :param x_new: a numpy array of shape (n_lines, n_new_points, n_dims)
+        :param label: label of the line set, the last added set is used if None
+        """
+        ls = self.find_set(self.line_sets, label)
+        ls.extend(x_new)
+        if self._ranges is not None:
+            self._ranges = combine_ranges(self._ranges, ls.get_range())
+
+    def refresh(self):
+        """Update the artists of the latest plot with appended data.
+
+        Scatter plots and lines are updated in place, and automatic axis limits
+        are recomputed only if the data no longer fits inside them. Data sets that were
+        added after plotting, and point sets drawn as density images, are not
+        updated. Simplified lines are updated with all of their points.
+
+        :return: True if the axis limits changed
+        """
+        sets = {"points": self.render_pointsets(), "lines": self.render_linesets()}
+        for kind, k, dims, artist, line in self._artists:
+            if kind == "merged":
+                _, x, colors = self.merged_points()[k]
+                artist.set_offsets(x[:, dims_index(dims)])
+                artist.set_facecolors(colors)
+            else:
+                update_artist(artist, sets[kind][k], dims, line)
+        if not self.auto_limits:
+            return False
+        amin, amax = self.get_max_ranges()
+        AL = np.array(self.get_axis_limits(), dtype=float)
+        if np.all(AL[:, 0] <= amin) and np.all(AL[:, 1] >= amax):
+            return False
+        self.set_axis_limits(square=self.square)
+        AL = self.get_axis_limits()
+        for _, _, dims, artist, _ in self._artists:
+            setters = (artist.axes.set_xlim, artist.axes.set_ylim)
+            if len(dims) == 3:
+                setters += (artist.axes.set_zlim,)
+            for d, setter in zip(dims, setters):
+                setter(AL[d][0], AL[d][1])
+        return True
+
+    def plot_playback(self, tail=None, fade_steps: int = 8, **plot_kwargs):
+        """Plot with the line sets animated along the time axis.
+
+        Points and arrows are plotted as usual, and the line sets are drawn by a
+        *LinePlayback* that updates line collections in place for each frame,
+        with views into the lines. For *PlotterNd*, all panels are updated in
+        lockstep. Lines are not simplified during playback.
+
+        :param tail: number of time points shown behind the current one, or None
+            to show the whole line up to the current time point
+        :param fade_steps: number of parts of the tail with increasing opacity
+        :param plot_kwargs: arguments to *plot*
+        :return: the *LinePlayback*, which shows no lines until it is updated
+        """
+        from .playback import LinePlayback
+
+        if len(self.line_sets) == 0:
+            raise RuntimeError("no line sets to play back!")
+        n_jobs = plot_kwargs.get("n_jobs")
+        if n_jobs is not None and n_jobs > 1:
+            raise RuntimeError("line playback needs panels drawn in this process")
+        self._playback = LinePlayback(self, tail, fade_steps)
+        try:
+            self.plot(**plot_kwargs)
+            return self._playback
+        finally:
+            self._playback = None
+
+    def to_html(self, path=None, title=None, point_size: float = 3.0):
+        """Export the data of the plotter as an interactive WebGL page.
+
+        The page is a single HTML file that works offline. The coordinates are
+        stored in it as binary float32 buffers, which are uploaded to the GPU
+        once, so rotating and zooming stays fast also for millions of points.
+        Drag to rotate 3-d views (or pan 2-d views, or with shift held), and use
+        the wheel to zoom. For *PlotterNd*, the shown dimensions are selected on
+        the page, and choosing a z-dimension gives a 3-d view.
+
+        :param path: file to write, or None to return the page as a string
+        :param title: title of the page
+        :param point_size: size of points in pixels
+        :return: the page as a string if *path* is None, otherwise *path*
+        """
+        from .webgl import plotter_html
+
+        page = plotter_html(self, title, point_size)
+        if path is None:
+            return page
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        return path
+
+    def get_sets_range(self, sets):
+        if len(sets) == 0:
             return inf_range(self.num_dims)
-        mins = np.vstack([ps.get_range_min() for ps in self.point_sets]).min(0)
-        maxs = np.vstack([ps.get_range_max() for ps in self.point_sets]).max(0)
+        ranges = [ds.get_range() for ds in sets]
+        mins = np.vstack([r[0] for r in ranges]).min(0)
+        maxs = np.vstack([r[1] for r in ranges]).max(0)
         return mins, maxs
 
+    def get_pointrange(self):
+        return self.get_sets_range(self.point_sets)
+
     def get_linerange(self):
-        if self.num_linesets() == 0:
-            return inf_range(self.num_dims)
-        mins = np.vstack([ls.get_range_min() for ls in self.line_sets]).min(0)
-        maxs = np.vstack([ls.get_range_max() for ls in self.line_sets]).max(0)
-        return mins, maxs
+        return self.get_sets_range(self.line_sets)
 
     def get_quiverrange(self):
-        if self.num_quiversets() == 0:
-            return inf_range(self.num_dims)
-        mins = np.vstack([qs.get_range_min() for qs in self.quiver_sets]).min(0)
-        maxs = np.vstack([qs.get_range_max() for qs in self.quiver_sets]).max(0)
-        return mins, maxs
+        return self.get_sets_range(self.quiver_sets)
 
     def get_all_ranges(self):
         r1, R1 = self.get_pointrange()
@@ -149,15 +636,29 @@ class Plotter:
         return mins, maxs
 
     def get_max_ranges(self):
-        mins, maxs = self.get_all_ranges()
-        return mins.min(0), maxs.max(0)
+        """Get range of all data sets combined.
+
+        Each data set caches its own range, so this costs O(number of sets) and is
+        further cached and updated incrementally as sets are added.
+        """
+        if self._ranges is None:
+            mins, maxs = self.get_all_ranges()
+            self._ranges = (mins.min(0), maxs.max(0))
+        return self._ranges[0].copy(), self._ranges[1].copy()
 
-    def create_grid_around_points(self, M: int = 30, square=True, scaling: float = 0.1):
+    def create_grid_around_points(
+        self, M: int = 30, square=True, scaling: float = 0.1, lazy: bool = False
+    ):
+        """Create a uniform grid around all data.
+
+        :param lazy: return a *Grid* that generates points on demand instead of a
+            numpy array of shape *[M^d, d]*
+        """
         ar = self.create_axis_limits(square, scale_margin=0.0)
         ar = np.array(ar)
         amin = ar[:, 0].tolist()
         amax = ar[:, 1].tolist()
-        return create_grid(amin, amax, M, scaling)
+        return create_grid(amin, amax, M, scaling, lazy)
 
     def add_pointsets(
         self,
@@ -171,9 +672,11 @@ class Plotter:
     ):
         """Add multiple point sets.
 
-        :param x: a numpy array  of shape (n_points, n_dims)
+        :param x: a numpy array  of shape (n_points, n_dims), or a path to a .npy
+            file or zarr array, which is then read lazily
         :type x: np.ndarray
-        :param labels: an integer numpy array of length n_points
+        :param labels: an integer numpy array of length n_points, or a pandas
+            Categorical, in which case categories are used as default label names
         :type labels: np.ndarray
         :param label_names: Label of each category. Must be a dictionary where
         categories
@@ -185,18 +688,22 @@ class Plotter:
         :param alpha: point  opacity
         :param label_name_prefix: prefix for label names if label_names is None
         """
-        ucat = np.unique(labels)
-        for u in ucat:
-            inds = np.where(labels == u)[0]
-            xu = x[inds, :]
+        x = load_array(x)
+        keys, order, offsets = group_labels(labels)
+        x_sorted = take_rows(x, order)
+        ranges = group_ranges(x_sorted, offsets) if is_in_memory(x_sorted) else None
+        for k, u in enumerate(keys):
+            xu = x_sorted[offsets[k] : offsets[k + 1]]
             label = (
-                (label_name_prefix + " %d" % u)
+                (label_name_prefix + " %s" % u)
                 if (label_names is None)
                 else label_names[u]
             )
             color = None if (label_colors is None) else label_colors[u]
             ps = PointData(xu, color, marker, alpha, label)
             assert_num_dims(ps.num_dims, self.num_dims)
-            self.point_sets += [ps]
+            if ranges is not None:
+                ps._range = (ranges[0][k], ranges[1][k])
+            self.add_dataset(self.point_sets, ps)
         if label_colors is None:
             self.recolor_pointsets()
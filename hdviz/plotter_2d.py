@@ -1,4 +1,3 @@
-from matplotlib import pyplot as plt
 from .plotter import Plotter
 
 
@@ -14,6 +13,8 @@ class Plotter2d(Plotter):
         # Setup and create figure
         self.plot_setup(figsize, axis_limits, square)
         if ax is None:
+            from matplotlib import pyplot as plt
+
             fig, ax = plt.subplots(1, 1, figsize=self.figsize)
 
         # Plot arrows, points and lines
@@ -23,7 +24,7 @@ class Plotter2d(Plotter):
 
         # Set legend, title and axis limits
         if self.num_pointsets() > 0:
-            ax.legend()
+            self.add_legend(ax)
         AL = self.get_axis_limits()
         if AL is not None:
             ax.set_xlim(AL[0][0], AL[0][1])
@@ -48,8 +49,14 @@ class Plotter2d(Plotter):
             )
 
     def plot_points(self, ax):
-        for ps in self.point_sets:
-            ax.scatter(
+        if self.use_density():
+            self.plot_points_density(ax, 0, 1)
+            return
+        if self.use_merged_points():
+            self.plot_points_merged(ax, 0, 1)
+            return
+        for k, ps in enumerate(self.render_pointsets()):
+            sc = ax.scatter(
                 ps.x[:, 0],
                 ps.x[:, 1],
                 color=ps.color,
@@ -58,15 +65,25 @@ class Plotter2d(Plotter):
                 label=ps.label,
                 **self.scatter_kwargs
             )
+            self.track_artist("points", k, (0, 1), sc)
 
     def plot_lines(self, ax):
-        for ls in self.line_sets:
+        if self._playback is not None:
+            self._playback.attach(ax, (0, 1))
+            return
+        for k, ls in enumerate(self.render_linesets()):
+            seg = self.line_segments(ls, (0, 1), ax)
+            if self.batch_lines:
+                lc = ax.add_collection(self.create_line_collection(ls, (0, 1), seg))
+                self.track_artist("lines", k, (0, 1), lc)
+                continue
             for j in range(0, ls.num_lines):
-                ax.plot(
-                    ls.x[j, :, 0],
-                    ls.x[j, :, 1],
+                (line,) = ax.plot(
+                    seg[j][:, 0],
+                    seg[j][:, 1],
                     color=ls.color,
                     linestyle=ls.style,
                     alpha=ls.alpha,
                     **self.lines_kwargs
                 )
+                self.track_artist("lines", k, (0, 1), line, j)
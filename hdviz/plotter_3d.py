@@ -1,5 +1,8 @@
-from matplotlib import pyplot as plt
+import matplotlib as mpl
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from .data import LineData
 from .plotter import Plotter
+from .points3d import DepthSortedPoints
 
 
 class Plotter3d(Plotter):
@@ -11,6 +14,10 @@ class Plotter3d(Plotter):
         self.azimuth = -60
         self.elevation = 30
 
+        # Draw all point sets as one depth-sorted image instead of 3d scatter
+        # plots, which is much faster for large point sets
+        self.fast_points = False
+
     def set_perspective(self, azimuth: float, elevation: float):
         """Set 3d perspective.
         :param azimuth: Azimuthal viewing angle (default = -60).
@@ -21,11 +28,39 @@ class Plotter3d(Plotter):
         if elevation is not None:
             self.elevation = elevation
 
+    def animate_rotation(self, path: str, num_frames: int = 360, fps=30, **kwargs):
+        """Render a rotating view to a *.gif* or video file, or a directory of
+        frames, starting from the current perspective.
+
+        The plot is created once and only the view is changed between frames, and
+        frames are encoded on a background thread. See
+        *hdviz.animation.animate_rotation* for the other arguments.
+        """
+        from .animation import animate_rotation
+
+        return animate_rotation(self, path, num_frames, fps, **kwargs)
+
+    def plot_playback(self, tail=None, fade_steps: int = 8, **plot_kwargs):
+        """Line playback is not supported in 3d plots."""
+        raise RuntimeError("line playback is not supported in 3d plots")
+
+    def create_line_collection(self, ls: LineData, dims=(0, 1, 2)):
+        """Create one 3d collection that draws all lines of a line set."""
+        return Line3DCollection(
+            ls.segments(dims),
+            colors=ls.color,
+            linestyles=ls.style,
+            alpha=ls.alpha,
+            **self.lines_kwargs
+        )
+
     def plot(self, figsize=None, axis_limits=None, square=False, ax=None, title=None):
 
         # Setup and create figure
         self.plot_setup(figsize, axis_limits, square)
         if ax is None:
+            from matplotlib import pyplot as plt
+
             fig = plt.figure(figsize=self.figsize)
             ax = fig.add_subplot(1, 1, 1, projection="3d")
         ax.view_init(elev=self.elevation, azim=self.azimuth)
@@ -65,9 +100,28 @@ class Plotter3d(Plotter):
                 **self.quiver_kwargs
             )
 
+    def plot_points_fast(self, ax):
+        """Draw all point sets as one depth-sorted image.
+
+        The points of all sets are projected with the view of the axes and sorted
+        by depth at once when the figure is drawn, and each pixel gets the color
+        of the nearest point, so drawing is about as fast as in 2d. Markers are
+        drawn as discs, without depth shading, and the image is not updated by
+        *refresh*. Empty scatter plots are added so that the point sets still
+        appear in the legend.
+        """
+        store = self.point_store(self.render_pointsets())
+        size = self.scatter_kwargs.get("s", mpl.rcParams["lines.markersize"] ** 2)
+        ax.add_artist(DepthSortedPoints(store.x, store.point_colors(), size))
+        for ps in self.render_pointsets():
+            ax.scatter([], [], [], color=ps.color, marker=ps.marker, label=ps.label)
+
     def plot_points(self, ax):
-        for ps in self.point_sets:
-            ax.scatter(
+        if self.fast_points:
+            self.plot_points_fast(ax)
+            return
+        for k, ps in enumerate(self.render_pointsets()):
+            sc = ax.scatter(
                 ps.x[:, 0],
                 ps.x[:, 1],
                 ps.x[:, 2],
@@ -77,11 +131,17 @@ class Plotter3d(Plotter):
                 label=ps.label,
                 **self.scatter_kwargs
             )
+            self.track_artist("points", k, (0, 1, 2), sc)
 
     def plot_lines(self, ax):
-        for ls in self.line_sets:
+        for k, ls in enumerate(self.render_linesets()):
+            if self.batch_lines:
+                lc = self.create_line_collection(ls, (0, 1, 2))
+                ax.add_collection3d(lc)
+                self.track_artist("lines", k, (0, 1, 2), lc)
+                continue
             for j in range(0, ls.num_lines):
-                ax.plot(
+                (line,) = ax.plot(
                     ls.x[j, :, 0],
                     ls.x[j, :, 1],
                     ls.x[j, :, 2],
@@ -90,3 +150,4 @@ class Plotter3d(Plotter):
                     alpha=ls.alpha,
                     **self.lines_kwargs
                 )
+                self.track_artist("lines", k, (0, 1, 2), line, j)
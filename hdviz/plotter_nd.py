@@ -1,5 +1,7 @@
-from matplotlib import pyplot as plt
 from .plotter import Plotter
+from .density import quantize, pair_counts
+from .ranking import pair_statistics, score_pairs, top_pairs
+from .parallel import render_panels
 from .utils import determine_nrows_ncols
 import numpy as np
 
@@ -10,10 +12,31 @@ class PlotterNd(Plotter):
     def __init__(self, num_dims: int):
         super().__init__()
         self.num_dims = num_dims
+        self._bin_codes = None
+
+        # Maximum number of dimension pairs that are plotted, chosen by ranking
+        # the pairs with the *pair_score* method (None means all pairs)
+        self.max_pairs = None
+        self.pair_score = "separation"
+        self._pair_scores = None
+
+        # Pairs of dimensions to plot, in plotting order (None means all pairs,
+        # or the top *max_pairs* of them)
+        self.pairs = None
+
+    def clear_data(self):
+        super().clear_data()
+        self._bin_codes = None
+        self._pair_scores = None
 
     def num_plots(self):
+        if self.pairs is not None:
+            return len(self.pairs)
         d = self.num_dims
-        return int(d * (d - 1) / 2)
+        n = int(d * (d - 1) / 2)
+        if self.max_pairs is not None:
+            n = min(n, self.max_pairs)
+        return n
 
     def create_axes(self, figsize, panelsize, nrows, ncols):
         """Create a figure for plotting dimension pairs to subplots."""
@@ -24,6 +47,8 @@ class PlotterNd(Plotter):
         if panelsize is None:
             panelsize = 6.0 if (nplots == 1) else 3.0
         figsize = (panelsize * ncols, panelsize * nrows)
+        from matplotlib import pyplot as plt
+
         _, axs = plt.subplots(
             nrows=nrows,
             ncols=ncols,
@@ -33,6 +58,40 @@ class PlotterNd(Plotter):
         )
         return axs
 
+    def pair_scores(self):
+        """Score all pairs of dimensions with the *pair_score* method.
+
+        The scores are computed from statistics that are collected in one pass
+        over the point sets (or line sets if there are no point sets), with each
+        set as one group, and cached until the data or method changes.
+
+        :return: a tuple *(pairs, scores)* as returned by *score_pairs*
+        """
+        sets = self.point_sets if len(self.point_sets) > 0 else self.line_sets
+        if len(sets) == 0:
+            raise RuntimeError("no data to rank dimension pairs with!")
+        key = (self.pair_score, tuple((id(ds), ds.x.shape) for ds in sets))
+        if self._pair_scores is None or self._pair_scores[0] != key:
+            stats = pair_statistics(sets)
+            self._pair_scores = (key, score_pairs(stats, self.pair_score))
+        return self._pair_scores[1]
+
+    def dim_pairs(self):
+        """List the pairs of dimensions that are plotted, in plotting order.
+
+        If *max_pairs* is set and smaller than the number of pairs, only the pairs
+        with the highest scores are plotted, in decreasing order of score. If
+        *pairs* is set, exactly those pairs are plotted.
+        """
+        if self.pairs is not None:
+            return [(int(i), int(j)) for i, j in self.pairs]
+        d = self.num_dims
+        n = int(d * (d - 1) / 2)
+        if self.max_pairs is None or self.max_pairs >= n:
+            return [(i, j) for i in range(0, d) for j in range(i + 1, d)]
+        pairs, scores = self.pair_scores()
+        return top_pairs(pairs, scores, self.max_pairs)
+
     def plot(
         self,
         figsize=None,
@@ -42,8 +101,13 @@ class PlotterNd(Plotter):
         ncols=None,
         panelsize=None,
         axs=None,
+        n_jobs=None,
     ):
-        """Plot dimension pairs."""
+        """Plot dimension pairs.
+
+        :param n_jobs: if larger than one, panels are rendered to images in this
+            many worker processes and the images are placed in the grid
+        """
 
         # Create figure and setup
         axs_not_given = axs is None
@@ -52,30 +116,25 @@ class PlotterNd(Plotter):
         self.plot_setup(figsize, axis_limits, square)
 
         # Get information
-        d = self.num_dims
         nrows, ncols = axs.shape
-        AL = self.get_axis_limits()
-        counter = 0
+        pairs = self.dim_pairs()
+        images = None
+        if n_jobs is not None and n_jobs > 1:
+            fig = axs[0, 0].figure
+            size = (fig.get_figwidth() / ncols, fig.get_figheight() / nrows)
+            images = render_panels(self, pairs, size, fig.dpi, n_jobs)
 
         # Loop through dimension pairs
-        for i in range(0, d):
-            for j in range(i + 1, d):
-
-                # Plot data
-                c = counter % ncols
-                r = int(np.floor(counter / ncols))
-                axis = axs[r, c]
-                self.plot_proj_arrows(i, j, axis)
-                self.plot_proj_points(i, j, axis)
-                self.plot_proj_lines(i, j, axis)
-
-                # Set axis labels and limits
-                axis.set_xlabel("dim " + str(i + 1))
-                axis.set_ylabel("dim " + str(j + 1))
-                if AL is not None:
-                    axis.set_xlim(AL[i][0], AL[i][1])
-                    axis.set_ylim(AL[j][0], AL[j][1])
-                counter += 1
+        for counter, (i, j) in enumerate(pairs):
+            c = counter % ncols
+            r = int(np.floor(counter / ncols))
+            axis = axs[r, c]
+            if images is None:
+                self.plot_panel(i, j, axis)
+            else:
+                axis.imshow(images[counter], interpolation="antialiased")
+                axis.set_axis_off()
+        counter = len(pairs)
 
         # Remove extra subplots
         while counter < nrows * ncols:
@@ -87,6 +146,17 @@ class PlotterNd(Plotter):
 
         return axs
 
+    def plot_panel(self, idx_x: int, idx_y: int, ax):
+        """Plot a projection and set its axis labels and limits."""
+        self.plot_proj(idx_x, idx_y, ax)
+        ax.set_xlabel("dim " + str(idx_x + 1))
+        ax.set_ylabel("dim " + str(idx_y + 1))
+        AL = self.get_axis_limits()
+        if AL is not None:
+            ax.set_xlim(AL[idx_x][0], AL[idx_x][1])
+            ax.set_ylim(AL[idx_y][0], AL[idx_y][1])
+        return ax
+
     def plot_proj(self, idx_x: int, idx_y: int, ax):
         """Plot a projection to two of the original dimensions."""
         # Plot arrows, points and lines
@@ -95,6 +165,39 @@ class PlotterNd(Plotter):
         self.plot_proj_lines(idx_x, idx_y, ax)
         return ax
 
+    def point_bin_codes(self):
+        """Get bin codes of all point sets in each dimension.
+
+        Every dimension is quantized once against the axis limits, and the result
+        is cached until the limits, number of bins or point sets change.
+
+        :return: a list with an array of shape *[num_dims, num_points]* for each
+            point set
+        """
+        AL = self.density_limits()
+        bins = self.density_bins
+        key = (
+            tuple(tuple(lim) for lim in AL),
+            bins,
+            tuple((id(ps), ps.x.shape) for ps in self.point_sets),
+        )
+        if self._bin_codes is None or self._bin_codes[0] != key:
+            codes = [quantize(ps.x, AL, bins) for ps in self.point_sets]
+            self._bin_codes = (key, codes)
+        return self._bin_codes[1]
+
+    def point_counts(self, idx_x: int, idx_y: int):
+        """Compute 2-d histograms of each point set in a projection.
+
+        The histograms are integer counts over bin codes that are shared by all
+        projections, so the floating point data is scanned only once per plot.
+
+        :return: an integer array of shape *[num_pointsets, bins, bins]*
+        """
+        bins = self.density_bins
+        codes = self.point_bin_codes()
+        return np.stack([pair_counts(c[idx_x], c[idx_y], bins) for c in codes])
+
     def plot_proj_arrows(self, idx_x, idx_y, ax):
         for qs in self.quiver_sets:
             ax.quiver(
@@ -110,8 +213,14 @@ class PlotterNd(Plotter):
         return ax
 
     def plot_proj_points(self, idx_x, idx_y, ax):
-        for ps in self.point_sets:
-            ax.scatter(
+        if self.use_density():
+            self.plot_points_density(ax, idx_x, idx_y)
+            return
+        if self.use_merged_points():
+            self.plot_points_merged(ax, idx_x, idx_y)
+            return
+        for k, ps in enumerate(self.render_pointsets()):
+            sc = ax.scatter(
                 ps.x[:, idx_x],
                 ps.x[:, idx_y],
                 color=ps.color,
@@ -120,15 +229,26 @@ class PlotterNd(Plotter):
                 label=ps.label,
                 **self.scatter_kwargs
             )
+            self.track_artist("points", k, (idx_x, idx_y), sc)
 
     def plot_proj_lines(self, idx_x, idx_y, ax):
-        for ls in self.line_sets:
-            for k in range(0, ls.num_lines):
-                ax.plot(
-                    ls.x[k, :, idx_x],
-                    ls.x[k, :, idx_y],
+        dims = (idx_x, idx_y)
+        if self._playback is not None:
+            self._playback.attach(ax, dims)
+            return
+        for k, ls in enumerate(self.render_linesets()):
+            seg = self.line_segments(ls, dims, ax)
+            if self.batch_lines:
+                lc = ax.add_collection(self.create_line_collection(ls, dims, seg))
+                self.track_artist("lines", k, dims, lc)
+                continue
+            for j in range(0, ls.num_lines):
+                (line,) = ax.plot(
+                    seg[j][:, 0],
+                    seg[j][:, 1],
                     color=ls.color,
                     linestyle=ls.style,
                     alpha=ls.alpha,
                     **self.lines_kwargs
                 )
+                self.track_artist("lines", k, dims, line, j)
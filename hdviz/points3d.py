@@ -0,0 +1,102 @@
+import numpy as np
+from matplotlib.artist import Artist, allow_rasterization
+
+
+def disc_offsets(radius: float):
+    """Pixel offsets *(dx, dy)* of the pixels in a disc around a pixel."""
+    r = int(np.floor(radius))
+    d = np.arange(-r, r + 1)
+    dx, dy = np.meshgrid(d, d)
+    inside = dx ** 2 + dy ** 2 <= max(radius, 0.5) ** 2
+    return dx[inside], dy[inside]
+
+
+def depth_raster(px, py, depth, colors, width: int, height: int, radius: float):
+    """Draw points as discs into an image, keeping the nearest point in each pixel.
+
+    The points are sorted by depth once. Of the points in the same pixel only the
+    nearest one is kept, because their discs are the same, and each pixel of the
+    image takes the color of the nearest disc that covers it.
+
+    :param px: horizontal pixel coordinates of the points
+    :param py: vertical pixel coordinates of the points, from the bottom
+    :param depth: depth of each point, smaller is nearer
+    :param colors: array of shape *[num_points, 4]* of RGBA colors in *uint8*
+    :param radius: radius of the discs in pixels
+    :return: RGBA image of shape *[height, width, 4]*, with the first row at the top
+    """
+    order = np.argsort(depth, kind="stable")
+    r = int(np.floor(radius))
+    # pixel of each point in an image padded by r on each side
+    W = width + 2 * r
+    H = height + 2 * r
+    cx = np.floor(px[order]).astype(np.intp) + r
+    cy = np.floor(py[order]).astype(np.intp) + r
+    inside = (cx >= 0) & (cx < W) & (cy >= 0) & (cy < H)
+    rank = np.flatnonzero(inside)
+    key = cy[inside] * W + cx[inside]
+    key, first = np.unique(key, return_index=True)
+    rank = rank[first]
+    N = len(order)
+    nearest = np.full(W * H, N, dtype=np.intp)
+    for dx, dy in zip(*disc_offsets(radius)):
+        pix = key + (dy * W + dx)
+        valid = (pix >= 0) & (pix < W * H)
+        np.minimum.at(nearest, pix[valid], rank[valid])
+    nearest = nearest.reshape(H, W)[r : r + height, r : r + width]
+    sorted_colors = np.vstack((colors[order], np.zeros((1, 4), dtype=np.uint8)))
+    return sorted_colors[nearest][::-1]
+
+
+class DepthSortedPoints(Artist):
+    """Points of many point sets drawn as one depth-sorted raster in 3d axes.
+
+    At draw time, all points are projected at once with the projection matrix of
+    the axes, and drawn as discs into one image of the size of the axes. The
+    points are kept in homogeneous coordinates, so that changing the view (for
+    example between frames of an animation) only needs one matrix product.
+
+    :param x: array of shape *[num_points, 3]*
+    :param colors: array of shape *[num_points, 4]* of RGBA colors in *[0, 1]*
+    :param size: marker size in points squared, as in *scatter*
+    """
+
+    def __init__(self, x, colors, size: float):
+        super().__init__()
+        x = np.asarray(x, dtype=float)
+        self.xh = np.vstack((x.T, np.ones(x.shape[0])))
+        self.colors = np.round(255 * np.asarray(colors)).astype(np.uint8)
+        self.size = size
+
+    @property
+    def x(self):
+        return self.xh[0:3].T
+
+    def project(self):
+        """Project the points to display coordinates.
+
+        :return: a tuple *(px, py, depth)* of arrays
+        """
+        ax = self.axes
+        v = ax.get_proj() @ self.xh
+        v[0:3] /= v[3]
+        pix = ax.transData.transform(v[0:2].T)
+        return pix[:, 0], pix[:, 1], v[2]
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or self.x.shape[0] == 0:
+            return
+        bbox = self.axes.bbox
+        width = int(np.ceil(bbox.width))
+        height = int(np.ceil(bbox.height))
+        px, py, depth = self.project()
+        radius = 0.5 * np.sqrt(self.size) * renderer.points_to_pixels(1.0)
+        img = depth_raster(
+            px - bbox.x0, py - bbox.y0, depth, self.colors, width, height, radius
+        )
+        gc = renderer.new_gc()
+        gc.set_clip_rectangle(bbox)
+        renderer.draw_image(gc, bbox.x0, bbox.y0, img)
+        gc.restore()
+        self.stale = False
@@ -0,0 +1,304 @@
+import numpy as np
+from collections import OrderedDict
+from .utils import load_array, is_in_memory, iter_chunks, array_key
+
+# Maximum number of fitted projections that are kept in the cache
+PROJECTION_CACHE_SIZE = 16
+
+_projection_cache = OrderedDict()
+
+
+class Projection:
+    """Linear map from *D* to *K* dimensions, *y = (x - mean) @ components.T*.
+
+    :param mean: array of length *D* that is subtracted before projecting
+    :param components: array of shape *[K, D]*
+    :param explained_variance: variance of the data along each component, if known
+    :param method: name of the method that created the projection
+    """
+
+    __slots__ = ("mean", "components", "explained_variance", "method")
+
+    def __init__(self, mean, components, explained_variance=None, method=None):
+        self.components = np.asarray(components, dtype=float)
+        self.mean = np.asarray(mean, dtype=float)
+        assert self.mean.shape == (self.num_input_dims,), "mean has wrong shape"
+        self.explained_variance = explained_variance
+        self.method = method
+
+    def __repr__(self):
+        return "<Projection %s (%d -> %d dims)>" % (
+            self.method,
+            self.num_input_dims,
+            self.num_dims,
+        )
+
+    @property
+    def num_dims(self):
+        return self.components.shape[0]
+
+    @property
+    def num_input_dims(self):
+        return self.components.shape[1]
+
+    def apply(self, x, center: bool, chunk_size=None):
+        """Multiply the last axis of *x* by the components, in chunks if *x* is
+        not in memory, and subtract the projected mean if *center* is True."""
+        x = load_array(x)
+        D = self.num_input_dims
+        assert x.shape[-1] == D, "expected %d dimensions, found %d" % (D, x.shape[-1])
+        W = self.components.T
+        shift = self.mean @ W if center else 0.0
+        if is_in_memory(x):
+            return x @ W - shift
+        out = np.empty(tuple(x.shape[:-1]) + (self.num_dims,))
+        flat = out.reshape(-1, self.num_dims)
+        start = 0
+        for chunk in iter_chunks(x, chunk_size):
+            chunk = chunk.reshape(-1, D)
+            flat[start : start + chunk.shape[0]] = chunk @ W - shift
+            start += chunk.shape[0]
+        return out
+
+    def transform(self, x, chunk_size=None):
+        """Project points, trajectories or arrow locations.
+
+        :param x: array whose last axis has length *D*, for example points of shape
+            *[N, D]* or trajectories of shape *[L, T, D]*; memory-mapped arrays
+            are projected in chunks
+        :return: array with the same shape as *x*, except that the last axis has
+            length *K*
+        """
+        return self.apply(x, True, chunk_size)
+
+    def transform_vectors(self, v, chunk_size=None):
+        """Project vectors, such as the arrows of a quiver set, without centering."""
+        return self.apply(v, False, chunk_size)
+
+
+def flip_signs(components):
+    """Make the largest absolute value of each component positive."""
+    idx = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(components.shape[0]), idx])
+    signs[signs == 0] = 1.0
+    return components * signs[:, None]
+
+
+def stream_mean(x, chunk_size=None):
+    """Compute the mean of each dimension (last axis) of *x* in one pass.
+
+    :return: a tuple *(mean, num_rows)*
+    """
+    D = x.shape[-1]
+    total = np.zeros(D)
+    n = 0
+    for chunk in iter_chunks(x, chunk_size):
+        chunk = chunk.reshape(-1, D)
+        total += chunk.sum(axis=0)
+        n += chunk.shape[0]
+    return total / max(n, 1), n
+
+
+def gram_product(x, mean, Q, chunk_size=None):
+    """Compute *A.T @ A @ Q*, where *A* is *x* centered by *mean*, in one pass."""
+    D = x.shape[-1]
+    out = np.zeros((D, Q.shape[1]))
+    for chunk in iter_chunks(x, chunk_size):
+        chunk = chunk.reshape(-1, D) - mean
+        out += chunk.T @ (chunk @ Q)
+    return out
+
+
+def randomized_pca(
+    x,
+    num_components: int = 2,
+    oversamples: int = 10,
+    n_iter: int = 4,
+    seed: int = 0,
+    chunk_size=None,
+):
+    """Principal components by randomized subspace iteration.
+
+    A random subspace of the data dimensions is refined by power iterations with
+    the covariance matrix, which is never formed. Each iteration is one pass over
+    the data, so memory-mapped arrays are read in chunks and the memory use
+    depends only on the number of dimensions.
+
+    :param x: array whose last axis has length *D*
+    :param num_components: number of components *K*
+    :param oversamples: number of extra subspace dimensions, which improve accuracy
+    :param n_iter: number of power iterations
+    :param seed: random seed
+    :param chunk_size: number of rows (first axis of *x*) read at a time
+    :return: a *Projection*
+    """
+    x = load_array(x)
+    D = x.shape[-1]
+    assert num_components <= D, "num_components must be at most the dimension"
+    mean, n = stream_mean(x, chunk_size)
+    size = min(D, num_components + oversamples)
+    rng = np.random.default_rng(seed)
+    Q, _ = np.linalg.qr(rng.normal(size=(D, size)))
+    for _ in range(0, n_iter):
+        Q, _ = np.linalg.qr(gram_product(x, mean, Q, chunk_size))
+    B = Q.T @ gram_product(x, mean, Q, chunk_size)
+    evals, W = np.linalg.eigh(0.5 * (B + B.T))
+    order = np.argsort(evals)[::-1][0:num_components]
+    components = flip_signs((Q @ W[:, order]).T)
+    variance = evals[order] / max(n - 1, 1)
+    return Projection(mean, components, variance, "pca")
+
+
+class IncrementalPCA:
+    """Principal components that are updated one chunk of data at a time.
+
+    Each chunk is combined with the current components and mean, and only the
+    leading components are kept, so the data never has to be in memory at once
+    and can be given as a stream of chunks.
+
+    :param num_components: number of components *K*
+    """
+
+    def __init__(self, num_components: int = 2):
+        self.num_components = num_components
+        self.num_rows = 0
+        self.mean = None
+        self.singular_values = None
+        self.components = None
+
+    def partial_fit(self, chunk):
+        """Update the components with a chunk of data.
+
+        :param chunk: array whose last axis has length *D*
+        """
+        D = chunk.shape[-1]
+        chunk = np.asarray(chunk, dtype=float).reshape(-1, D)
+        m = chunk.shape[0]
+        if m == 0:
+            return self
+        n = self.num_rows
+        mean_chunk = chunk.mean(axis=0)
+        if n == 0:
+            A = chunk - mean_chunk
+            self.mean = mean_chunk
+        else:
+            correction = np.sqrt(n * m / (n + m)) * (self.mean - mean_chunk)
+            A = np.vstack(
+                (
+                    self.singular_values[:, None] * self.components,
+                    chunk - mean_chunk,
+                    correction,
+                )
+            )
+            self.mean = (n * self.mean + m * mean_chunk) / (n + m)
+        self.num_rows = n + m
+        _, S, Vt = np.linalg.svd(A, full_matrices=False)
+        self.singular_values = S[0 : self.num_components]
+        self.components = Vt[0 : self.num_components]
+        return self
+
+    def projection(self):
+        """Get the current components as a *Projection*."""
+        if self.components is None:
+            raise RuntimeError("no data has been given!")
+        n = self.num_rows
+        variance = self.singular_values ** 2 / max(n - 1, 1)
+        return Projection(
+            self.mean, flip_signs(self.components), variance, "incremental_pca"
+        )
+
+
+def incremental_pca(x, num_components: int = 2, chunk_size=None):
+    """Principal components computed in one pass over chunks of data.
+
+    :param x: array whose last axis has length *D*, for example a memory-mapped
+        array, or an iterable of such arrays
+    :param num_components: number of components *K*
+    :param chunk_size: number of rows (first axis of *x*) read at a time, if *x*
+        is an array
+    :return: a *Projection*
+    """
+    x = load_array(x)
+    chunks = iter_chunks(x, chunk_size) if hasattr(x, "shape") else x
+    ipca = IncrementalPCA(num_components)
+    for chunk in chunks:
+        ipca.partial_fit(chunk)
+    return ipca.projection()
+
+
+def random_projection(
+    num_input_dims: int, num_components: int = 2, seed: int = 0, sparse=False
+):
+    """Random linear projection, which approximately preserves distances.
+
+    :param num_input_dims: number of dimensions *D* of the data
+    :param num_components: number of components *K*
+    :param seed: random seed
+    :param sparse: use a sparse matrix of values *-1, 0, 1* (with probabilities
+        1/6, 2/3 and 1/6) instead of a Gaussian matrix
+    :return: a *Projection*
+    """
+    rng = np.random.default_rng(seed)
+    shape = (num_components, num_input_dims)
+    if sparse:
+        W = rng.choice([-1.0, 0.0, 1.0], size=shape, p=[1 / 6, 2 / 3, 1 / 6])
+        W *= np.sqrt(3.0 / num_components)
+        method = "sparse_random"
+    else:
+        W = rng.normal(scale=1.0 / np.sqrt(num_components), size=shape)
+        method = "random"
+    return Projection(np.zeros(num_input_dims), W, None, method)
+
+
+def clear_projection_cache():
+    """Remove all cached projections."""
+    _projection_cache.clear()
+
+
+def fit_projection(
+    x,
+    method: str = "pca",
+    num_components: int = 2,
+    seed: int = 0,
+    cache: bool = True,
+    **kwargs
+):
+    """Fit a projection to data.
+
+    Fitted projections are cached by the data, method and arguments, so that
+    fitting again to the same data returns the cached projection.
+
+    :param x: array whose last axis has length *D*, or a path to a .npy file or
+        zarr array
+    :param method: *"pca"* (randomized), *"incremental_pca"*, *"random"* or
+        *"sparse_random"*
+    :param num_components: number of components *K*
+    :param seed: random seed
+    :param cache: whether to use the cache
+    :param kwargs: other arguments to the fitting function
+    :return: a *Projection*
+    """
+    x = load_array(x)
+    D = x.shape[-1]
+    if method in ("random", "sparse_random"):
+        data_key = D
+    elif method in ("pca", "incremental_pca"):
+        data_key = array_key(x) if cache else None
+    else:
+        raise ValueError("unknown projection method '%s'" % method)
+    key = (method, num_components, seed, tuple(sorted(kwargs.items())), data_key)
+    if cache and key in _projection_cache:
+        _projection_cache.move_to_end(key)
+        return _projection_cache[key]
+    if method == "pca":
+        proj = randomized_pca(x, num_components, seed=seed, **kwargs)
+    elif method == "incremental_pca":
+        proj = incremental_pca(x, num_components, **kwargs)
+    else:
+        sparse = method == "sparse_random"
+        proj = random_projection(D, num_components, seed, sparse)
+    if cache:
+        _projection_cache[key] = proj
+        while len(_projection_cache) > PROJECTION_CACHE_SIZE:
+            _projection_cache.popitem(last=False)
+    return proj
@@ -0,0 +1,107 @@
+import numpy as np
+from .utils import iter_chunks
+
+# Methods for scoring pairs of dimensions
+PAIR_SCORES = ("separation", "correlation", "variance")
+
+
+class PairStatistics:
+    """Sufficient statistics for scoring pairs of dimensions.
+
+    Collected in one pass over the data: the number of points and the sum of
+    points in each group, and the sum of outer products of all points. Points are
+    shifted by *shift* before summing, for numerical accuracy.
+    """
+
+    __slots__ = ("counts", "sums", "products", "shift")
+
+    def __init__(self, num_groups: int, num_dims: int):
+        self.counts = np.zeros(num_groups)
+        self.sums = np.zeros((num_groups, num_dims))
+        self.products = np.zeros((num_dims, num_dims))
+        self.shift = None
+
+    def update(self, k: int, chunk):
+        """Add a chunk of points of group *k*."""
+        chunk = np.asarray(chunk, dtype=float).reshape(-1, self.sums.shape[1])
+        if chunk.shape[0] == 0:
+            return
+        if self.shift is None:
+            self.shift = chunk.mean(axis=0)
+        chunk = chunk - self.shift
+        self.counts[k] += chunk.shape[0]
+        self.sums[k] += chunk.sum(axis=0)
+        self.products += chunk.T @ chunk
+
+    def covariance(self):
+        """Covariance matrix of all points."""
+        n = self.counts.sum()
+        total = self.sums.sum(axis=0)
+        return (self.products - np.outer(total, total) / n) / max(n - 1, 1)
+
+    def scatter_matrices(self):
+        """Within-group and between-group scatter matrices *(W, B)*."""
+        n = self.counts.sum()
+        total = self.sums.sum(axis=0)
+        nonempty = self.counts > 0
+        sums = self.sums[nonempty]
+        group = (sums.T / self.counts[nonempty]) @ sums
+        return self.products - group, group - np.outer(total, total) / n
+
+
+def pair_statistics(sets, chunk_size=None):
+    """Collect *PairStatistics* of data sets, one group for each set.
+
+    :param sets: list of data sets whose *x* has dimensions as the last axis
+    """
+    D = sets[0].x.shape[-1]
+    stats = PairStatistics(len(sets), D)
+    for k, ds in enumerate(sets):
+        for chunk in iter_chunks(ds.x, chunk_size):
+            stats.update(k, chunk)
+    return stats
+
+
+def score_pairs(stats: PairStatistics, method: str = "separation"):
+    """Score all pairs of dimensions.
+
+    :param stats: statistics of the data
+    :param method: *"separation"* scores a pair by how well the groups are
+        separated in its projection (the Fisher criterion *trace(W^-1 B)* of
+        the 2-d within- and between-group scatter matrices), *"correlation"* by
+        the absolute correlation of the two dimensions, and *"variance"* by the
+        total variance of the two dimensions. With fewer than two non-empty
+        groups, *"separation"* falls back to *"variance"*, because there is
+        nothing to separate.
+    :return: a tuple *(pairs, scores)*, where *pairs* is an integer array of shape
+        *[num_pairs, 2]* in plotting order
+    """
+    D = stats.sums.shape[1]
+    i, j = np.triu_indices(D, k=1)
+    if method == "separation" and np.count_nonzero(stats.counts) < 2:
+        method = "variance"
+    if method == "separation":
+        W, B = stats.scatter_matrices()
+        a, b, c = W[i, i], W[i, j], W[j, j]
+        det = a * c - b * b
+        num = c * B[i, i] - 2 * b * B[i, j] + a * B[j, j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(det > 0, num / det, 0.0)
+    elif method == "correlation":
+        C = stats.covariance()
+        sd = np.sqrt(np.diag(C))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.abs(C[i, j] / (sd[i] * sd[j]))
+        scores = np.nan_to_num(scores)
+    elif method == "variance":
+        C = stats.covariance()
+        scores = C[i, i] + C[j, j]
+    else:
+        raise ValueError("method must be one of " + ", ".join(PAIR_SCORES))
+    return np.stack((i, j), axis=1), scores
+
+
+def top_pairs(pairs, scores, k: int):
+    """Select the *k* pairs with highest scores, in decreasing order of score."""
+    order = np.argsort(-scores, kind="stable")[0:k]
+    return [(int(p[0]), int(p[1])) for p in pairs[order]]
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def allocate_budget(sizes, budget):
+    """Split a budget of objects between groups.
+
+    Groups that are smaller than their fair share are kept whole and the rest of
+    the budget is split evenly between the larger groups, so that small groups
+    survive subsampling.
+
+    :param sizes: number of objects in each group
+    :param budget: maximum total number of objects to keep, or None for no limit
+    :return: an integer array with the number of objects to keep from each group
+    """
+    sizes = np.asarray(sizes, dtype=int)
+    if budget is None or sizes.sum() <= budget:
+        return sizes.copy()
+    order = np.argsort(sizes, kind="stable")
+    take = np.zeros_like(sizes)
+    remaining = int(budget)
+    for k, g in enumerate(order):
+        share = remaining // (len(sizes) - k)
+        if sizes[g] <= share:
+            take[g] = sizes[g]
+            remaining -= sizes[g]
+        else:
+            large = order[k:]
+            take[large] = share
+            extra = remaining - share * len(large)
+            take[np.sort(large)[0:extra]] += 1
+            break
+    return take
+
+
+def sample_indices(n: int, size: int, seed: int, stream: int = 0):
+    """Draw a sorted random subset of *range(n)* reproducibly.
+
+    :param n: number of objects to sample from
+    :param size: number of objects to keep
+    :param seed: random seed
+    :param stream: index of the group, so that each group gets its own random
+        stream for the same seed
+    """
+    rng = np.random.default_rng([seed, stream])
+    return np.sort(rng.choice(n, size=size, replace=False))
+
+
+def subsample_sets(sets, budget, seed: int = 0):
+    """Subsample data sets to a total budget, stratified by set.
+
+    :param sets: list of data sets (for example one *PointData* for each label)
+    :param budget: maximum total number of objects, or None for no limit
+    :param seed: random seed
+    :return: list of data sets, where sets that need to be reduced are replaced by
+        subsets that keep the range of the full set
+    """
+    take = allocate_budget([ds.num_objects for ds in sets], budget)
+    out = []
+    for k, ds in enumerate(sets):
+        if take[k] == ds.num_objects:
+            out.append(ds)
+        else:
+            out.append(ds.subset(sample_indices(ds.num_objects, take[k], seed, k)))
+    return out
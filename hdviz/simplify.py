@@ -0,0 +1,167 @@
+import numpy as np
+
+# Methods for simplifying lines
+SIMPLIFY_METHODS = ("rdp", "minmax", "stride")
+
+# Maximum number of simplified projections of line sets that a plotter caches
+SIMPLIFY_CACHE_SIZE = 64
+
+
+def segment_distances2(px, py, ax, ay, bx, by):
+    """Squared distance of points *(px, py)* to line segments from *(ax, ay)* to
+    *(bx, by)*.
+
+    All arguments are 1-dimensional arrays of the same length.
+    """
+    dx = bx - ax
+    dy = by - ay
+    qx = px - ax
+    qy = py - ay
+    length2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qx * dx + qy * dy) / length2
+    t = np.clip(np.where(length2 > 0, t, 0.0), 0.0, 1.0)
+    ex = qx - t * dx
+    ey = qy - t * dy
+    return ex * ex + ey * ey
+
+
+def endpoint_mask(num_lines: int, num_points: int):
+    """Boolean array of shape *[num_lines, num_points]* that is True at both ends."""
+    keep = np.zeros((num_lines, num_points), dtype=bool)
+    keep[:, 0] = True
+    keep[:, num_points - 1] = True
+    return keep
+
+
+def cell_mask(y, cell: float):
+    """Keep only the first and last point of runs of points in the same grid cell.
+
+    Removed points are within one cell diagonal of a kept point of the same run.
+
+    :param y: array of shape *[num_lines, num_points, 2]*
+    :param cell: side length of the grid cells
+    :return: boolean array of shape *[num_lines, num_points]*, True for kept points
+    """
+    codes = np.floor(y / cell)
+    change = np.any(codes[:, 1:] != codes[:, :-1], axis=2)
+    keep = endpoint_mask(y.shape[0], y.shape[1])
+    keep[:, 1:] |= change
+    keep[:, :-1] |= change
+    return keep
+
+
+def rdp_mask(y, tolerance: float):
+    """Ramer-Douglas-Peucker simplification of many lines at once.
+
+    Runs of points in the same grid cell (with a diagonal of half the tolerance)
+    are first reduced to their end points, and the remaining points are simplified
+    with half the tolerance. All intervals of all lines are split in the same
+    vectorized step, so the number of steps is the depth of the recursion rather
+    than the number of points kept.
+
+    :param y: array of shape *[num_lines, num_points, 2]*
+    :param tolerance: maximum distance of removed points from the simplified line
+    :return: boolean array of shape *[num_lines, num_points]*, True for kept points
+    """
+    L, T, _ = y.shape
+    candidates = np.flatnonzero(cell_mask(y, 0.5 * tolerance / np.sqrt(2)))
+    px = y[:, :, 0].reshape(-1)[candidates]
+    py = y[:, :, 1].reshape(-1)[candidates]
+    keep = endpoint_mask(L, T).reshape(-1)[candidates]
+    inner = np.flatnonzero(~keep)
+    while inner.size > 0:
+        kept = np.flatnonzero(keep)
+        k = np.searchsorted(kept, inner) - 1
+        a = kept[k]
+        b = kept[k + 1]
+        d = segment_distances2(px[inner], py[inner], px[a], py[a], px[b], py[b])
+        new_interval = np.diff(k, prepend=-1) != 0
+        starts = np.flatnonzero(new_interval)
+        dmax = np.maximum.reduceat(d, starts)
+        split = dmax > (0.5 * tolerance) ** 2
+        if not np.any(split):
+            break
+        # first point with the maximum distance in each interval
+        interval = np.cumsum(new_interval) - 1
+        pos = np.where(d == dmax[interval], np.arange(inner.size), inner.size)
+        pos = np.minimum.reduceat(pos, starts)
+        keep[inner[pos[split]]] = True
+        # points of intervals that were not split are removed for good
+        inner = inner[split[interval] & ~keep[inner]]
+    out = np.zeros(L * T, dtype=bool)
+    out[candidates[keep]] = True
+    return out.reshape(L, T)
+
+
+def minmax_mask(y, num_bins: int):
+    """Min-max decimation of many lines at once.
+
+    The time points of each line are split into *num_bins* consecutive bins, and
+    in each bin the first and last point and the points with minimum and maximum
+    value of each coordinate are kept.
+
+    :param y: array of shape *[num_lines, num_points, 2]*
+    :return: boolean array of shape *[num_lines, num_points]*, True for kept points
+    """
+    L, T, D = y.shape
+    keep = endpoint_mask(L, T)
+    starts = np.unique(np.linspace(0, T, num_bins, endpoint=False).astype(int))
+    ends = np.append(starts[1:], T)
+    keep[:, starts] = True
+    keep[:, ends - 1] = True
+    lines = np.arange(L)[:, None]
+    bins = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, T)))
+    for d in range(0, D):
+        yd = y[:, :, d]
+        for reduce in (np.minimum, np.maximum):
+            ext = reduce.reduceat(yd, starts, axis=1)
+            hit = yd == ext[:, bins]
+            # first time point in each bin where the extreme value is reached
+            first = np.where(hit, np.arange(T), T)
+            pos = np.minimum.reduceat(first, starts, axis=1)
+            keep[lines, np.minimum(pos, T - 1)] = True
+    return keep
+
+
+def stride_mask(num_lines: int, num_points: int, max_points: int):
+    """Keep every *n*th point, and the last point, of each line.
+
+    :return: boolean array of shape *[num_lines, num_points]*, True for kept points
+    """
+    step = max(1, int(np.ceil(num_points / max(max_points, 1))))
+    keep = endpoint_mask(num_lines, num_points)
+    keep[:, 0::step] = True
+    return keep
+
+
+def simplify_lines(y, scale, tolerance: float = 0.5, method: str = "rdp"):
+    """Simplify lines for drawing, so that the result is within a pixel tolerance.
+
+    :param y: array of shape *[num_lines, num_points, 2]* in data coordinates
+    :param scale: number of pixels per data unit in each of the two dimensions
+    :param tolerance: tolerance in pixels
+    :param method: *"rdp"* (Ramer-Douglas-Peucker), *"minmax"* (min-max decimation
+        into bins of *2 * tolerance* pixels along the longest line) or *"stride"*
+        (uniform stride with one point per *2 * tolerance* pixels along the
+        longest line)
+    :return: list of arrays of shape *[n, 2]*, one for each line
+    """
+    y = np.asarray(y)
+    L, T, _ = y.shape
+    if T <= 2:
+        return list(y)
+    scale = np.asarray(scale, dtype=float)
+    if method == "rdp":
+        keep = rdp_mask(y * scale, tolerance)
+    elif method in ("minmax", "stride"):
+        steps = np.sqrt(((np.diff(y, axis=1) * scale) ** 2).sum(axis=2))
+        length = steps.sum(axis=1).max()
+        num_bins = int(np.ceil(length / max(2 * tolerance, 1e-12))) + 1
+        if method == "minmax":
+            keep = minmax_mask(y, min(num_bins, T))
+        else:
+            keep = stride_mask(L, T, num_bins)
+    else:
+        raise ValueError("method must be one of " + ", ".join(SIMPLIFY_METHODS))
+    return [y[j][keep[j]] for j in range(0, L)]
@@ -0,0 +1,172 @@
+import numpy as np
+from matplotlib.colors import to_rgba
+from .utils import is_in_memory, empty_memmap, iter_chunks
+
+
+def group_ranges(x, offsets):
+    """Compute the range of consecutive row blocks of an array at once.
+
+    :param x: array of shape *[num_rows, num_dims]*
+    :param offsets: block *k* is *x[offsets[k]:offsets[k + 1]]*
+    :return: a tuple *(mins, maxs)* of arrays with shape *[num_blocks, num_dims]*
+    """
+    offsets = np.asarray(offsets, dtype=np.intp)
+    K = len(offsets) - 1
+    D = x.shape[1]
+    mins = np.full((K, D), np.inf)
+    maxs = np.full((K, D), -np.inf)
+    nonempty = np.flatnonzero(np.diff(offsets) > 0)
+    if nonempty.size > 0:
+        x = np.asarray(x)
+        starts = offsets[nonempty]
+        mins[nonempty] = np.minimum.reduceat(x, starts, axis=0)
+        maxs[nonempty] = np.maximum.reduceat(x, starts, axis=0)
+    return mins, maxs
+
+
+def data_address(x: np.ndarray):
+    return x.__array_interface__["data"][0]
+
+
+def concatenate_rows(arrays):
+    """Concatenate 2-dimensional arrays along the first axis.
+
+    If the arrays are consecutive row blocks that exactly tile one C-contiguous
+    array (like the point sets created by *add_pointsets*), that array is
+    returned without copying. If any of the arrays is not in memory, such as a
+    memory-mapped or zarr array, the rows are copied block by block into a
+    temporary memory-mapped array instead of into memory.
+    """
+    base = arrays[0].base if len(arrays) > 0 else None
+    if isinstance(base, np.ndarray) and base.ndim == 2 and base.flags.c_contiguous:
+        address = data_address(base)
+        tiles = True
+        for a in arrays:
+            tiles = tiles and a.base is base and a.flags.c_contiguous
+            tiles = tiles and a.shape[1] == base.shape[1]
+            tiles = tiles and data_address(a) == address
+            address += a.nbytes
+        if tiles and address == data_address(base) + base.nbytes:
+            return base
+    if all(is_in_memory(a) for a in arrays):
+        return np.concatenate(arrays, axis=0)
+    n = sum(a.shape[0] for a in arrays)
+    dtype = np.result_type(*[a.dtype for a in arrays])
+    x = empty_memmap((n,) + tuple(arrays[0].shape[1:]), dtype)
+    start = 0
+    for a in arrays:
+        for chunk in iter_chunks(a):
+            x[start : start + chunk.shape[0]] = chunk
+            start += chunk.shape[0]
+    return x
+
+
+class PointView:
+    """A point set in a *PointStore*."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index: int):
+        self.store = store
+        self.index = index
+
+    def __repr__(self):
+        return "<PointView (%d points, %d dims)>" % (self.num_points, self.num_dims)
+
+    @property
+    def x(self):
+        k = self.index
+        return self.store.x[self.store.offsets[k] : self.store.offsets[k + 1]]
+
+    @property
+    def num_points(self):
+        k = self.index
+        return int(self.store.offsets[k + 1] - self.store.offsets[k])
+
+    @property
+    def num_dims(self):
+        return self.store.x.shape[1]
+
+    @property
+    def color(self):
+        return tuple(self.store.rgba[self.index])
+
+    @property
+    def marker(self):
+        return self.store.markers[self.index]
+
+    @property
+    def label(self):
+        return self.store.labels[self.index]
+
+
+class PointStore:
+    """Columnar storage of many point sets.
+
+    The coordinates of all sets are in one contiguous buffer. Sets are described
+    by offsets into the buffer, a set code for each point, and arrays of styles,
+    so that ranges and colors of all sets are computed with a few vectorized
+    operations.
+
+    :param x: array of shape *[num_points, num_dims]*, sorted by set
+    :param offsets: points of set *k* are *x[offsets[k]:offsets[k + 1]]*
+    :param rgba: array of shape *[num_sets, 4]*, color and opacity of each set
+    :param markers: marker of each set
+    :param labels: label of each set
+    """
+
+    __slots__ = ("x", "offsets", "codes", "rgba", "markers", "labels")
+
+    def __init__(self, x, offsets, rgba, markers, labels):
+        self.x = x
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        counts = np.diff(self.offsets)
+        dtype = np.uint8 if len(counts) <= 2 ** 8 else np.int32
+        self.codes = np.repeat(np.arange(len(counts), dtype=dtype), counts)
+        self.rgba = np.asarray(rgba, dtype=float).reshape(-1, 4)
+        self.markers = list(markers)
+        self.labels = list(labels)
+
+    @classmethod
+    def from_sets(cls, point_sets, num_dims: int = 0):
+        """Create a store from a list of *PointData*.
+
+        The coordinates are copied into one buffer unless the sets already are
+        consecutive views of one.
+
+        :param num_dims: number of dimensions, used only if there are no sets
+        """
+        counts = [ps.num_points for ps in point_sets]
+        if len(point_sets) == 0:
+            x = np.empty((0, num_dims))
+        else:
+            x = concatenate_rows([ps.x for ps in point_sets])
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        rgba = [to_rgba(ps.color, ps.alpha) for ps in point_sets]
+        markers = [ps.marker for ps in point_sets]
+        labels = [ps.label for ps in point_sets]
+        return cls(x, offsets, rgba, markers, labels)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return "<PointStore (%d sets, %d points, %d dims)>" % (
+            len(self),
+            self.x.shape[0],
+            self.x.shape[1],
+        )
+
+    def view(self, k: int):
+        return PointView(self, k)
+
+    def set_ranges(self):
+        """Compute the range of every set at once.
+
+        :return: a tuple *(mins, maxs)* of arrays with shape *[num_sets, num_dims]*
+        """
+        return group_ranges(self.x, self.offsets)
+
+    def point_colors(self):
+        """Get the RGBA color of each point as an array of shape *[num_points, 4]*."""
+        return self.rgba[self.codes]
@@ -0,0 +1,388 @@
+import numpy as np
+from .density import bin_codes
+from .ranking import PairStatistics, score_pairs, top_pairs
+from .store import group_ranges
+from .utils import assert_dim, group_labels, combine_ranges, stream_range
+
+# Label of points that are given without labels
+UNLABELED = "unlabeled"
+
+# Default maximum number of dimension pairs whose histograms are collected
+MAX_STREAM_PAIRS = 45
+
+
+def category_key(key):
+    """Sort key of categories, which puts numbers before strings so that
+    numeric labels and unlabeled points can be mixed."""
+    return (isinstance(key, str), key)
+
+
+class Reservoir:
+    """Uniform random sample of at most *size* rows of a stream of arrays.
+
+    Each row gets a random key and the rows with the smallest keys are kept
+    (bottom-k sampling), so at most *size* rows and one chunk are in memory at a
+    time, and the kept rows stay in stream order.
+
+    :param size: maximum number of rows kept
+    :param rng: a numpy random generator
+    """
+
+    __slots__ = ("size", "rng", "x", "keys", "count")
+
+    def __init__(self, size: int, rng):
+        assert size >= 1, "sample size must be at least 1"
+        self.size = size
+        self.rng = rng
+        self.x = None
+        self.keys = None
+        self.count = 0
+
+    @property
+    def is_complete(self):
+        """True if every row of the stream is in the sample."""
+        return self.count <= self.size
+
+    def update(self, x):
+        """Add rows (first axis of *x*) to the stream."""
+        keys = self.rng.random(x.shape[0])
+        self.count += x.shape[0]
+        if self.x is None:
+            x_all, keys_all = np.array(x), keys
+        else:
+            x_all = np.concatenate((self.x, x))
+            keys_all = np.concatenate((self.keys, keys))
+        if keys_all.shape[0] > self.size:
+            keep = np.sort(np.argpartition(keys_all, self.size - 1)[0 : self.size])
+            x_all, keys_all = x_all[keep], keys_all[keep]
+        self.x = x_all
+        self.keys = keys_all
+
+
+class PairHistograms:
+    """2-d histograms of pairs of dimensions for groups of streamed points.
+
+    All histograms share one grid for each dimension. The grid starts at the range
+    of the first points, and when later points fall outside of it, its extent is
+    doubled towards them and pairs of adjacent bins are merged. The histograms are
+    therefore built in one pass, and their bins are at most about twice as wide as
+    if the range had been known in advance.
+
+    Counts are stored as 32-bit integers (widened to 64 bits if a bin could
+    overflow) in an array whose group axis grows geometrically, and each chunk
+    only updates the bins that its points fall in, so the cost of an update is
+    proportional to the number of points.
+
+    :param num_dims: number of dimensions
+    :param bins: number of bins per dimension, an even number
+    :param pairs: pairs of dimensions to collect histograms of, by default all
+    """
+
+    def __init__(self, num_dims: int, bins: int = 256, pairs=None):
+        assert bins % 2 == 0, "number of bins must be even"
+        if pairs is None:
+            pairs = [(i, j) for i in range(0, num_dims) for j in range(i + 1, num_dims)]
+        self.bins = bins
+        self.pairs = [(min(p), max(p)) for p in pairs]
+        self.index = {p: k for k, p in enumerate(self.pairs)}
+        self.lower = None
+        self.width = None
+        self.num_groups = 0
+        self.num_points = 0
+        self._counts = np.zeros((0, len(self.pairs), bins, bins), dtype=np.uint32)
+
+    @property
+    def counts(self):
+        """Array of shape *[num_groups, num_pairs, bins, bins]*."""
+        return self._counts[0 : self.num_groups]
+
+    def add_group(self):
+        """Add an empty histogram for a new group and return its index."""
+        if self.num_groups == self._counts.shape[0]:
+            shape = (max(1, 2 * self.num_groups),) + self._counts.shape[1:]
+            counts = np.zeros(shape, dtype=self._counts.dtype)
+            counts[0 : self.num_groups] = self.counts
+            self._counts = counts
+        self.num_groups += 1
+        return self.num_groups - 1
+
+    def merge_bins(self, d: int, left: bool):
+        """Merge adjacent bins of dimension *d* after its extent was doubled.
+
+        :param left: True if the extent grew to the left, in which case the merged
+            bins are the upper half of the new grid
+        """
+        half = self.bins // 2
+        for p, (i, j) in enumerate(self.pairs):
+            if d not in (i, j):
+                continue
+            c = self.counts[:, p]
+            c = c if d == i else c.transpose(0, 2, 1)
+            merged = c[:, 0::2] + c[:, 1::2]
+            c[:] = 0
+            if left:
+                c[:, half:] = merged
+            else:
+                c[:, 0:half] = merged
+
+    def fit(self, mins, maxs):
+        """Create the grids, or extend them to cover the range *(mins, maxs)*."""
+        if self.lower is None:
+            self.lower = np.array(mins, dtype=float)
+            width = np.asarray(maxs, dtype=float) - self.lower
+            self.width = np.where(width > 0, width, 1.0)
+            return
+        for d in range(0, len(self.lower)):
+            while mins[d] < self.lower[d]:
+                self.lower[d] -= self.width[d]
+                self.width[d] *= 2
+                self.merge_bins(d, left=True)
+            while maxs[d] > self.lower[d] + self.width[d]:
+                self.width[d] *= 2
+                self.merge_bins(d, left=False)
+
+    def update(self, x, groups):
+        """Add points to the histograms, extending the grids if needed.
+
+        :param x: array of shape *[num_points, num_dims]*
+        :param groups: group index of each point
+        """
+        if x.shape[0] == 0:
+            return
+        self.fit(x.min(axis=0), x.max(axis=0))
+        B = self.bins
+        upper = self.lower + self.width
+        # all points are inside the grids now, but values just below the upper
+        # edge can be rounded to the bin after the last one
+        codes = [
+            np.minimum(bin_codes(x[:, d], self.lower[d], upper[d], B), B - 1)
+            for d in range(0, x.shape[1])
+        ]
+        codes = [c.astype(np.intp) for c in codes]
+        self.num_points += x.shape[0]
+        if self.num_points > np.iinfo(self._counts.dtype).max:
+            self._counts = self._counts.astype(np.uint64)
+        groups = np.asarray(groups, dtype=np.intp) * len(self.pairs)
+        for p, (i, j) in enumerate(self.pairs):
+            flat = ((groups + p) * B + codes[i]) * B + codes[j]
+            cells, counts = np.unique(flat, return_counts=True)
+            self._counts.reshape(-1)[cells] += counts.astype(self._counts.dtype)
+
+    def pair_counts(self, idx_x: int, idx_y: int, groups=None):
+        """Get the histograms of a pair of dimensions.
+
+        :param groups: indices of the groups to get, by default all
+        :return: a tuple *(counts, extent)*, where *counts* has shape
+            *[num_groups, bins, bins]* with the bins of *idx_x* first, and
+            *extent* is *(xmin, xmax, ymin, ymax)*
+        """
+        if groups is None:
+            groups = np.arange(self.num_groups)
+        if (min(idx_x, idx_y), max(idx_x, idx_y)) not in self.index:
+            raise ValueError("no histograms of dimensions %d and %d" % (idx_x, idx_y))
+        if (idx_x, idx_y) in self.index:
+            counts = self.counts[groups, self.index[(idx_x, idx_y)]]
+        else:
+            counts = self.counts[groups, self.index[(idx_y, idx_x)]].transpose(0, 2, 1)
+        lower, upper = self.lower, self.lower + self.width
+        extent = (lower[idx_x], upper[idx_x], lower[idx_y], upper[idx_y])
+        return counts, extent
+
+
+class StreamAggregator:
+    """Collect what is needed for plotting a stream of points in one pass.
+
+    For each category of points, the number of points, their range, a random
+    sample and their 2-d histograms in every pair of dimensions are updated chunk
+    by chunk, so only the samples and histograms are kept in memory. The
+    histograms can be limited to the pairs of dimensions that are plotted.
+    Trajectories can be streamed too, in which case a random sample of them and
+    the range of all of them are kept, and their start points are aggregated as
+    one more group.
+
+    :param sample_size: maximum number of points kept of each category
+    :param trajectory_sample_size: maximum number of trajectories kept
+    :param bins: number of histogram bins per dimension
+    :param seed: random seed for sampling
+    :param pairs: pairs of dimensions to collect histograms of
+    :param max_pairs: if *pairs* is not given and there are more pairs than
+        this, histograms are collected only of the pairs with the highest
+        *pair_score* in the first chunk (None means all pairs)
+    :param pair_score: method of scoring pairs, see *hdviz.ranking.score_pairs*
+    """
+
+    def __init__(
+        self,
+        sample_size: int = 10000,
+        trajectory_sample_size: int = 1000,
+        bins: int = 256,
+        seed: int = 0,
+        pairs=None,
+        max_pairs: int = MAX_STREAM_PAIRS,
+        pair_score: str = "separation",
+    ):
+        self.sample_size = sample_size
+        self.bins = bins
+        self.pairs = pairs
+        self.max_pairs = max_pairs
+        self.pair_score = pair_score
+        self.rng = np.random.default_rng(seed)
+        self.num_dims = None
+        self.hist = None
+        self.groups = dict()
+        self.samples = []
+        self.ranges = []
+        self.start_group = None
+        self.lines = Reservoir(trajectory_sample_size, self.rng)
+        self.line_range = None
+        self.order = None
+
+    def __repr__(self):
+        return "<StreamAggregator (%d categories, %d points)>" % (
+            len(self.categories()),
+            self.num_points,
+        )
+
+    @property
+    def num_points(self):
+        return sum(self.samples[g].count for g in self.groups.values())
+
+    @property
+    def is_sampled(self):
+        """True if some points were left out of the samples of the categories."""
+        return not all(self.samples[g].is_complete for g in self.groups.values())
+
+    def check_dims(self, D: int):
+        if self.num_dims is None:
+            self.num_dims = D
+        msg = "expected %d dimensions, found %d" % (self.num_dims, D)
+        assert D == self.num_dims, msg
+
+    def create_histograms(self, x_sorted, offsets):
+        """Create the histograms when the first points are added, choosing the
+        pairs of dimensions by their scores in these points if they are limited
+        by *max_pairs*."""
+        D = self.num_dims
+        pairs = self.pairs
+        if pairs is None and self.max_pairs is not None:
+            if D * (D - 1) // 2 > self.max_pairs:
+                stats = PairStatistics(len(offsets) - 1, D)
+                for k in range(0, len(offsets) - 1):
+                    stats.update(k, x_sorted[offsets[k] : offsets[k + 1]])
+                ranked = score_pairs(stats, self.pair_score)
+                pairs = top_pairs(*ranked, self.max_pairs)
+        self.hist = PairHistograms(D, self.bins, pairs)
+        for _ in self.samples:
+            self.hist.add_group()
+
+    def plotted_pairs(self):
+        """Pairs of dimensions that have histograms, or None if all pairs do."""
+        if self.pairs is not None:
+            return self.pairs
+        D = self.num_dims
+        if self.hist is None or len(self.hist.pairs) == D * (D - 1) // 2:
+            return None
+        return self.hist.pairs
+
+    def add_group(self):
+        if self.hist is not None:
+            self.hist.add_group()
+        self.samples.append(Reservoir(self.sample_size, self.rng))
+        self.ranges.append(None)
+        self.order = None
+        return len(self.samples) - 1
+
+    def add_to_groups(self, x_sorted, offsets, groups, sample=True):
+        """Add points that are sorted by group, as returned by *group_labels*."""
+        if self.hist is None:
+            self.create_histograms(x_sorted, offsets)
+        mins, maxs = group_ranges(x_sorted, offsets)
+        for k, g in enumerate(groups):
+            r = (mins[k], maxs[k])
+            self.ranges[g] = r if self.ranges[g] is None else combine_ranges(
+                self.ranges[g], r
+            )
+            if sample:
+                self.samples[g].update(x_sorted[offsets[k] : offsets[k + 1]])
+        self.hist.update(x_sorted, np.repeat(groups, np.diff(offsets)))
+
+    def add_points(self, x, labels=None):
+        """Add a chunk of labeled points.
+
+        :param x: array of shape *[num_points, num_dims]*
+        :param labels: label of each point, or None if the points are unlabeled
+        """
+        x = np.asarray(x)
+        assert_dim(x, 2)
+        self.check_dims(x.shape[1])
+        if labels is None:
+            labels = np.full(x.shape[0], UNLABELED)
+        keys, order, offsets = group_labels(np.asarray(labels))
+        groups = np.empty(len(keys), dtype=np.intp)
+        for k, key in enumerate(keys):
+            key = key.item() if isinstance(key, np.generic) else key
+            if key not in self.groups:
+                self.groups[key] = self.add_group()
+            groups[k] = self.groups[key]
+        self.add_to_groups(x[order], offsets, groups)
+
+    def add_trajectories(self, x):
+        """Add a chunk of trajectories.
+
+        :param x: array of shape *[num_lines, num_points, num_dims]*
+        """
+        x = np.asarray(x)
+        assert_dim(x, 3)
+        self.check_dims(x.shape[2])
+        self.lines.update(x)
+        r = stream_range(x)
+        self.line_range = r if self.line_range is None else combine_ranges(
+            self.line_range, r
+        )
+        if self.start_group is None:
+            self.start_group = self.add_group()
+        starts = x[:, 0, :]
+        offsets = np.array([0, starts.shape[0]])
+        self.add_to_groups(starts, offsets, np.array([self.start_group]), False)
+
+    def add(self, batch):
+        """Add a batch, which is an array of points or a tuple *(points, labels)*."""
+        if isinstance(batch, tuple):
+            self.add_points(*batch)
+        else:
+            self.add_points(batch)
+
+    def categories(self):
+        """Category keys in sorted order, which is the order of the point sets."""
+        return sorted(self.groups, key=category_key)
+
+    def group_order(self):
+        """Group indices in the order of the point sets of the plotter: sorted
+        categories, and then the start points of trajectories."""
+        if self.order is None:
+            order = [self.groups[key] for key in self.categories()]
+            if self.start_group is not None:
+                order.append(self.start_group)
+            self.order = np.array(order, dtype=np.intp)
+        return self.order
+
+    def pair_counts(self, idx_x: int, idx_y: int):
+        """Get the histograms of a pair of dimensions for each point set.
+
+        :return: a tuple *(counts, extent)*, see *PairHistograms.pair_counts*
+        """
+        return self.hist.pair_counts(idx_x, idx_y, self.group_order())
+
+    def sampled_points(self):
+        """Get the sampled points of all categories.
+
+        :return: a tuple *(x, codes)*, where *codes* are indices into
+            *categories()*
+        """
+        xs = []
+        codes = []
+        for c, key in enumerate(self.categories()):
+            s = self.samples[self.groups[key]]
+            xs.append(s.x)
+            codes.append(np.full(s.x.shape[0], c))
+        return np.concatenate(xs), np.concatenate(codes)
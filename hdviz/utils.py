@@ -1,6 +1,14 @@
+import hashlib
 import numpy as np
 import os
-from matplotlib import pyplot as plt
+import tempfile
+
+# Approximate number of bytes read at a time when streaming over large arrays
+CHUNK_BYTES = 2 ** 24
+
+# Block size for computing ranges, small enough for a block to stay in cache
+# between the min and max reductions
+RANGE_CHUNK_BYTES = 2 ** 18
 
 
 def assert_dim(x, expected_dim):
@@ -10,6 +18,240 @@ def assert_dim(x, expected_dim):
     return True
 
 
+def load_array(x):
+    """Open an array lazily if it is given as a path.
+
+    Paths ending with *.zarr* are opened with zarr and other paths are assumed to
+    be *.npy* files, which are memory-mapped. Anything else is returned as is.
+
+    :param x: an array-like or a path to a .npy file or a zarr array
+    """
+    if not isinstance(x, (str, os.PathLike)):
+        return x
+    path = os.fspath(x)
+    if path.rstrip("/").endswith(".zarr"):
+        try:
+            import zarr
+        except ImportError:
+            raise ImportError("the zarr package is required to read " + path)
+        return zarr.open(path, mode="r")
+    return np.load(path, mmap_mode="r")
+
+
+def is_in_memory(x):
+    """Check if *x* is a numpy array that is not backed by a file."""
+    return isinstance(x, np.ndarray) and not isinstance(x, np.memmap)
+
+
+def chunk_rows(x, chunk_bytes: int = CHUNK_BYTES):
+    """Number of rows (indices of the first axis) of *x* that fit in *chunk_bytes*."""
+    row_bytes = np.dtype(x.dtype).itemsize * int(np.prod(x.shape[1:]))
+    return max(1, chunk_bytes // max(row_bytes, 1))
+
+
+def iter_chunks(x, chunk_size=None):
+    """Iterate over blocks of consecutive rows of *x* as in-memory numpy arrays.
+
+    :param x: an array-like that supports slicing, for example a memory-mapped array
+    :param chunk_size: number of rows per block, determined from *CHUNK_BYTES* if
+        not given
+    """
+    if chunk_size is None:
+        chunk_size = chunk_rows(x)
+    for start in range(0, x.shape[0], chunk_size):
+        yield np.asarray(x[start : start + chunk_size])
+
+
+def file_key(x):
+    """A hashable key that identifies a file-backed array by its file, position
+    in the file and the modification time of the file, or None if *x* is not
+    backed by a file."""
+    if isinstance(x, np.memmap) and x.filename is not None:
+        root = x
+        while isinstance(root.base, np.memmap):
+            root = root.base
+        address = x.__array_interface__["data"][0]
+        offset = root.offset + address - root.__array_interface__["data"][0]
+        path = x.filename
+        return ("memmap", path, os.path.getmtime(path), offset, x.strides)
+    store = getattr(x, "store", None)
+    path = getattr(store, "root", getattr(store, "path", None))
+    if path is not None and os.path.exists(os.fspath(path)):
+        path = os.fspath(path)
+        return ("zarr", path, x.path, os.path.getmtime(path))
+    return None
+
+
+def array_key(x):
+    """A hashable key that identifies the shape, type and contents of an array.
+
+    Memory-mapped and zarr arrays are identified by their file, see *file_key*,
+    so that the key is computed without reading them. Other arrays are hashed
+    in blocks of rows.
+    """
+    key = file_key(x)
+    if key is not None:
+        return (tuple(x.shape), np.dtype(x.dtype).str) + key
+    h = hashlib.sha1()
+    for chunk in iter_chunks(x):
+        h.update(np.ascontiguousarray(chunk).data)
+    return (tuple(x.shape), np.dtype(x.dtype).str, h.hexdigest())
+
+
+def inf_range(D):
+    mins = np.full(shape=D, fill_value=np.inf)
+    maxs = np.full(shape=D, fill_value=-np.inf)
+    return mins, maxs
+
+
+def combine_ranges(r1, r2):
+    """Combine two *(mins, maxs)* range tuples into one that covers both."""
+    return np.minimum(r1[0], r2[0]), np.maximum(r1[1], r2[1])
+
+
+def stream_range(x, chunk_size=None):
+    """Compute minimum and maximum of each dimension (last axis) of *x*.
+
+    Both are computed in a single pass over cache-sized blocks of rows, so the
+    array is read only once and never has to be loaded fully into memory.
+
+    :return: a tuple *(mins, maxs)* of arrays with length *x.shape[-1]*
+    """
+    D = x.shape[-1]
+    mins, maxs = inf_range(D)
+    if chunk_size is None:
+        chunk_size = chunk_rows(x, RANGE_CHUNK_BYTES)
+    for chunk in iter_chunks(x, chunk_size):
+        chunk = chunk.reshape(-1, D)
+        np.minimum(mins, chunk.min(0), out=mins)
+        np.maximum(maxs, chunk.max(0), out=maxs)
+    return mins, maxs
+
+
+def empty_memmap(shape, dtype):
+    """Create an anonymous disk-backed array, deleted when no longer referenced."""
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    f = tempfile.TemporaryFile()
+    return np.memmap(f, dtype=dtype, mode="w+", shape=tuple(shape))
+
+
+def append_along(buffer, used: int, x_new, axis: int = 0):
+    """Append *x_new* after the first *used* entries of *buffer* along *axis*.
+
+    When the buffer is full, it is replaced by one with twice the capacity, so
+    that appending costs amortized O(size of *x_new*). A file-backed buffer is
+    replaced by a temporary memory-mapped one.
+
+    :return: a tuple *(buffer, used)* after appending
+    """
+    m = x_new.shape[axis]
+    capacity = buffer.shape[axis]
+    if used + m > capacity:
+        shape = list(buffer.shape)
+        shape[axis] = max(2 * capacity, used + m, 16)
+        dtype = np.result_type(buffer.dtype, x_new.dtype)
+        if is_in_memory(buffer):
+            new_buffer = np.empty(shape, dtype=dtype)
+        else:
+            new_buffer = empty_memmap(shape, dtype)
+        old = (slice(None),) * axis + (slice(0, used),)
+        new_buffer[old] = buffer[old]
+        buffer = new_buffer
+    new = (slice(None),) * axis + (slice(used, used + m),)
+    buffer[new] = x_new
+    return buffer, used + m
+
+
+def read_rows(x, inds):
+    """Read rows *inds* of *x* into memory, also if *x* is a zarr array."""
+    if hasattr(x, "oindex"):
+        return np.asarray(x.oindex[np.asarray(inds)])
+    return np.asarray(x[inds])
+
+
+def take_rows(x, inds):
+    """Select rows *inds* of *x* without loading all of *x* into memory.
+
+    A contiguous run of indices into a numpy array (including memory-mapped ones)
+    gives a view. Other selections from memory-mapped or on-disk arrays are gathered
+    chunk by chunk into a temporary memory-mapped file, so that peak memory stays
+    bounded. In-memory arrays are indexed normally.
+
+    :param x: an array-like of shape *[n_rows, ...]*
+    :param inds: integer indices of the rows to select
+    """
+    inds = np.asarray(inds)
+    if isinstance(x, np.ndarray):
+        if inds.size > 0 and inds[-1] - inds[0] + 1 == inds.size:
+            if np.all(np.diff(inds) == 1):
+                return x[inds[0] : inds[-1] + 1]
+        if is_in_memory(x):
+            return x[inds]
+    out = empty_memmap((inds.size,) + tuple(x.shape[1:]), x.dtype)
+    getter = x.oindex if hasattr(x, "oindex") else x
+    step = chunk_rows(x)
+    for start in range(0, inds.size, step):
+        out[start : start + step] = getter[inds[start : start + step]]
+    return out
+
+
+def group_labels(labels):
+    """Group points by their label using a single sorting pass.
+
+    :param labels: label of each point. Can be a pandas Categorical, non-negative
+        integer codes, or any array of values that can be sorted.
+    :return: a tuple *(keys, order, offsets)*, where points with label *keys[k]*
+        are *order[offsets[k]:offsets[k + 1]]*. Points with a missing
+        Categorical value are left out.
+    """
+    if hasattr(labels, "categories") and hasattr(labels, "codes"):
+        categories = np.asarray(labels.categories)
+        codes = np.asarray(labels.codes)
+        keep = np.flatnonzero(codes >= 0)
+        if keep.size < codes.size:
+            counts = np.bincount(codes[keep], minlength=len(categories))
+            order = keep[np.argsort(codes[keep], kind="stable")]
+        else:
+            counts = np.bincount(codes, minlength=len(categories))
+            order = np.argsort(codes, kind="stable")
+        present = np.flatnonzero(counts)
+        keys = categories[present]
+    else:
+        labels = np.asarray(labels)
+        N = labels.shape[0]
+        is_code = np.issubdtype(labels.dtype, np.integer) and N > 0
+        if is_code and labels.min() >= 0 and labels.max() < N + 2 ** 16:
+            counts = np.bincount(labels)
+            present = np.flatnonzero(counts)
+            keys = present
+            order = np.argsort(labels, kind="stable")
+        else:
+            keys, codes = np.unique(labels, return_inverse=True)
+            counts = np.bincount(codes.ravel(), minlength=len(keys))
+            present = np.arange(len(keys))
+            order = np.argsort(codes.ravel(), kind="stable")
+    offsets = np.concatenate(([0], np.cumsum(counts[present])))
+    return keys, order, offsets
+
+
+def dims_index(dims):
+    """Index for selecting dimensions *dims* from the last axis of an array.
+
+    Increasing, equally spaced dimensions are turned into a slice, so that indexing
+    with the result returns a strided view instead of a copy.
+
+    :param dims: indices of the dimensions to select
+    """
+    dims = [int(d) for d in dims]
+    if len(dims) == 1:
+        return slice(dims[0], dims[0] + 1)
+    step = dims[1] - dims[0]
+    if step > 0 and all(b - a == step for a, b in zip(dims, dims[1:])):
+        return slice(dims[0], dims[-1] + 1, step)
+    return dims
+
+
 def determine_nrows_ncols(nplots: int, nrows=None, ncols=None):
     """Determine number of rows and columns a grid of subplots.
 
@@ -35,7 +277,7 @@ def determine_nrows_ncols(nplots: int, nrows=None, ncols=None):
     return nrows, ncols
 
 
-def create_grid_around(x, M: int, scaling: float = 0.1):
+def create_grid_around(x, M: int, scaling: float = 0.1, lazy: bool = False):
     """Create a uniform rectangular grid around points *z*.
 
     :param x: a numpy array of shape *[n_points, D]*
@@ -45,15 +287,119 @@ def create_grid_around(x, M: int, scaling: float = 0.1):
     :param scaling: How much larger should the grid be than the range of *z* for each
         dimension. If this is zero, grid is exactly the size of the data range.
     :type scaling: float
+    :param lazy: return a *Grid* instead of a numpy array
+    :type lazy: bool
     :return: a numpy array of shape *[M^d, d]*
     :rtype: np.ndarray
     """
-    amin = np.amin(x, axis=0)
-    amax = np.amax(x, axis=0)
-    return create_grid(amin, amax, M, scaling)
+    amin, amax = stream_range(x)
+    return create_grid(amin, amax, M, scaling, lazy)
+
+
+def grid_order(D: int):
+    """Order of dimensions in a flattened grid, from slowest to fastest varying.
+
+    This is the order produced by flattening the transposes of *np.meshgrid*
+    outputs, which *create_grid* has always used.
+    """
+    if D < 2:
+        return list(range(0, D))
+    return list(range(D - 1, 1, -1)) + [0, 1]
+
+
+class Grid:
+    """A uniform rectangular grid whose points are generated lazily.
+
+    The points are numbered in the same order as the rows of the array returned
+    by *create_grid*, and any block of them can be computed from the row indices
+    alone, so that the full array of shape *[num_points, num_dims]* never has to
+    exist in memory.
+
+    :param axes: list of 1-dimensional arrays, the grid coordinates in each
+        dimension
+    """
+
+    def __init__(self, axes):
+        self.axes = [np.asarray(a, dtype=float) for a in axes]
+        self.num_dims = len(self.axes)
+        self.shape = tuple(len(a) for a in self.axes)
+        self.num_points = int(np.prod(self.shape))
+        self.order = grid_order(self.num_dims)
+
+    def __repr__(self):
+        shape = " x ".join(str(n) for n in self.shape)
+        return "<Grid (%s points, %d dims)>" % (shape, self.num_dims)
+
+    def __len__(self):
+        return self.num_points
+
+    def __array__(self, dtype=None, copy=None):
+        x = self.dense()
+        return x if dtype is None else x.astype(dtype)
+
+    def key(self):
+        """A hashable description of the grid."""
+        return tuple((a[0], a[-1], len(a)) for a in self.axes)
+
+    def block(self, start: int, stop: int):
+        """Compute points *start, ..., stop - 1*.
+
+        :return: a numpy array of shape *[stop - start, num_dims]*
+        """
+        idx = np.arange(start, stop)
+        out = np.empty((idx.size, self.num_dims))
+        for d in reversed(self.order):
+            n = self.shape[d]
+            out[:, d] = self.axes[d][idx % n]
+            idx //= n
+        return out
+
+    def chunks(self, chunk_size=None):
+        """Iterate over the points in blocks.
 
+        :param chunk_size: number of points per block, determined from
+            *CHUNK_BYTES* if not given
+        """
+        if chunk_size is None:
+            chunk_size = max(1, CHUNK_BYTES // (8 * max(self.num_dims, 1)))
+        for start in range(0, self.num_points, chunk_size):
+            yield self.block(start, min(start + chunk_size, self.num_points))
 
-def create_grid(axis_ranges_min, axis_ranges_max, M, scaling=0.1):
+    def sparse(self):
+        """Get broadcastable coordinate arrays for vectorized evaluation.
+
+        :return: a list of *num_dims* arrays that broadcast to shape *shape*, with
+            dimension *d* varying along axis *d*
+        """
+        return np.meshgrid(*self.axes, indexing="ij", sparse=True)
+
+    def flatten(self, values):
+        """Flatten values evaluated on the *sparse* grid to the order of points.
+
+        :param values: array of shape *shape* (or *shape + (k,)*)
+        :return: array of shape *[num_points]* (or *[num_points, k]*)
+        """
+        values = np.asarray(values)
+        extra = list(range(self.num_dims, values.ndim))
+        values = values.transpose(self.order + extra)
+        return values.reshape((self.num_points,) + values.shape[self.num_dims :])
+
+    def dense(self):
+        """Compute all points as an array of shape *[num_points, num_dims]*."""
+        return self.block(0, self.num_points)
+
+
+def create_grid(axis_ranges_min, axis_ranges_max, M, scaling=0.1, lazy=False):
+    """Create a uniform rectangular grid.
+
+    :param axis_ranges_min: lower end of the range in each dimension
+    :param axis_ranges_max: upper end of the range in each dimension
+    :param M: number of points per dimension
+    :param scaling: how much the grid is extended beyond the ranges, relative to
+        their width
+    :param lazy: return a *Grid*, which generates points only on demand, instead
+        of a numpy array of shape *[M^d, d]*
+    """
     amin = axis_ranges_min
     amax = axis_ranges_max
     D = len(amax)
@@ -61,9 +407,8 @@ def create_grid(axis_ranges_min, axis_ranges_max, M, scaling=0.1):
     for d in range(0, D):
         h = scaling * (amax[d] - amin[d])
         LS = LS + [np.linspace(amin[d] - h, amax[d] + h, M)]
-    xs_ = np.meshgrid(*LS)
-    x_grid = np.array([y.T.flatten() for y in xs_]).T
-    return x_grid
+    grid = Grid(LS)
+    return grid if lazy else grid.dense()
 
 
 def square_axis_limits(ax_limits):
@@ -74,6 +419,8 @@ def square_axis_limits(ax_limits):
 
 def draw_plot(save_name=None, save_dir=".", **save_kwargs):
     """Function to shown or save the current figure."""
+    from matplotlib import pyplot as plt
+
     if save_name is None:
         plt.show()
     else:
@@ -0,0 +1,320 @@
+import base64
+import html
+import json
+import numpy as np
+from matplotlib.colors import to_rgba
+from .utils import iter_chunks
+
+# Page template, in which __TITLE__ and __DATA__ are replaced
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { margin: 0; font-family: sans-serif; font-size: 13px; background: #fff; }
+#bar { position: absolute; top: 8px; left: 8px; background: rgba(255,255,255,0.85);
+  padding: 6px 8px; border-radius: 4px; }
+#bar select { margin-right: 6px; }
+#legend { margin-top: 6px; }
+#legend span { display: inline-block; width: 10px; height: 10px; margin-right: 4px; }
+canvas { display: block; width: 100vw; height: 100vh; }
+</style>
+</head>
+<body>
+<canvas id="view"></canvas>
+<div id="bar"><b>__TITLE__</b><div id="axes"></div><div id="legend"></div></div>
+<script>
+"use strict";
+const DATA = __DATA__;
+
+function decode(b64) {
+  const s = atob(b64);
+  const bytes = new Uint8Array(s.length);
+  for (let i = 0; i < s.length; i++) bytes[i] = s.charCodeAt(i);
+  return new Float32Array(bytes.buffer);
+}
+
+const canvas = document.getElementById("view");
+const gl = canvas.getContext("webgl", {antialias: true, premultipliedAlpha: false});
+
+const VS = `
+attribute float ax; attribute float ay; attribute float az;
+uniform vec3 lo; uniform vec3 hi; uniform mat4 view; uniform float psize;
+void main() {
+  vec3 p = (vec3(ax, ay, az) - lo) / (hi - lo) * 2.0 - 1.0;
+  gl_Position = view * vec4(p, 1.0);
+  gl_PointSize = psize;
+}`;
+const FS = `
+precision mediump float;
+uniform vec4 color; uniform float round;
+void main() {
+  if (round > 0.5 && length(gl_PointCoord - 0.5) > 0.5) discard;
+  gl_FragColor = color;
+}`;
+
+function shader(type, src) {
+  const s = gl.createShader(type);
+  gl.shaderSource(s, src);
+  gl.compileShader(s);
+  return s;
+}
+const prog = gl.createProgram();
+gl.attachShader(prog, shader(gl.VERTEX_SHADER, VS));
+gl.attachShader(prog, shader(gl.FRAGMENT_SHADER, FS));
+gl.linkProgram(prog);
+gl.useProgram(prog);
+const loc = {};
+for (const n of ["ax", "ay", "az"]) loc[n] = gl.getAttribLocation(prog, n);
+for (const n of ["lo", "hi", "view", "psize", "color", "round"]) {
+  loc[n] = gl.getUniformLocation(prog, n);
+}
+
+// Upload every dimension of every data set once as its own buffer
+function upload(sets) {
+  for (const ds of sets) {
+    ds.buffers = ds.columns.map(function (c) {
+      const b = gl.createBuffer();
+      gl.bindBuffer(gl.ARRAY_BUFFER, b);
+      gl.bufferData(gl.ARRAY_BUFFER, decode(c), gl.STATIC_DRAW);
+      return b;
+    });
+    ds.columns = null;
+  }
+}
+upload(DATA.points);
+upload(DATA.lines);
+upload(DATA.arrows);
+
+// Dimensions that are shown, -1 for no z-dimension
+const shown = DATA.dims.slice();
+let azim = DATA.azimuth * Math.PI / 180, elev = DATA.elevation * Math.PI / 180;
+let zoom = 1.0, panx = 0.0, pany = 0.0;
+
+function viewMatrix() {
+  const ca = Math.cos(azim), sa = Math.sin(azim);
+  const ce = Math.cos(elev), se = Math.sin(elev);
+  const asp = canvas.width / canvas.height;
+  const sx = zoom / Math.max(asp, 1.0), sy = zoom * Math.min(asp, 1.0);
+  if (shown[2] < 0) {
+    return new Float32Array([sx, 0, 0, 0, 0, sy, 0, 0, 0, 0, 0, 0, panx, pany, 0, 1]);
+  }
+  // rotate about z by azimuth, then tilt by elevation, orthographic projection
+  const k = 0.55;
+  const m = [
+    [-sa, ca, 0],
+    [-ca * se, -sa * se, ce],
+    [ca * ce, sa * ce, se],
+  ];
+  return new Float32Array([
+    k * sx * m[0][0], k * sy * m[1][0], -0.5 * k * m[2][0], 0,
+    k * sx * m[0][1], k * sy * m[1][1], -0.5 * k * m[2][1], 0,
+    k * sx * m[0][2], k * sy * m[1][2], -0.5 * k * m[2][2], 0,
+    panx, pany, 0, 1,
+  ]);
+}
+
+function bind(ds) {
+  const z = shown[2] < 0 ? shown[0] : shown[2];
+  const dims = [shown[0], shown[1], z];
+  ["ax", "ay", "az"].forEach(function (n, i) {
+    gl.bindBuffer(gl.ARRAY_BUFFER, ds.buffers[dims[i]]);
+    gl.enableVertexAttribArray(loc[n]);
+    gl.vertexAttribPointer(loc[n], 1, gl.FLOAT, false, 0, 0);
+  });
+  gl.uniform4fv(loc.color, ds.color);
+}
+
+function draw() {
+  const w = canvas.clientWidth * devicePixelRatio;
+  const h = canvas.clientHeight * devicePixelRatio;
+  if (canvas.width !== w || canvas.height !== h) {
+    canvas.width = w;
+    canvas.height = h;
+  }
+  gl.viewport(0, 0, canvas.width, canvas.height);
+  gl.clearColor(1, 1, 1, 1);
+  gl.clear(gl.COLOR_BUFFER_BIT);
+  gl.enable(gl.BLEND);
+  gl.blendFunc(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA);
+  const z = shown[2] < 0 ? shown[0] : shown[2];
+  const lim = DATA.limits;
+  gl.uniform3f(loc.lo, lim[shown[0]][0], lim[shown[1]][0], lim[z][0]);
+  gl.uniform3f(loc.hi, lim[shown[0]][1], lim[shown[1]][1], lim[z][1]);
+  gl.uniformMatrix4fv(loc.view, false, viewMatrix());
+  gl.uniform1f(loc.psize, DATA.point_size * devicePixelRatio);
+  gl.uniform1f(loc.round, 0.0);
+  for (const ds of DATA.arrows) {
+    bind(ds);
+    gl.drawArrays(gl.LINES, 0, 2 * ds.num_arrows);
+  }
+  for (const ds of DATA.lines) {
+    bind(ds);
+    for (let j = 0; j < ds.num_lines; j++) {
+      gl.drawArrays(gl.LINE_STRIP, j * ds.num_points, ds.num_points);
+    }
+  }
+  gl.uniform1f(loc.round, 1.0);
+  for (const ds of DATA.points) {
+    bind(ds);
+    gl.drawArrays(gl.POINTS, 0, ds.num_points);
+  }
+}
+
+let pending = false;
+function redraw() {
+  if (!pending) {
+    pending = true;
+    requestAnimationFrame(function () { pending = false; draw(); });
+  }
+}
+
+// Mouse: drag rotates (3-d) or pans (2-d), wheel zooms
+let drag = null;
+canvas.addEventListener("mousedown", function (e) { drag = [e.clientX, e.clientY]; });
+window.addEventListener("mouseup", function () { drag = null; });
+window.addEventListener("mousemove", function (e) {
+  if (drag === null) return;
+  const dx = e.clientX - drag[0], dy = e.clientY - drag[1];
+  drag = [e.clientX, e.clientY];
+  if (shown[2] < 0 || e.shiftKey) {
+    panx += 2 * dx / canvas.clientWidth;
+    pany -= 2 * dy / canvas.clientHeight;
+  } else {
+    azim -= dx * 0.01;
+    elev = Math.max(-Math.PI / 2, Math.min(Math.PI / 2, elev + dy * 0.01));
+  }
+  redraw();
+});
+canvas.addEventListener("wheel", function (e) {
+  e.preventDefault();
+  zoom *= Math.exp(-e.deltaY * 0.001);
+  redraw();
+}, {passive: false});
+window.addEventListener("resize", redraw);
+
+// Dimension selectors for PlotterNd
+if (DATA.selectable) {
+  const axes = document.getElementById("axes");
+  ["x", "y", "z"].forEach(function (name, i) {
+    const sel = document.createElement("select");
+    if (i === 2) sel.add(new Option("z: none", "-1"));
+    for (let d = 0; d < DATA.limits.length; d++) {
+      sel.add(new Option(name + ": dim " + (d + 1), String(d)));
+    }
+    sel.value = String(shown[i]);
+    sel.addEventListener("change", function () { shown[i] = +sel.value; redraw(); });
+    axes.appendChild(sel);
+  });
+}
+const legend = document.getElementById("legend");
+for (const ds of DATA.points.concat(DATA.lines, DATA.arrows)) {
+  if (ds.label === null) continue;
+  const c = ds.color.map(function (v) { return Math.round(255 * v); });
+  const row = document.createElement("div");
+  const box = document.createElement("span");
+  box.style.background = "rgb(" + c[0] + "," + c[1] + "," + c[2] + ")";
+  row.appendChild(box);
+  row.appendChild(document.createTextNode(ds.label));
+  legend.appendChild(row);
+}
+draw();
+</script>
+</body>
+</html>
+"""
+
+
+def encode_columns(x, num_dims: int):
+    """Pack each dimension (last axis) of *x* as base64-encoded float32 bytes.
+
+    The rows are read in chunks, so memory-mapped arrays are read only once.
+
+    :return: list of *num_dims* base64 strings
+    """
+    n = int(np.prod(x.shape[:-1]))
+    cols = np.empty((num_dims, n), dtype="<f4")
+    start = 0
+    for chunk in iter_chunks(x):
+        chunk = chunk.reshape(-1, num_dims)
+        cols[:, start : start + chunk.shape[0]] = chunk.T
+        start += chunk.shape[0]
+    return [base64.b64encode(c.tobytes()).decode("ascii") for c in cols]
+
+
+def arrow_columns(qs, num_dims: int):
+    """Pack arrows as base64 columns of interleaved start and end points."""
+    cols = []
+    for d in range(0, num_dims):
+        c = np.empty(2 * qs.num_arrows, dtype="<f4")
+        c[0::2] = qs.x[:, d]
+        c[1::2] = qs.x[:, d] + qs.v[:, d]
+        cols.append(base64.b64encode(c.tobytes()).decode("ascii"))
+    return cols
+
+
+def set_info(ds, label=True):
+    return dict(
+        label=ds.label if label else None,
+        color=list(to_rgba(ds.color, ds.alpha)),
+    )
+
+
+def plotter_data(plotter, point_size: float = 3.0):
+    """Collect the data of a plotter for the page.
+
+    The data sets of the plotter are used as is (with *max_points* and
+    *max_lines* applied), so nothing is added again.
+    """
+    D = plotter.num_dims
+    AL = plotter.axis_limits
+    if AL is None:
+        AL = plotter.create_axis_limits(square=plotter.square)
+    is_3d = hasattr(plotter, "azimuth")
+    dims = [0, 1, 2] if is_3d else [0, 1, -1]
+    points = []
+    for ps in plotter.render_pointsets():
+        info = set_info(ps)
+        info.update(num_points=ps.num_points, columns=encode_columns(ps.x, D))
+        points.append(info)
+    lines = []
+    for ls in plotter.render_linesets():
+        info = set_info(ls, label=False)
+        info.update(
+            num_lines=ls.num_lines,
+            num_points=ls.num_points,
+            columns=encode_columns(ls.x, D),
+        )
+        lines.append(info)
+    arrows = []
+    for qs in plotter.quiver_sets:
+        info = set_info(qs, label=qs.label is not None)
+        info.update(num_arrows=qs.num_arrows, columns=arrow_columns(qs, D))
+        arrows.append(info)
+    return dict(
+        limits=[[float(a), float(b)] for (a, b) in AL],
+        dims=dims,
+        selectable=D > 2 and not is_3d,
+        azimuth=float(getattr(plotter, "azimuth", -60)),
+        elevation=float(getattr(plotter, "elevation", 30)),
+        point_size=point_size,
+        points=points,
+        lines=lines,
+        arrows=arrows,
+    )
+
+
+def plotter_html(plotter, title=None, point_size: float = 3.0):
+    """Create a self-contained HTML page that renders a plotter with WebGL.
+
+    :param plotter: a *Plotter2d*, *Plotter3d* or *PlotterNd*
+    :param title: title of the page
+    :param point_size: size of points in pixels
+    :return: the page as a string
+    """
+    if title is None:
+        title = "hdviz"
+    data = json.dumps(plotter_data(plotter, point_size))
+    page = HTML_TEMPLATE.replace("__TITLE__", html.escape(title))
+    return page.replace("__DATA__", data.replace("</", "<\\/"))
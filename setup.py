@@ -33,7 +33,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/jtimonen/hdviz",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=install_requires,
     setup_requires=["pip>=19.0.3"],
     license="MIT",
@@ -1,6 +1,8 @@
 # Test adding multiple pointsets at once
 import hdviz
 import numpy as np
+import pytest
+from hdviz.utils import group_labels
 
 
 def test_adding_pointsets():
@@ -15,3 +17,29 @@ def test_adding_pointsets():
         x, labels, label_name_prefix="additional", label_colors=colors, alpha=0.5
     )
     assert a.num_pointsets() == 5
+
+
+def test_adding_pointsets_categorical():
+    pd = pytest.importorskip("pandas")
+    x = np.random.normal(size=(200, 2))
+    names = np.random.choice(["b", "a", "c"], size=200).astype(object)
+    names[0] = None
+    labels = pd.Categorical(names, categories=["a", "b", "c", "d"])
+    a = hdviz.create_plotter(2)
+    a.add_pointsets(x, labels, label_names={"a": "A", "b": "B", "c": "C"})
+    assert a.num_pointsets() == 3
+    assert [ps.label for ps in a.point_sets] == ["A", "B", "C"]
+    for ps, name in zip(a.point_sets, ["a", "b", "c"]):
+        assert np.array_equal(ps.x, x[names == name])
+
+
+def test_group_labels():
+    labels = np.random.choice([0, 3, 7], size=500)
+    keys, order, offsets = group_labels(labels)
+    assert np.array_equal(keys, [0, 3, 7])
+    for k, u in enumerate(keys):
+        inds = order[offsets[k] : offsets[k + 1]]
+        assert np.array_equal(inds, np.where(labels == u)[0])
+    keys, order, offsets = group_labels(np.array(["x", "y", "x"]))
+    assert list(keys) == ["x", "y"]
+    assert np.array_equal(order, [0, 2, 1])
@@ -0,0 +1,50 @@
+import os
+import shutil
+import hdviz
+import numpy as np
+import pytest
+from hdviz.animation import rotation_views, FrameEncoder
+
+
+def create_plotter():
+    a = hdviz.create_plotter(3)
+    a.add_pointsets(np.random.normal(size=(500, 3)), np.arange(500) % 3)
+    a.add_lineset(np.random.normal(size=(4, 20, 3)))
+    return a
+
+
+def test_rotation_views():
+    azim, elev = rotation_views(8, -60, 30, 360, 10)
+    assert azim.shape == (8,) and elev.shape == (8,)
+    assert azim[0] == -60 and elev[0] == 30
+    assert np.allclose(np.diff(azim), 45)
+    assert np.isclose(elev.max(), 40)
+
+
+def test_animate_gif(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+
+    a = create_plotter()
+    path = os.path.join(str(tmp_path), "rot.gif")
+    a.animate_rotation(path, num_frames=4, figsize=(3, 3), dpi=50)
+    im = Image.open(path)
+    assert im.n_frames == 4
+    assert im.size == (150, 150)
+    assert a.fast_points is False
+
+
+def test_animate_frames(tmp_path):
+    a = create_plotter()
+    path = os.path.join(str(tmp_path), "frames")
+    a.animate_rotation(path, num_frames=3, fast_points=False, dpi=30)
+    assert sorted(os.listdir(path)) == [
+        "frame_00000.png",
+        "frame_00001.png",
+        "frame_00002.png",
+    ]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is not None, reason="ffmpeg found")
+def test_video_needs_ffmpeg(tmp_path):
+    with pytest.raises(RuntimeError):
+        FrameEncoder(os.path.join(str(tmp_path), "rot.mp4"))
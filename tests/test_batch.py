@@ -0,0 +1,58 @@
+# Test headless batch rendering
+import os
+import hdviz
+import numpy as np
+from hdviz.batch import FigureCache, render_spec
+
+
+def create_specs(num_specs):
+    specs = []
+    for k in range(0, num_specs):
+        D = 2 if k % 2 == 0 else 4
+        x = np.random.normal(size=(50, D))
+        labels = np.random.choice(["a", "b"], size=50)
+        specs.append(dict(points=x, labels=labels, save_name="plot_%d.png" % k))
+    return specs
+
+
+def test_figure_reuse():
+    cache = FigureCache(dpi=50)
+    specs = create_specs(4)
+    canvases = [render_spec(s, cache) for s in specs]
+    assert len(cache) == 2
+    assert canvases[0] is canvases[2]
+    assert canvases[1] is canvases[3]
+    assert len(canvases[1].figure.axes) == 6
+
+
+def test_figure_reuse_max_pairs():
+    cache = FigureCache(dpi=50)
+    x = np.random.normal(size=(50, 5))
+    a = hdviz.create_plotter(5)
+    a.add_pointset(x)
+    a.max_pairs = 2
+    b = hdviz.create_plotter(5)
+    b.add_pointset(x)
+    c1 = render_spec(dict(plotter=a), cache)
+    c2 = render_spec(dict(plotter=b), cache)
+    assert c1 is not c2
+    assert len(c1.figure.axes) == 2
+    assert len(c2.figure.axes) == 12
+
+
+def test_render_batch(tmp_path):
+    specs = create_specs(5)
+    x = np.random.normal(size=(10, 20, 3))
+    ptr, limits = hdviz.build_plotter(trajectories=x)
+    specs.append(dict(plotter=ptr, axis_limits=limits, save_name="traj.png"))
+    paths = hdviz.render_batch(specs, save_dir=str(tmp_path), dpi=50)
+    assert len(paths) == 6
+    assert all(os.path.isfile(p) for p in paths)
+    assert paths[5].endswith("traj.png")
+
+
+def test_render_batch_parallel(tmp_path):
+    specs = create_specs(5)
+    paths = hdviz.render_batch(specs, save_dir=str(tmp_path), n_jobs=2, dpi=50)
+    assert [os.path.basename(p) for p in paths] == [s["save_name"] for s in specs]
+    assert all(os.path.isfile(p) for p in paths)
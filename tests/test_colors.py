@@ -0,0 +1,32 @@
+# Test mapping categories to colors
+import hdviz
+import numpy as np
+from hdviz.colors import palette_lut, category_palette, keys_to_colors
+
+
+def test_palette_lut():
+    assert palette_lut(5) is palette_lut(5)
+    assert palette_lut(5).shape == (5, 4)
+    assert category_palette(3) == [tuple(c) for c in palette_lut(3)[:, 0:3]]
+    lut = palette_lut(60)
+    assert lut.shape == (60, 4)
+    assert np.all((lut >= 0) & (lut <= 1))
+    assert len(np.unique(lut, axis=0)) == 60
+
+
+def test_keys_to_colors():
+    keys = np.array(["b", "a", "c", "b", "a"])
+    colors = keys_to_colors(keys, alpha=0.5)
+    assert colors.shape == (5, 4)
+    assert np.array_equal(colors[0], colors[3])
+    assert np.array_equal(colors[:, 0:3], palette_lut(3)[[1, 0, 2, 1, 0], 0:3])
+    assert np.all(colors[:, 3] == 0.5)
+
+
+def test_many_categories():
+    x = np.random.normal(size=(500, 3))
+    labels = np.arange(500) % 50
+    a = hdviz.create_plotter(3)
+    a.add_pointsets(x, labels)
+    assert a.num_pointsets() == 50
+    assert len(set(ps.color for ps in a.point_sets)) == 50
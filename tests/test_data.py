@@ -0,0 +1,105 @@
+# Test data classes and reading arrays lazily
+import hdviz
+import numpy as np
+import pytest
+from hdviz.data import PointData, LineData, QuiverData
+from hdviz.utils import stream_range, take_rows
+
+
+def test_stream_range():
+    x = np.random.normal(size=(1000, 4, 3))
+    mins, maxs = stream_range(x, chunk_size=7)
+    assert np.array_equal(mins, x.min(1).min(0))
+    assert np.array_equal(maxs, x.max(1).max(0))
+
+
+def test_take_rows():
+    x = np.random.normal(size=(100, 3))
+    assert np.shares_memory(take_rows(x, np.arange(10, 20)), x)
+    inds = np.array([1, 5, 7, 50])
+    assert np.array_equal(take_rows(x, inds), x[inds])
+
+
+def test_memmap_input(tmp_path):
+    x = np.random.normal(size=(500, 3))
+    path = str(tmp_path / "points.npy")
+    np.save(path, x)
+    ps = PointData(path, None, "o", 1.0, "points")
+    assert isinstance(ps.x, np.memmap)
+    assert np.array_equal(ps.get_range_max(), x.max(0))
+    lines = np.random.normal(size=(5, 20, 3))
+    path = str(tmp_path / "lines.npy")
+    np.save(path, lines)
+    ls = LineData(path, None, "-", 1.0, "lines")
+    assert ls.num_lines == 5
+    assert np.array_equal(ls.get_range_min(), lines.min(1).min(0))
+
+
+def test_add_pointsets_memmap(tmp_path):
+    x = np.random.normal(size=(300, 3))
+    path = str(tmp_path / "points.npy")
+    np.save(path, x)
+    labels = np.random.choice(3, size=300)
+    a = hdviz.create_plotter(3)
+    a.add_pointsets(path, labels)
+    assert a.num_pointsets() == 3
+    for k, ps in enumerate(a.point_sets):
+        assert isinstance(ps.x, np.memmap)
+        assert np.array_equal(ps.x, x[labels == k])
+
+
+def test_zarr_input(tmp_path):
+    zarr = pytest.importorskip("zarr")
+    x = np.random.normal(size=(100, 2))
+    path = str(tmp_path / "points.zarr")
+    zarr.save(path, x)
+    ps = PointData(path, None, "o", 1.0, "points")
+    assert ps.num_points == 100
+    assert np.allclose(ps.get_range_min(), x.min(0))
+
+
+def test_cached_ranges():
+    x = np.random.normal(size=(100, 2))
+    a = hdviz.create_plotter(2)
+    a.add_pointset(x)
+    ps = a.point_sets[0]
+    assert ps.get_range() is ps.get_range()
+    mins, maxs = a.get_max_ranges()
+    assert np.array_equal(maxs, x.max(0))
+    a.add_lineset(10 + np.random.uniform(size=(3, 5, 2)))
+    mins2, maxs2 = a.get_max_ranges()
+    assert np.array_equal(mins2, mins)
+    assert np.all(maxs2 > 10)
+    a.clear_data()
+    a.add_pointset(x)
+    assert np.array_equal(a.get_max_ranges()[1], maxs)
+
+
+def test_append():
+    x = np.random.normal(size=(10, 2))
+    ps = PointData(x, None, "o", 1.0, "points")
+    ps.get_range()
+    for _ in range(5):
+        ps.append(np.ones((3, 2)) * 10)
+    assert ps.num_points == 25
+    assert np.array_equal(ps.x[0:10], x)
+    assert np.array_equal(ps.get_range_max(), [10, 10])
+    lines = np.random.normal(size=(3, 4, 2))
+    ls = LineData(lines, None, "-", 1.0, "lines")
+    ls.extend(np.zeros((3, 2, 2)))
+    assert ls.x.shape == (3, 6, 2)
+    assert np.array_equal(ls.x[:, 0:4], lines)
+    with pytest.raises(AssertionError):
+        ls.extend(np.zeros((2, 2, 2)))
+
+
+def test_subset():
+    x = np.random.normal(size=(20, 3))
+    inds = np.array([2, 5, 11])
+    ps = PointData(x, "red", "x", 0.5, "points").subset(inds)
+    assert np.array_equal(ps.x, x[inds]) and ps.marker == "x" and ps.alpha == 0.5
+    assert np.array_equal(ps.get_range_max(), x.max(0))
+    ls = LineData(np.stack((x, x)), "blue", "--", 1.0, "lines").subset([1])
+    assert ls.num_lines == 1 and ls.style == "--" and ls.label == "lines"
+    qs = QuiverData(x, 2 * x, None, 0.3, "arrows").subset(inds)
+    assert np.array_equal(qs.v, 2 * x[inds]) and qs.color == "gray30"
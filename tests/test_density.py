@@ -0,0 +1,73 @@
+# Test density rasterization of point sets
+import hdviz
+import numpy as np
+import pytest
+from hdviz.density import bin_codes, pair_counts, shade
+from hdviz.plotter import Plotter
+
+
+def test_pair_counts():
+    x = np.random.normal(size=(1000, 2))
+    cx = bin_codes(x[:, 0], -2, 2, 16)
+    cy = bin_codes(x[:, 1], -3, 3, 16)
+    assert cx.dtype == np.uint8
+    counts = pair_counts(cx, cy, 16)
+    expected, _, _ = np.histogram2d(
+        x[:, 0], x[:, 1], bins=16, range=[[-2, 2], [-3, 3]]
+    )
+    assert np.array_equal(counts, expected)
+
+
+@pytest.mark.parametrize("how", ["count", "log", "blend"])
+def test_shade(how):
+    counts = np.random.poisson(1.0, size=(3, 10, 20))
+    img = shade(counts, ["red", "green", "blue"], how=how)
+    assert img.shape == (20, 10, 4)
+    assert np.all(img[..., 3][counts.sum(0).T == 0] == 0)
+
+
+def test_density_plot_2d():
+    a = hdviz.create_plotter(2)
+    a.density_threshold = 100
+    a.add_pointsets(np.random.normal(size=(500, 2)), np.random.choice(3, size=500))
+    ax = a.plot()
+    assert len(ax.images) == 1
+    assert len(ax.get_legend().get_texts()) == 3
+
+
+def test_density_plot_nd():
+    a = hdviz.create_plotter(4)
+    a.density_threshold = 100
+    a.density_how = "log"
+    a.add_pointset(np.random.normal(size=(500, 4)))
+    axs = a.plot()
+    assert all(len(ax.images) == 1 for ax in axs.flatten())
+
+
+def test_constant_dimension():
+    assert np.array_equal(bin_codes(np.array([1.0, 1.0, 2.0]), 1.0, 1.0, 4), [3, 3, 4])
+    x = np.random.normal(size=(500, 3))
+    x[:, 1] = 5.0
+    for D in (2, 3):
+        a = hdviz.create_plotter(D, no_3d=True)
+        a.density_threshold = 100
+        a.add_pointset(x[:, 0:D])
+        assert a.panel_extent(0, 1)[2:] == (4.5, 5.5)
+        assert len(np.ravel(a.plot())[0].images) == 1
+    a = hdviz.create_plotter(2)
+    a.density_threshold = 0
+    a.add_pointset(np.ones((1, 2)))
+    assert len(a.plot().images) == 1
+
+
+def test_shared_bin_codes():
+    x = np.random.normal(size=(1000, 4))
+    a = hdviz.create_plotter(4)
+    a.add_pointsets(x, np.random.choice(2, size=1000))
+    a.set_axis_limits(square=False)
+    codes = a.point_bin_codes()
+    assert codes[0].shape == (4, a.point_sets[0].num_points)
+    assert a.point_bin_codes() is codes
+    for i, j in [(0, 1), (1, 3), (2, 3)]:
+        expected = Plotter.point_counts(a, i, j)
+        assert np.array_equal(a.point_counts(i, j), expected)
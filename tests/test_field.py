@@ -0,0 +1,58 @@
+# Test computing arrows from a function
+import hdviz
+import numpy as np
+from hdviz.field import evaluate_field, clear_field_cache
+
+
+class CountingField:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        return np.stack((np.sin(x[:, 1]), -x[:, 0]), axis=1)
+
+
+def test_evaluate_field():
+    clear_field_cache()
+    f = CountingField()
+    x = np.random.normal(size=(1000, 2))
+    v = evaluate_field(f, x, batch_size=300)
+    assert f.calls == 4
+    assert np.allclose(v, np.stack((np.sin(x[:, 1]), -x[:, 0]), axis=1))
+    assert evaluate_field(f, x.copy()) is v
+    assert f.calls == 4
+    v2 = evaluate_field(f, x, batch_size=100, executor="thread", n_jobs=2, cache=False)
+    assert np.array_equal(v, v2)
+
+
+def test_quiverset_from_function():
+    clear_field_cache()
+    f = CountingField()
+    a = hdviz.create_plotter(2)
+    b = hdviz.create_plotter(2)
+    a.add_pointset(np.random.normal(size=(100, 2)))
+    grid = a.create_grid_around_points(M=10, lazy=True)
+    a.add_quiverset(grid, f, batch_size=30)
+    b.add_quiverset(grid, f)
+    assert f.calls == 4
+    qs = a.quiver_sets[0]
+    assert qs.num_arrows == 100
+    assert np.array_equal(qs.x, grid.dense())
+    assert b.quiver_sets[0].v is qs.v
+
+
+def test_quiverset_from_function_memmap(tmp_path):
+    clear_field_cache()
+    f = CountingField()
+    x = np.random.normal(size=(250, 2))
+    path = str(tmp_path / "locations.npy")
+    np.save(path, x)
+    a = hdviz.create_plotter(2)
+    a.add_quiverset(path, f, batch_size=100)
+    assert f.calls == 3
+    qs = a.quiver_sets[0]
+    assert isinstance(qs.x, np.memmap)
+    assert np.array_equal(qs.v, f(x))
+    v = evaluate_field(f, path, batch_size=100)
+    assert v is qs.v
@@ -0,0 +1,44 @@
+# Test creating grids
+import hdviz
+import numpy as np
+import pytest
+from hdviz.utils import create_grid
+
+
+def meshgrid_reference(amin, amax, M, scaling=0.1):
+    LS = []
+    for d in range(0, len(amax)):
+        h = scaling * (amax[d] - amin[d])
+        LS += [np.linspace(amin[d] - h, amax[d] + h, M)]
+    xs_ = np.meshgrid(*LS)
+    return np.array([y.T.flatten() for y in xs_]).T
+
+
+@pytest.mark.parametrize("D", [1, 2, 3, 4])
+def test_grid_order(D):
+    amin = -np.arange(1, D + 1)
+    amax = np.arange(1, D + 1) ** 2
+    expected = meshgrid_reference(amin, amax, 4)
+    assert np.array_equal(create_grid(amin, amax, 4), expected)
+    grid = create_grid(amin, amax, 4, lazy=True)
+    assert len(grid) == 4 ** D
+    assert np.array_equal(np.vstack(list(grid.chunks(7))), expected)
+    assert np.array_equal(np.asarray(grid), expected)
+
+
+def test_grid_sparse():
+    grid = create_grid([0, 0, 0], [1, 2, 3], 5, lazy=True)
+    u = grid.sparse()
+    values = u[0] + 10 * u[1] * u[2]
+    assert values.shape == (5, 5, 5)
+    x = grid.dense()
+    assert np.allclose(grid.flatten(values), x[:, 0] + 10 * x[:, 1] * x[:, 2])
+
+
+def test_grid_around_points():
+    a = hdviz.create_plotter(6)
+    a.add_pointset(np.random.normal(size=(100, 6)))
+    grid = a.create_grid_around_points(M=50, lazy=True)
+    assert grid.num_points == 50 ** 6
+    block = next(grid.chunks(1000))
+    assert block.shape == (1000, 6)
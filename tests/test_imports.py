@@ -0,0 +1,25 @@
+# Test that importing hdviz does not import heavy dependencies
+import os
+import subprocess
+import sys
+
+CHECK_IMPORT = """
+import sys
+import hdviz
+hdviz.create_grid_around, hdviz.determine_dimension
+heavy = ["pandas", "seaborn", "matplotlib", "matplotlib.pyplot"]
+print(",".join(m for m in heavy if m in sys.modules))
+"""
+
+
+def test_import_is_lazy():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    out = subprocess.run(
+        [sys.executable, "-c", CHECK_IMPORT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    assert out.stdout.split("\n")[0] == ""
@@ -0,0 +1,83 @@
+import os
+import hdviz
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from hdviz.plotter_nd import PlotterNd
+
+
+def create_lines(D):
+    return np.random.normal(size=(5, 40, D)).cumsum(axis=1)
+
+
+def test_window_is_view():
+    a = hdviz.create_plotter(4)
+    x = create_lines(4)
+    a.add_lineset(x)
+    w = a.line_sets[0].window(10, 20, (1, 3))
+    assert w.shape == (5, 10, 2)
+    assert np.shares_memory(w, a.line_sets[0].x)
+    assert np.array_equal(w, x[:, 10:20][:, :, [1, 3]])
+
+
+def test_playback_2d():
+    a = hdviz.create_plotter(2)
+    a.add_lineset(create_lines(2))
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    pb = a.plot_playback(ax=ax)
+    assert len(pb.panels) == 1
+    assert len(ax.collections) == 1
+    assert len(ax.lines) == 0
+    assert len(pb.update(10)) == 1
+    paths = ax.collections[0].get_paths()
+    assert len(paths) == 5
+    assert paths[0].vertices.shape == (10, 2)
+    assert np.shares_memory(paths[0].vertices, a.line_sets[0].x)
+    assert pb.frames(15) == [15, 30, 40]
+
+
+def test_playback_tail():
+    a = hdviz.create_plotter(2)
+    a.add_lineset(create_lines(2))
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    pb = a.plot_playback(tail=12, fade_steps=4, ax=fig.add_subplot(1, 1, 1))
+    assert pb.windows(30) == [(18, 22), (21, 25), (24, 28), (27, 30)]
+    pb.update(30)
+    collections = pb.panels[0][2]
+    alphas = [lc.get_alpha() for lc in collections]
+    assert np.all(np.diff(alphas) > 0) and alphas[-1] == 1.0
+    assert collections[-1].get_paths()[0].vertices.shape == (3, 2)
+
+
+def test_playback_nd_lockstep(tmp_path):
+    a = PlotterNd(3)
+    a.add_lineset(create_lines(3))
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    axs = np.array([[fig.add_subplot(1, 3, k + 1) for k in range(0, 3)]])
+    pb = a.plot_playback(tail=5, fade_steps=1, axs=axs)
+    assert len(pb.panels) == 3
+    pb.update(20)
+    for ax in axs.flat:
+        assert ax.collections[0].get_paths()[0].vertices.shape == (5, 2)
+    path = os.path.join(str(tmp_path), "frames")
+    pb.save(path, step=20)
+    assert len(os.listdir(path)) == 2
+
+
+def test_playback_3d_not_supported():
+    a = hdviz.create_plotter(3)
+    a.add_lineset(np.random.normal(size=(2, 10, 3)))
+    with pytest.raises(RuntimeError, match="3d"):
+        a.plot_playback()
+
+
+def test_playback_without_lines():
+    a = hdviz.create_plotter(2)
+    a.add_pointset(np.random.normal(size=(10, 2)))
+    with pytest.raises(RuntimeError, match="no line sets"):
+        a.plot_playback()
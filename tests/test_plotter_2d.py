@@ -58,3 +58,56 @@ def test_quiver_plot():
     a.add_quiverset(u, v, color="red")
     b = a.plot(square=True)
     assert str(b)[0:11] == "AxesSubplot"
+
+
+def test_batched_line_plot():
+    x = np.random.normal(size=(50, 20, 2))
+    a = hdviz.create_plotter(2)
+    a.batch_lines = True
+    a.add_lineset(x, label="lines", alpha=0.5, style="--")
+    ax = a.plot()
+    assert len(ax.lines) == 0
+    assert len(ax.collections) == 1
+    assert ax.collections[0].get_segments()[0].shape == (20, 2)
+
+
+def test_append_and_refresh():
+    a = hdviz.create_plotter(2)
+    a.batch_lines = True
+    a.add_pointset(np.random.uniform(size=(100, 2)), label="pts")
+    a.add_lineset(np.random.uniform(size=(4, 10, 2)), label="lines")
+    ax = a.plot()
+    limits = ax.get_xlim()
+    a.append_points(np.random.uniform(size=(20, 2)), label="pts")
+    a.extend_lines(np.random.uniform(size=(4, 5, 2)))
+    assert not a.refresh()
+    assert ax.collections[0].get_offsets().shape == (120, 2)
+    assert ax.collections[1].get_segments()[0].shape == (15, 2)
+    assert ax.get_xlim() == limits
+    a.append_points(np.array([[5.0, 0.5]]))
+    assert a.refresh()
+    assert ax.get_xlim()[1] > 5.0
+
+
+def test_many_pointsets_are_merged():
+    x = np.random.normal(size=(3000, 2))
+    labels = np.arange(3000) % 100
+    a = hdviz.create_plotter(2)
+    a.add_pointsets(x, labels)
+    a.add_pointset(x[0:10], marker="x", color="k", label="start")
+    assert a.use_merged_points()
+    ax = a.plot()
+    sizes = [len(c.get_offsets()) for c in ax.collections]
+    assert sizes == [3000, 10]
+    texts = [t.get_text() for t in ax.get_legend().get_texts()]
+    assert len(texts) == 51 and texts[-1] == "+51 more"
+    a.append_points(x[0:5] + 100.0, label="start")
+    assert a.refresh()
+    assert len(ax.collections[1].get_offsets()) == 15
+    assert ax.get_xlim()[1] > 100.0
+    b = hdviz.create_plotter(2)
+    b.add_pointsets(x, labels % 5)
+    assert not b.use_merged_points()
+    ax = b.plot()
+    assert len(ax.collections) == 5
+    assert len(ax.get_legend().get_texts()) == 5
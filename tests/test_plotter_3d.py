@@ -1,6 +1,9 @@
 # Test plotting 3-dimensional things
 import hdviz
 import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from hdviz.points3d import DepthSortedPoints, depth_raster
 
 
 def create_3d_spiral(a: float = 1):
@@ -57,3 +60,41 @@ def test_quiver_plot():
     v = np.vstack((v1, v2, v3)).T
     a.add_quiverset(u, v, color="blue", alpha=0.5)
     assert a.num_quiversets() == 1
+
+
+def test_batched_line_plot():
+    x = np.random.normal(size=(50, 20, 3))
+    a = hdviz.create_plotter(3)
+    a.batch_lines = True
+    a.add_lineset(x, label="lines", alpha=0.5)
+    ax = a.plot()
+    assert len(ax.lines) == 0
+    assert len(ax.collections) == 1
+
+
+def test_fast_point_plot():
+    x = np.random.normal(size=(2000, 3))
+    a = hdviz.create_plotter(3)
+    a.fast_points = True
+    a.add_pointsets(x, np.arange(2000) % 4)
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1, projection="3d")
+    a.plot(ax=ax)
+    fig.canvas.draw()
+    artists = [c for c in ax.get_children() if isinstance(c, DepthSortedPoints)]
+    assert len(artists) == 1
+    assert artists[0].x.shape == (2000, 3)
+    assert len(ax.get_legend_handles_labels()[1]) == 4
+
+
+def test_depth_raster():
+    colors = np.array([[255, 0, 0, 255], [0, 0, 255, 255]], dtype=np.uint8)
+    px = np.array([5.5, 6.5])
+    py = np.array([2.5, 2.5])
+    img = depth_raster(px, py, np.array([1.0, 0.0]), colors, 10, 4, 1.0)
+    assert img.shape == (4, 10, 4)
+    # the second point is nearer and covers the first one where they overlap
+    assert np.array_equal(img[1, 6], colors[1])
+    assert np.array_equal(img[1, 4], colors[0])
+    assert np.array_equal(img[0, 0], [0, 0, 0, 0])
@@ -47,3 +47,64 @@ def test_plot_5d():
     a.add_quiverset(x, v, color="black")
     ax = a.plot()
     assert ax.shape == (3, 4)
+
+
+def test_batched_line_plot():
+    x = np.random.normal(size=(30, 20, 4))
+    a = hdviz.create_plotter(4)
+    a.batch_lines = True
+    a.add_lineset(x, color="red")
+    axs = a.plot()
+    for ax in axs.flatten():
+        assert len(ax.lines) == 0
+        assert len(ax.collections) == 1
+    seg = a.line_sets[0].segments((1, 3))
+    assert np.shares_memory(seg, x)
+    assert np.array_equal(seg, x[:, :, [1, 3]])
+
+
+def test_parallel_plot(tmp_path):
+    x = np.random.normal(size=(200, 4))
+    path = str(tmp_path / "points.npy")
+    np.save(path, x)
+    a = hdviz.create_plotter(4)
+    a.add_pointset(path, label="points")
+    a.add_lineset(np.random.normal(size=(3, 10, 4)), color="red")
+    axs = a.plot(panelsize=2, n_jobs=2)
+    assert axs.shape == (2, 3)
+    for ax in axs.flatten():
+        assert len(ax.images) == 1
+        assert ax.images[0].get_array().shape[2] == 4
+
+
+def test_shared_plotter_is_small(tmp_path):
+    import pickle
+    from hdviz.parallel import share_plotter
+
+    a = hdviz.create_plotter(4)
+    a.add_pointsets(np.random.normal(size=(100000, 4)), np.arange(100000) % 3)
+    a.add_lineset(np.random.normal(size=(50, 200, 4)))
+    a.append_points(np.random.normal(size=(10, 4)))
+    shared = share_plotter(a, str(tmp_path))
+    assert len(pickle.dumps(shared)) < 100000
+    for ds in shared.point_sets + shared.line_sets:
+        assert ds._buffer is ds.x
+
+
+def test_merged_point_plot():
+    x = np.random.normal(size=(300, 4))
+    labels = np.arange(300) % 5
+    a = hdviz.create_plotter(4)
+    a.merge_points = True
+    a.add_pointsets(x, labels, alpha=0.5)
+    a.add_pointset(x[0:10], marker="x", color="k", label="start")
+    axs = a.plot()
+    for ax in axs.flatten():
+        sizes = [len(c.get_offsets()) for c in ax.collections]
+        assert sizes == [300, 10]
+    leg = axs[0, 0].legend(handles=a.legend_handles())
+    assert len(leg.get_texts()) == 6
+    _, x_merged, colors = a.merged_points()[0]
+    assert colors.shape == (300, 4)
+    assert np.all(colors[:, 3] == 0.5)
+    assert a.merged_points()[0][1] is x_merged
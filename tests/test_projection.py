@@ -0,0 +1,82 @@
+# Test projecting data to fewer dimensions
+import os
+import hdviz
+import numpy as np
+from hdviz.projection import (
+    fit_projection,
+    incremental_pca,
+    random_projection,
+    clear_projection_cache,
+)
+
+
+def create_data(n, d, seed=0):
+    rng = np.random.default_rng(seed)
+    scales = np.concatenate(([10.0, 6.0, 3.0], np.linspace(1.0, 0.1, d - 3)))
+    rotation, _ = np.linalg.qr(rng.normal(size=(d, d)))
+    return (rng.normal(size=(n, d)) * scales) @ rotation + 3.0
+
+
+def exact_components(x, k):
+    _, _, Vt = np.linalg.svd(x - x.mean(axis=0), full_matrices=False)
+    return Vt[0:k]
+
+
+def test_pca_methods(tmp_path):
+    x = create_data(2000, 50)
+    expected = exact_components(x, 3)
+    path = str(tmp_path / "x.npy")
+    np.save(path, x)
+    p1 = fit_projection(x, "pca", 3)
+    p2 = incremental_pca(np.load(path, mmap_mode="r"), 3, chunk_size=300)
+    for p in (p1, p2):
+        assert np.allclose(np.abs(p.components @ expected.T), np.eye(3), atol=1e-3)
+        assert np.allclose(p.mean, x.mean(axis=0))
+    y = p1.transform(x)
+    assert y.shape == (2000, 3)
+    assert np.allclose(y.mean(axis=0), 0.0)
+    assert np.allclose(y.var(axis=0, ddof=1), p1.explained_variance)
+    y_mmap = p1.transform(np.load(path, mmap_mode="r"), chunk_size=128)
+    assert np.allclose(y, y_mmap)
+
+
+def test_projection_cache():
+    clear_projection_cache()
+    x = create_data(500, 20)
+    p = fit_projection(x, "pca", 2)
+    assert fit_projection(x.copy(), "pca", 2) is p
+    assert fit_projection(x, "pca", 3) is not p
+    r = random_projection(20, 4, seed=1, sparse=True)
+    assert r.components.shape == (4, 20)
+    assert set(np.unique(np.round(r.components * np.sqrt(4 / 3)))) <= {-1, 0, 1}
+
+
+def test_projection_cache_of_files(tmp_path):
+    clear_projection_cache()
+    x = create_data(500, 20)
+    path = str(tmp_path / "x.npy")
+    np.save(path, x)
+    p = fit_projection(path, "pca", 2)
+    assert fit_projection(path, "pca", 2) is p
+    assert fit_projection(np.load(path, mmap_mode="r")[0:100], "pca", 2) is not p
+    np.save(path, 2.0 * x)
+    os.utime(path, (0, 12345))
+    assert fit_projection(path, "pca", 2) is not p
+
+
+def test_visualize_projected():
+    x = create_data(300, 40)
+    trajectories = np.stack([x[0:20], x[20:40]])
+    ptr, _ = hdviz.build_plotter(
+        points=x,
+        u=x[0:10],
+        v=x[10:20] - x[0:10],
+        trajectories=trajectories,
+        projection="pca",
+        num_components=3,
+    )
+    assert ptr.num_dims == 3
+    assert ptr.line_sets[0].x.shape == (2, 20, 3)
+    p = fit_projection(x, "pca", 3)
+    assert np.allclose(ptr.line_sets[0].x, p.transform(trajectories))
+    assert np.allclose(ptr.quiver_sets[0].v, (x[10:20] - x[0:10]) @ p.components.T)
@@ -0,0 +1,57 @@
+# Test ranking pairs of dimensions
+import hdviz
+import numpy as np
+import pytest
+from hdviz.ranking import PairStatistics, score_pairs
+
+
+def create_labeled_data(n, d, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 3, size=n)
+    x = rng.normal(size=(n, d)) + 100.0
+    x[:, 2] += 4.0 * labels
+    x[:, 5] -= 3.0 * labels
+    x[:, 7] = 2.0 * x[:, 1] + 0.01 * rng.normal(size=n)
+    x[:, 3] *= 10.0
+    return x, labels
+
+
+def test_score_pairs():
+    x, labels = create_labeled_data(3000, 8)
+    stats = PairStatistics(3, 8)
+    for k in range(0, 3):
+        stats.update(k, x[labels == k])
+    assert np.allclose(stats.covariance(), np.cov(x.T))
+    pairs, scores = score_pairs(stats, "separation")
+    assert tuple(pairs[np.argmax(scores)]) == (2, 5)
+    pairs, scores = score_pairs(stats, "correlation")
+    assert tuple(pairs[np.argmax(scores)]) == (1, 7)
+    pairs, scores = score_pairs(stats, "variance")
+    assert 3 in pairs[np.argmax(scores)]
+    with pytest.raises(ValueError):
+        score_pairs(stats, "something")
+
+
+def test_separation_of_one_group():
+    x, _ = create_labeled_data(1000, 8)
+    stats = PairStatistics(2, 8)
+    stats.update(0, x)
+    pairs, scores = score_pairs(stats, "separation")
+    assert np.array_equal(scores, score_pairs(stats, "variance")[1])
+    a = hdviz.create_plotter(8)
+    a.max_pairs = 2
+    a.add_pointset(x)
+    assert 3 in a.dim_pairs()[0]
+
+
+def test_plot_top_pairs():
+    x, labels = create_labeled_data(500, 8)
+    a = hdviz.create_plotter(8)
+    a.max_pairs = 3
+    a.add_pointsets(x, labels)
+    axs = a.plot()
+    assert axs.size == 3
+    assert a.dim_pairs()[0] == (2, 5)
+    assert axs.flatten()[0].get_xlabel() == "dim 3"
+    a.pair_score = "correlation"
+    assert a.dim_pairs()[0] == (1, 7)
@@ -0,0 +1,44 @@
+# Test subsampling of data sets before drawing
+import hdviz
+import numpy as np
+from hdviz.sampling import allocate_budget
+
+
+def test_allocate_budget():
+    take = allocate_budget([5, 500, 1000], 100)
+    assert take.sum() == 100
+    assert take[0] == 5
+    assert np.array_equal(allocate_budget([5, 10], 100), [5, 10])
+    assert np.array_equal(allocate_budget([5, 10], None), [5, 10])
+
+
+def test_subsampled_plot():
+    x = np.random.normal(size=(2000, 4))
+    labels = np.zeros(2000, dtype=int)
+    labels[0:10] = 1
+    a = hdviz.create_plotter(4)
+    a.max_points = 200
+    a.max_lines = 3
+    a.add_pointsets(x, labels)
+    a.add_lineset(np.random.normal(size=(10, 5, 4)))
+    sets = a.render_pointsets()
+    assert [ps.num_points for ps in sets] == [190, 10]
+    assert a.render_pointsets() is sets
+    assert np.array_equal(sets[0].get_range_max(), a.point_sets[0].get_range_max())
+    assert a.render_linesets()[0].num_lines == 3
+    axs = a.plot()
+    x_drawn = sets[0].x
+    for ax, (i, j) in zip(axs.flatten(), a.dim_pairs()):
+        offsets = [c.get_offsets() for c in ax.collections]
+        assert [len(o) for o in offsets] == [190, 10]
+        assert np.array_equal(offsets[0], x_drawn[:, [i, j]])
+
+
+def test_subsample_is_reproducible():
+    x = np.random.normal(size=(1000, 2))
+    a = hdviz.create_plotter(2)
+    b = hdviz.create_plotter(2)
+    for p in (a, b):
+        p.max_points = 50
+        p.add_pointset(x)
+    assert np.array_equal(a.render_pointsets()[0].x, b.render_pointsets()[0].x)
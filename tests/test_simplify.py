@@ -0,0 +1,51 @@
+# Test simplifying lines before drawing
+import hdviz
+import numpy as np
+import pytest
+from hdviz.simplify import simplify_lines, segment_distances2
+
+
+def create_spirals(num_lines, num_points):
+    t = np.linspace(0, 20, num_points)
+    a = np.linspace(0, 1, num_lines)[:, None]
+    return np.stack((t * np.cos(t + a), t * np.sin(t + a)), axis=2)
+
+
+def max_error(y, simplified):
+    """Largest distance of a point of *y* to the simplified line."""
+    n = y.shape[0]
+    d2 = np.full(n, np.inf)
+    for a, b in zip(simplified[:-1], simplified[1:]):
+        ab = [np.full(n, c) for c in (a[0], a[1], b[0], b[1])]
+        d2 = np.minimum(d2, segment_distances2(y[:, 0], y[:, 1], *ab))
+    return np.sqrt(d2.max())
+
+
+@pytest.mark.parametrize("method", ["rdp", "minmax", "stride"])
+def test_simplify_lines(method):
+    y = create_spirals(3, 20000)
+    scale = np.array([2.0, 3.0])
+    lines = simplify_lines(y, scale, 0.5, method)
+    assert len(lines) == 3
+    for j in range(0, 3):
+        assert len(lines[j]) < 10000
+        assert np.array_equal(lines[j][0], y[j, 0])
+        assert np.array_equal(lines[j][-1], y[j, -1])
+    if method == "rdp":
+        assert len(lines[0]) < 500
+        assert max_error(y[0] * scale, lines[0] * scale) <= 0.5
+
+
+def test_simplified_plot():
+    x = np.concatenate((create_spirals(4, 3000), create_spirals(4, 3000)), axis=2)
+    a = hdviz.create_plotter(4)
+    a.line_tolerance = 0.5
+    a.add_lineset(x, color="red")
+    axs = a.plot()
+    for ax in axs.flatten():
+        assert len(ax.lines) == 4
+        assert all(len(line.get_xdata()) < 3000 for line in ax.lines)
+    assert len(a._simplified) == 6
+    a.batch_lines = True
+    a.plot(axs=axs)
+    assert len(a._simplified) == 6
@@ -0,0 +1,52 @@
+# Test columnar storage of point sets
+import hdviz
+import numpy as np
+import pytest
+from hdviz.data import PointData
+
+
+def test_point_store():
+    x = np.random.normal(size=(1000, 3))
+    labels = np.random.choice(50, size=1000)
+    a = hdviz.create_plotter(3)
+    a.add_pointsets(x, labels, label_colors=dict(zip(range(50), 50 * ["red"])))
+    store = a.point_store()
+    assert len(store) == 50
+    assert np.shares_memory(store.x, a.point_sets[0].x)
+    assert a.point_store() is store
+    mins, maxs = store.set_ranges()
+    for k, ps in enumerate(a.point_sets):
+        assert np.array_equal(mins[k], ps.x.min(0))
+        assert np.array_equal(ps.get_range_max(), ps.x.max(0))
+        assert np.array_equal(store.view(k).x, ps.x)
+    assert store.point_colors().shape == (1000, 4)
+    assert np.array_equal(store.codes, np.sort(labels))
+
+
+def test_point_store_copies_separate_sets():
+    a = hdviz.create_plotter(2)
+    a.add_pointset(np.zeros((5, 2)), color="red")
+    a.add_pointset(np.ones((3, 2)), color="blue", alpha=0.5)
+    store = a.point_store()
+    assert store.x.shape == (8, 2)
+    assert np.array_equal(store.point_colors()[-1], [0, 0, 1, 0.5])
+    assert store.view(1).label == "points 2"
+    a.point_sets[0].set_color("green")
+    assert a.point_store() is not store
+
+
+def test_point_store_of_memmaps(tmp_path):
+    x = np.random.normal(size=(300, 2))
+    np.save(tmp_path / "a.npy", x)
+    a = hdviz.create_plotter(2)
+    a.add_pointset(str(tmp_path / "a.npy"))
+    a.add_pointset(x[0:10])
+    store = a.point_store()
+    assert isinstance(store.x, np.memmap)
+    assert np.array_equal(store.x, np.concatenate((x, x[0:10])))
+
+
+def test_slots():
+    ps = PointData(np.zeros((5, 2)), None, "o", 1.0, "points")
+    with pytest.raises(AttributeError):
+        ps.name = "points"
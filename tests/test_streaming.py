@@ -0,0 +1,149 @@
+import pytest
+import numpy as np
+from hdviz.density import density_counts
+from hdviz.functional import build_plotter, build_stream_plotter
+from hdviz.streaming import Reservoir, PairHistograms, StreamAggregator
+
+
+def chunks(x, labels, size):
+    for start in range(0, x.shape[0], size):
+        yield x[start : start + size], labels[start : start + size]
+
+
+def test_reservoir():
+    r = Reservoir(100, np.random.default_rng(0))
+    x = np.arange(1000)
+    for start in range(0, 1000, 64):
+        r.update(x[start : start + 64])
+    assert r.count == 1000 and not r.is_complete
+    assert r.x.shape == (100,)
+    assert np.all(np.diff(r.x) > 0)
+    assert len(np.unique(r.x)) == 100
+
+
+def test_histograms_extend():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(3000, 3)) * np.array([1.0, 2.0, 0.5])
+    groups = rng.integers(0, 2, size=3000)
+    h = PairHistograms(3, bins=16)
+    h.add_group()
+    h.add_group()
+    # the first chunk has a much smaller range than the rest
+    h.update(x[0:10] * 0.1, groups[0:10])
+    h.update(x[10:], groups[10:])
+    for i, j in [(0, 1), (2, 0)]:
+        counts, extent = h.pair_counts(i, j)
+        assert counts.shape == (2, 16, 16)
+        assert extent[0] <= x[10:, i].min() and extent[1] >= x[10:, i].max()
+        expected = density_counts(x[10:][groups[10:] == 1], i, j, extent, 16)
+        inside = density_counts(x[0:10][groups[0:10] == 1] * 0.1, i, j, extent, 16)
+        # only the largest point of the first chunk, which was on the upper edge
+        # of the first grid, can be one bin off
+        assert counts[1].sum() == (expected + inside).sum()
+        assert np.abs(counts[1] - expected - inside).sum() <= 2
+    assert h.counts.sum() == 3 * 3000
+
+
+def test_small_stream_is_like_visualize():
+    x = np.random.normal(size=(500, 4))
+    labels = np.random.choice(["x", "y", "z"], size=500)
+    a, _ = build_plotter(x, labels)
+    b, _ = build_stream_plotter(chunks(x, labels, 128))
+    assert b.density_source is None
+    assert [ps.label for ps in a.point_sets] == [ps.label for ps in b.point_sets]
+    for pa, pb in zip(a.point_sets, b.point_sets):
+        assert pa.num_points == pb.num_points
+        assert np.allclose(pa.get_range(), pb.get_range())
+    assert np.allclose(a.get_max_ranges(), b.get_max_ranges())
+
+
+def test_large_stream():
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    x = np.random.normal(size=(20000, 4))
+    labels = np.random.randint(0, 3, size=20000)
+    trajectories = [np.random.normal(size=(10, 20, 4)) for _ in range(0, 3)]
+    ptr, _ = build_stream_plotter(
+        chunks(x, labels, 3000),
+        trajectories,
+        sample_size=100,
+        trajectory_sample_size=15,
+        density_bins=32,
+    )
+    assert ptr.density_source is not None
+    assert [ps.num_points for ps in ptr.point_sets] == [100, 100, 100, 15]
+    assert ptr.line_sets[0].num_lines == 15
+    lines = np.stack(trajectories)
+    assert np.allclose(ptr.line_sets[0].get_range()[1], lines.max(axis=(0, 1, 2)))
+    assert np.allclose(ptr.get_max_ranges()[0], np.minimum(x.min(0), lines.min((0, 1, 2))))
+    counts, _ = ptr.density_source.pair_counts(0, 2)
+    assert counts.shape == (4, 32, 32)
+    assert counts[0].sum() == np.sum(labels == 0)
+    assert counts[3].sum() == 30
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    axs = np.array([[fig.add_subplot(2, 3, k + 1) for k in range(0, 6)]])
+    ptr.plot(axs=axs)
+    assert len(axs[0, 0].images) == 1
+
+
+def test_histograms_grow_and_pairs():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=(1000, 5))
+    groups = rng.integers(0, 5, size=1000)
+    h = PairHistograms(5, bins=8, pairs=[(3, 1), (0, 4)])
+    for _ in range(0, 5):
+        h.add_group()
+    assert h.num_groups == 5 and h._counts.shape[0] == 8
+    assert h.counts.shape == (5, 2, 8, 8) and h.counts.dtype == np.uint32
+    h.update(x, groups)
+    counts, extent = h.pair_counts(1, 3)
+    expected = density_counts(x[groups == 2], 1, 3, extent, 8)
+    assert counts[2].sum() == expected.sum()
+    assert np.abs(counts[2] - expected).sum() <= 2
+    with pytest.raises(ValueError):
+        h.pair_counts(0, 1)
+
+
+def test_stream_pairs():
+    x = np.random.normal(size=(5000, 6))
+    labels = np.random.randint(0, 2, size=5000)
+    pairs = [(0, 5), (2, 3)]
+    ptr, _ = build_stream_plotter(
+        chunks(x, labels, 1000), sample_size=100, density_bins=16, pairs=pairs
+    )
+    assert ptr.density_source.hist.counts.shape == (2, 2, 16, 16)
+    assert ptr.num_plots() == 2 and ptr.dim_pairs() == pairs
+    axs = ptr.plot()
+    assert len(axs[0, 1].images) == 1
+
+
+def test_stream_max_pairs():
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=(4000, 12))
+    labels = rng.integers(0, 2, size=4000)
+    x[:, 4] += 5.0 * labels
+    x[:, 9] -= 5.0 * labels
+    ptr, _ = build_stream_plotter(
+        chunks(x, labels, 1000), sample_size=100, density_bins=8, max_pairs=3
+    )
+    assert ptr.density_source.hist.counts.shape == (2, 3, 8, 8)
+    assert ptr.dim_pairs()[0] == (4, 9) and ptr.num_plots() == 3
+    ptr, _ = build_stream_plotter(chunks(x, labels, 1000), density_bins=8)
+    assert ptr.density_source is None and ptr.num_plots() == 45
+
+
+def test_histograms_widen_counts():
+    h = PairHistograms(2, bins=4)
+    h.add_group()
+    h.num_points = 2 ** 32 - 2
+    h.update(np.random.normal(size=(3, 2)), np.zeros(3, dtype=int))
+    assert h.counts.dtype == np.uint64 and h.counts.sum() == 3
+
+
+def test_mixed_categories():
+    agg = StreamAggregator(sample_size=10)
+    agg.add(np.zeros((5, 3)))
+    agg.add((np.ones((5, 3)), np.array([2, 2, 1, 1, 1])))
+    assert agg.categories() == [1, 2, "unlabeled"]
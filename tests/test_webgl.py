@@ -0,0 +1,44 @@
+# Test exporting plotters as WebGL pages
+import base64
+import hdviz
+import json
+import numpy as np
+
+
+def page_data(page):
+    start = page.index("const DATA = ") + len("const DATA = ")
+    end = page.index(";\n", start)
+    return json.loads(page[start:end])
+
+
+def test_html_export(tmp_path):
+    x = np.random.normal(size=(1000, 5))
+    labels = np.arange(1000) % 3
+    a = hdviz.create_plotter(5)
+    a.add_pointsets(x, labels)
+    a.add_lineset(np.random.normal(size=(4, 20, 5)), color="red")
+    a.add_quiverset(x[0:10], x[10:20], color="black", label="arrows")
+    path = str(tmp_path / "plot.html")
+    assert a.to_html(path, title="Test <page>") == path
+    with open(path, encoding="utf-8") as f:
+        page = f.read()
+    assert "<title>Test &lt;page&gt;</title>" in page
+    data = page_data(page)
+    assert data["selectable"]
+    assert len(data["limits"]) == 5
+    assert [ps["num_points"] for ps in data["points"]] == [334, 333, 333]
+    col = np.frombuffer(base64.b64decode(data["points"][1]["columns"][3]), "<f4")
+    assert np.allclose(col, x[labels == 1, 3])
+    lines = data["lines"][0]
+    assert (lines["num_lines"], lines["num_points"]) == (4, 20)
+    assert data["arrows"][0]["num_arrows"] == 10
+
+
+def test_html_export_3d():
+    a = hdviz.create_plotter(3)
+    a.add_pointset(np.random.normal(size=(100, 3)), label="points")
+    a.set_perspective(45, 10)
+    data = page_data(a.to_html())
+    assert data["dims"] == [0, 1, 2]
+    assert data["azimuth"] == 45
+    assert not data["selectable"]